@@ -1,27 +1,161 @@
-from flask import Flask, render_template, request, jsonify, send_file, session
-import json
+import time
+# Reported as seeme_import_duration_seconds{module="app"} once the module finishes loading
+IMPORT_STARTED = time.perf_counter()
+
+from flask import Flask, render_template, request, jsonify, send_file, send_from_directory, session, g, Response, abort
 import os
 from datetime import datetime
 import uuid
 import re
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-from reportlab.lib.units import inch
 import io
-import glob
+import atexit
+import copy
+import importlib
+import sys
+import threading
 import traceback
+import zipfile
+import bulk_edit
+import locks
+import metrics
+import profiling
+import resume_cache
+import resume_catalog
+import resume_events
+import resume_ir
+import resume_journal
+import resume_model
+import resume_storage
+import resume_variants
+import resume_watcher
+import retention
+import sanitize
+import text_export
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'
+# Return export stage timings in a Server-Timing response header
+app.config['SERVER_TIMING'] = os.environ.get('SEEME_SERVER_TIMING', '').lower() in ('1', 'true', 'yes')
+# Allow per-request profiling via the X-Profile header or ?profile= query parameter
+app.config['PROFILING_ENABLED'] = os.environ.get('SEEME_PROFILING', '').lower() in ('1', 'true', 'yes')
+app.config['PROFILE_DIRECTORY'] = os.environ.get('SEEME_PROFILE_DIRECTORY', 'profiles')
+# Watch the resumes directory for edits made by other tools (set SEEME_WATCH=0 to disable)
+app.config['WATCH_RESUMES'] = os.environ.get('SEEME_WATCH', '1').lower() not in ('0', 'false', 'no')
+# Journal edits under resumes/.journal instead of rewriting the file each time (set SEEME_JOURNAL=0 to disable)
+app.config['JOURNAL'] = os.environ.get('SEEME_JOURNAL', '1').lower() not in ('0', 'false', 'no')
+# Rewrite the resume file from the journal after this many edits or seconds, whichever comes first
+app.config['JOURNAL_COMPACT_OPS'] = int(os.environ.get('SEEME_JOURNAL_COMPACT_OPS', '50'))
+app.config['JOURNAL_COMPACT_SECONDS'] = float(os.environ.get('SEEME_JOURNAL_COMPACT_SECONDS', '30'))
+# ... or once no edit has been made for this many seconds (0 disables the background check)
+app.config['JOURNAL_IDLE_SECONDS'] = float(os.environ.get('SEEME_JOURNAL_IDLE_SECONDS', '5'))
+# Edits kept in the history behind the last compaction; older ones and their snapshots are pruned
+app.config['JOURNAL_HISTORY'] = int(os.environ.get('SEEME_JOURNAL_HISTORY', resume_journal.HISTORY_LIMIT))
+# Archive old resume versions in the background (set SEEME_RETENTION=1 to enable)
+app.config['RETENTION'] = os.environ.get('SEEME_RETENTION', '').lower() in ('1', 'true', 'yes')
+app.config['RETENTION_POLICY'] = retention.RetentionPolicy(
+    keep_last=int(os.environ.get('SEEME_RETENTION_KEEP_LAST', retention.DEFAULT_POLICY.keep_last)),
+    keep_daily=int(os.environ.get('SEEME_RETENTION_KEEP_DAILY', retention.DEFAULT_POLICY.keep_daily)),
+    keep_weekly=int(os.environ.get('SEEME_RETENTION_KEEP_WEEKLY', retention.DEFAULT_POLICY.keep_weekly)),
+    keep_monthly=int(os.environ.get('SEEME_RETENTION_KEEP_MONTHLY', retention.DEFAULT_POLICY.keep_monthly)))
+# "archive" moves old versions into resumes/.archive/*.zip, "delete" removes them
+app.config['RETENTION_MODE'] = os.environ.get('SEEME_RETENTION_MODE', 'archive')
+app.config['RETENTION_INTERVAL'] = float(os.environ.get('SEEME_RETENTION_INTERVAL', '300'))
+# Push edits to open browser tabs over /api/events, across worker processes (set SEEME_EVENTS=0 to disable)
+app.config['LIVE_EVENTS'] = os.environ.get('SEEME_EVENTS', '1').lower() not in ('0', 'false', 'no')
+# Most /api/events streams open at once in this process; each holds a server thread (0: no limit, see gunicorn.conf.py)
+app.config['EVENT_STREAMS'] = int(os.environ.get('SEEME_EVENT_STREAMS', '0'))
+# Resumes kept parsed in memory after switching away, by count and by total JSON size (0 entries disables the cache)
+app.config['RESUME_CACHE_ENTRIES'] = int(os.environ.get('SEEME_RESUME_CACHE_ENTRIES', '16'))
+app.config['RESUME_CACHE_BYTES'] = int(os.environ.get('SEEME_RESUME_CACHE_BYTES', str(8 * 1024 * 1024)))
+# Worker processes for /api/bulk-edit (default: one per CPU)
+app.config['BULK_EDIT_WORKERS'] = int(os.environ.get('SEEME_BULK_WORKERS', os.cpu_count() or 1))
+# Layout for saved resumes: "files" (one JSON document each) or "cas" (deduplicated objects + manifests)
+app.config['STORAGE'] = os.environ.get('SEEME_STORAGE', 'files')
+
+pdf_export_module = None
+pdf_export_lock = threading.Lock()
+
+def load_pdf_export():
+    """Import the reportlab-backed PDF renderer on first use, recording how long that took
+    
+    Only a fully imported module is handed out: sys.modules holds it while another thread is still importing it.
+    """
+    global pdf_export_module
+    if pdf_export_module is None:
+        with pdf_export_lock:
+            if pdf_export_module is None:
+                started = time.perf_counter()
+                imported = "pdf_export" not in sys.modules
+                module = importlib.import_module("pdf_export")
+                if imported:
+                    metrics.IMPORT_DURATION.set(time.perf_counter() - started, module="pdf_export")
+                pdf_export_module = module
+    return pdf_export_module
+
+# Prefixes for the contact line of the HTML export
+CONTACT_ICONS = {"email": "📧", "phone": "📱", "city": "📍"}
+
+# Mutators that ResumeWebApp.apply records in the journal and replays on restore
+JOURNALED_OPS = ("update_basics", "add_work_experience", "delete_work_experience", "set_highlights",
+                 "add_education", "delete_education", "add_skill", "delete_skill", "batch")
+
+# Operations a batch may contain, with the request fields passed to the mutator in order
+BATCH_OPS = {
+    "update_basics": ("data",),
+    "add_work_experience": ("data",),
+    "delete_work_experience": ("id",),
+    "set_highlights": ("id", "highlights"),
+    "add_education": ("data",),
+    "delete_education": ("id",),
+    "add_skill": ("name",),
+    "delete_skill": ("index",),
+}
+BATCH_FIELD_TYPES = {"data": dict, "id": str, "highlights": list, "name": str, "index": int}
+
+class BatchError(ValueError):
+    """An operation in a batch was invalid or failed; none of the batch was applied"""
+    
+    def __init__(self, index, message):
+        super().__init__(f"Operation {index}: {message}")
+        self.index = index
 
 class ResumeWebApp:
     def __init__(self):
         self.resume_data = {}
         self.current_filename = None
         self.resumes_directory = "resumes"
+        # Bumped on every mutation; caches derived from resume_data key on it
+        self.content_version = 0
+        self._model = None
+        self._model_version = -1
+        self._layout = None
+        self._layout_version = -1
+        # Rendered exports by format, as (content_version, data)
+        self._exports = {}
+        self.catalog = None
+        # (mtime_ns, size) of the current file as this process last wrote or read it
+        self._file_signature = None
+        # ((filename, signature), ...) of the variant bases the open resume was resolved from
+        self._dependencies = ()
+        self._external_change = False
+        # Set when another worker process published an edit to the open resume
+        self._remote_change = False
+        self._journal = None
+        # Bare instance the journal's ops are replayed on (see scratch)
+        self._scratch = None
+        # resume_events broker edits are published to, once started
+        self.events = None
+        # Variant document of the open file (see resume_variants), and the sections whose order it pins
+        self.variant = None
+        self.pinned_sections = frozenset()
+        self.storage = resume_storage.get_storage(app.config['STORAGE'])
+        # Readers (data, exports) share the open resume; edits, loads and saves hold it alone
+        self.lock = locks.RWLock()
+        # Set while a batch runs, so work and education are sorted once at its end
+        self.defer_sorting = False
+        # Resumes switched away from, so reopening one does not read and replay it again
+        self.cache = resume_cache.ResumeCache(app.config['RESUME_CACHE_ENTRIES'], app.config['RESUME_CACHE_BYTES'],
+                                              flush=self.flush_cached)
         self.ensure_resumes_directory()
         self.initialize_empty_resume()
     
@@ -48,149 +182,622 @@ class ResumeWebApp:
             "education": []
         }
         self.current_filename = None
+        self.variant = None
+        self.pinned_sections = frozenset()
+        self._dependencies = ()
+        self.mark_changed()
+    
+    def mark_changed(self):
+        """Record that resume_data changed so cached views are rebuilt"""
+        self.content_version += 1
+    
+    def get_model(self):
+        """Return the typed resume_model view of resume_data, decoded once per content version"""
+        if self._model is None or self._model_version != self.content_version:
+            self._model = resume_model.Resume.from_dict(self.resume_data)
+            self._model_version = self.content_version
+        return self._model
+    
+    def get_layout(self):
+        """Return the resume_ir layout shared by all exporters, compiled once per content version"""
+        if self._layout is None or self._layout_version != self.content_version:
+            metrics.CACHE.miss("layout")
+            self._layout = resume_ir.compile_resume(self.get_model())
+            self._layout_version = self.content_version
+        else:
+            metrics.CACHE.hit("layout")
+        return self._layout
+    
+    def cached_export(self, export_format):
+        """Return the export rendered for the current content version, or None"""
+        cached = self._exports.get(export_format)
+        if cached is not None and cached[0] == self.content_version:
+            metrics.CACHE.hit("export")
+            return cached[1]
+        metrics.CACHE.miss("export")
+        return None
+    
+    def store_export(self, export_format, data, version):
+        """Cache an export rendered from the given content version"""
+        self._exports[export_format] = (version, data)
+        return data
+    
+    def export_snapshot(self, export_format, trace):
+        """(cached export, layout, content version) taken under the read lock
+        
+        The layout is immutable, so exporters render from it after releasing the lock and edits are not held up.
+        """
+        with self.lock.read():
+            cached = self.cached_export(export_format)
+            if cached is not None:
+                return cached, None, self.content_version
+            with trace.stage("layout"):
+                return None, self.get_layout(), self.content_version
+    
+    def get_catalog(self):
+        """Return the resume_catalog index for the current resumes directory"""
+        if self.catalog is None or self.catalog.directory != self.resumes_directory:
+            self.catalog = resume_catalog.ResumeCatalog(self.resumes_directory)
+        return self.catalog
+    
+    def file_signature(self, filename):
+        try:
+            stat = os.stat(os.path.join(self.resumes_directory, filename))
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def on_file_event(self, event):
+        """resume_watcher subscriber: flag the open resume when another tool changed it"""
+        if self.current_filename is None:
+            return
+        if event.kind == "rescan" or event.filename == self.current_filename:
+            if self.file_signature(self.current_filename) != self._file_signature:
+                self._external_change = True
+                if self.events is not None:
+                    self.events.announce({"type": "reload", "resume": self.current_filename})
+    
+    def on_change_event(self, event_id, event):
+        """resume_events subscriber: flag the open resume when another process edited it"""
+        if event_id is None or event.get("origin") == resume_events.origin():
+            return
+        if self.current_filename is not None and event.get("resume") == self.current_filename:
+            self._remote_change = True
+    
+    def apply_external_changes(self):
+        """Reload the open resume if another tool changed it on disk or another process edited it"""
+        if not self._external_change and not self._remote_change:
+            return
+        with self.lock.write():
+            remote, self._remote_change = self._remote_change, False
+            self._external_change = False
+            filename = self.current_filename
+            if filename is None:
+                return
+            if self.file_signature(filename) is None:
+                print(f"Resume {filename} was deleted on disk; keeping the open copy, the next save recreates it")
+                return
+            if self.file_signature(filename) != self._file_signature:
+                print(f"Resume {filename} changed on disk, reloading")
+                self.load_resume(filename)
+            elif remote:
+                # Replays the edits the other process journaled
+                self.load_resume(filename)
+    
+    def get_journal(self, filename=None):
+        """Return the resume_journal for a file (default: the open one), or None when journaling is off"""
+        filename = filename or self.current_filename
+        if not app.config['JOURNAL'] or filename is None:
+            return None
+        journal = self._journal
+        if journal is None or journal.filename != filename or journal.directory != self.resumes_directory:
+            journal = resume_journal.ResumeJournal(self.resumes_directory, filename, app.config['JOURNAL_HISTORY'])
+            if filename == self.current_filename:
+                self._journal = journal
+        return journal
+    
+    def scratch(self):
+        """The instance journaled ops are replayed on: only the state the mutators touch, no directory or cache"""
+        if self._scratch is None:
+            scratch = ResumeWebApp.__new__(ResumeWebApp)
+            scratch.resume_data = {}
+            scratch.content_version = 0
+            scratch.pinned_sections = frozenset()
+            scratch.defer_sorting = False
+            self._scratch = scratch
+        return self._scratch
+
+    def replay(self, data, op, args, pinned=None):
+        """Apply one journaled op to data (the resume_journal replay callback); callers hold the write lock"""
+        scratch = self.scratch()
+        scratch.resume_data = data
+        scratch.pinned_sections = self.pinned_sections if pinned is None else pinned
+        getattr(scratch, op)(*args)
+        data, scratch.resume_data = scratch.resume_data, {}
+        return data
+    
+    def describe_change(self, op, args):
+        """The section or item an op changed, so clients can patch their copy instead of refetching"""
+        # Copies, since responses are serialized after the write lock is released
+        if op == "update_basics":
+            return {"section": "basics", "value": copy.deepcopy(self.resume_data.get("basics", {}))}
+        if op in ("add_skill", "delete_skill"):
+            return {"section": "skills", "value": copy.deepcopy(self.resume_data.get("skills", {}))}
+        section = "education" if op in ("add_education", "delete_education") else "work"
+        item_id = args[0]["id"] if op in ("add_work_experience", "add_education") else args[0]
+        items = self.resume_data.get(section, [])
+        # item is None after a delete; count lets a client check its copy is in step
+        change = {"section": section, "id": item_id, "item": None, "index": None, "count": len(items)}
+        for index, item in enumerate(items):
+            if item.get("id") == item_id:
+                change.update(item=copy.deepcopy(item), index=index)
+                break
+        return change
+    
+    def publish(self, event):
+        if self.events is not None:
+            self.events.publish(dict(event, resume=self.current_filename))
+    
+    @property
+    def revision(self):
+        """meta.revision of the open resume, bumped by every persisted edit"""
+        return resume_model.revision(self.resume_data)
+    
+    def check_revision(self, expected):
+        """Raise RevisionConflict when a client's edit is based on another revision (None skips the check)"""
+        if expected is not None and expected != self.revision:
+            raise resume_model.RevisionConflict(self.revision)
+    
+    def apply(self, op, *args, expected=None):
+        """Run a mutator and persist the edit: one journal record, or a full save when journaling is off
+        
+        expected is the revision the client last saw (If-Match); a stale one raises RevisionConflict.
+        Returns the change event published for the edit, or False when the mutator refused it.
+        """
+        with self.lock.write():
+            if op not in JOURNALED_OPS:
+                raise ValueError(f"Unknown resume operation: {op}")
+            self.check_revision(expected)
+            args = self.with_item_ids(op, args)
+        
+            journal = self.get_journal()
+            if journal is not None and not journal.exists():
+                # Version 0 is the resume as it stands before the first journaled edit
+                journal.start(copy.deepcopy(self.resume_data), self.file_signature(self.current_filename))
+        
+            result = getattr(self, op)(*args)
+            if result is False:
+                return result
+            try:
+                if journal is None:
+                    resume_model.set_revision(self.resume_data, self.revision + 1)
+                    self.save_resume()
+                else:
+                    # Checked again under the journal's lock, in case another process got in first
+                    record = journal.append(op, args, expected_revision=expected)
+                    resume_model.set_revision(self.resume_data, record["revision"])
+                    self.compact_journal(force=False)
+            except Exception:
+                # Drop the edit just made in memory and pick up the version on disk (newer, after a conflict)
+                self.load_resume(self.current_filename)
+                raise
+            if op == "batch":
+                # Any number of sections may have changed; clients refetch
+                event = {"type": "reload", "op": op, "version": self.revision, "count": len(args[0])}
+            else:
+                event = {"type": "change", "op": op, "version": self.revision, "change": self.describe_change(op, args)}
+            self.publish(event)
+            return event
+    
+    def with_item_ids(self, op, args):
+        """Fix the IDs of new work and education items now, so replaying the record creates the same ones
+        
+        A batch also records which IDs it created, to tell its new items from updates of existing ones.
+        """
+        if op == "batch":
+            operations = [[item_op, list(self.with_item_ids(item_op, item_args))] for item_op, item_args in args[0]]
+            created = [fixed[0]["id"] for (item_op, item_args), (_, fixed) in zip(args[0], operations)
+                       if item_op in ("add_work_experience", "add_education") and not item_args[0].get("id")]
+            return operations, created
+        if op in ("add_work_experience", "add_education") and not args[0].get("id"):
+            return (dict(args[0], id=str(uuid.uuid4().hex[:16])),)
+        return args
+    
+    def find_education(self, education_id):
+        """Return the education entry dict with the given ID, or None"""
+        for education in self.resume_data.get("education", []):
+            if education.get("id") == education_id:
+                return education
+        return None
+    
+    def batch_target_missing(self, op, args, created):
+        """True when a batch delete or update names an item the resume does not have"""
+        if op == "delete_work_experience":
+            return self.find_work(args[0]) is None
+        if op == "delete_education":
+            return self.find_education(args[0]) is None
+        if op in ("add_work_experience", "add_education") and created is not None and args[0]["id"] not in created:
+            find = self.find_work if op == "add_work_experience" else self.find_education
+            return find(args[0]["id"]) is None
+        return False
+    
+    def batch(self, operations, created=None):
+        """Apply [op, args] pairs as one edit: sorted once at the end, and all undone if one fails
+        
+        created holds the IDs of the items the batch adds; any other add names an item to update, which
+        must exist, as must the items deleted.  (Batches journaled before it was recorded pass None.)
+        """
+        before = copy.deepcopy(self.resume_data)
+        self.defer_sorting = True
+        try:
+            for index, (op, args) in enumerate(operations):
+                if op not in BATCH_OPS:
+                    raise BatchError(index, f"unknown operation '{op}'")
+                if self.batch_target_missing(op, args, created):
+                    raise BatchError(index, f"{op} failed: item not found")
+                try:
+                    result = getattr(self, op)(*args)
+                except Exception as e:
+                    raise BatchError(index, f"{op} failed: {e}") from e
+                if result is False:
+                    raise BatchError(index, f"{op} failed: item not found")
+        except BatchError:
+            self.resume_data = before
+            self.mark_changed()
+            raise
+        finally:
+            self.defer_sorting = False
+        self.sort_work_by_date()
+        self.sort_education_by_date()
+        self.mark_changed()
+    
+    def compact_journal(self, force=True):
+        """Rewrite the resume file with the journaled edits it is missing
+        
+        Without force, only once JOURNAL_COMPACT_OPS edits or JOURNAL_COMPACT_SECONDS have piled up,
+        or the journal has been idle for JOURNAL_IDLE_SECONDS.
+        """
+        with self.lock.write():
+            journal = self.get_journal()
+            if journal is None or not journal.exists():
+                return False
+            # Another process may have compacted it already
+            journal.refresh()
+            pending_ops, age = journal.pending()
+            if pending_ops <= 0:
+                return False
+            idle = app.config['JOURNAL_IDLE_SECONDS']
+            if (not force and pending_ops < app.config['JOURNAL_COMPACT_OPS'] and age < app.config['JOURNAL_COMPACT_SECONDS']
+                    and (idle <= 0 or journal.idle() < idle)):
+                return False
+            try:
+                return self.save_resume() is not None
+            except resume_model.RevisionConflict as e:
+                print(f"Not compacting {self.current_filename}: the file on disk is newer ({e})")
+                return False
+    
+    def sync_journal(self, filename, data, pinned=frozenset()):
+        """Reconcile freshly read file data with the file's journal and return the latest version"""
+        journal = self.get_journal(filename)
+        if journal is None or not journal.exists():
+            return data
+        journal.refresh()
+        signature = self.file_signature(filename)
+        state = journal.read_state() or {}
+        if state.get("file_signature") != (list(signature) if signature else None):
+            # Another tool rewrote the file: it becomes the newest version
+            journal.import_state(data, signature)
+            return data
+        if journal.last_seq > state.get("file_seq", 0):
+            # The file holds an older version; replay the edits made since
+            data = journal.state_at(journal.last_seq, lambda data, op, args: self.replay(data, op, args, pinned))
+            resume_model.set_revision(data, journal.revision)
+        return data
+    
+    def restore_version(self, seq, expected=None):
+        """Return the open resume to journal version seq, recorded as a new edit so it can be undone"""
+        with self.lock.write():
+            self.check_revision(expected)
+            journal = self.get_journal()
+            if journal is None or not journal.exists():
+                raise resume_journal.JournalError("This resume has no edit history yet")
+            data = journal.state_at(seq, self.replay)
+            record = journal.append(resume_journal.RESTORE_OP, [seq], expected_revision=expected)
+            # The restored content gets a new revision, so the counter never goes back
+            resume_model.set_revision(data, record["revision"])
+            self.resume_data = data
+            self.sort_work_by_date()
+            self.sort_education_by_date()
+            self.mark_changed()
+            self.compact_journal(force=False)
+            self.publish({"type": "reload", "version": self.revision})
+            return seq
+    
+    def undo(self, expected=None):
+        """Step back one edit; returns the version restored, or None at the start of history"""
+        with self.lock.write():
+            journal = self.get_journal()
+            target = journal.undo_target() if journal is not None and journal.exists() else None
+            if target is None:
+                return None
+            position = journal.position(journal.last_seq)
+            self.restore_version(target, expected)
+            journal.redo_stack.append(position)
+            return target
+    
+    def redo(self, expected=None):
+        """Re-apply the last undone edit; returns the version restored, or None if nothing was undone"""
+        with self.lock.write():
+            journal = self.get_journal()
+            if journal is None or not journal.redo_stack:
+                return None
+            self.check_revision(expected)
+            return self.restore_version(journal.redo_stack.pop(), expected)
     
     def sort_work_by_date(self):
         """Sort work experience by start date (most recent first)"""
-        if "work" not in self.resume_data or not self.resume_data["work"]:
+        if "work" not in self.resume_data or not self.resume_data["work"] or "work" in self.pinned_sections:
+            return
+        if self.defer_sorting:
             return
         
         def get_sort_date(work_item):
             """Extract date for sorting - prioritize current jobs, then by start date"""
-            # Current jobs (isWorkingHere = True) should appear first
-            if work_item.get("isWorkingHere", False):
-                return "9999-12-31"  # Future date to sort current jobs first
-            
-            # For ended jobs, use start date
-            start_date = work_item.get("startDate", "")
-            if start_date:
-                try:
-                    # Extract just the date part (YYYY-MM-DD)
-                    return start_date.split("T")[0]
-                except:
-                    return "1900-01-01"  # Default old date for invalid dates
-            
-            return "1900-01-01"  # Default for jobs with no start date
+            return resume_model.sort_date(work_item.get("isWorkingHere", False), work_item.get("startDate") or "")
         
         # Sort work experience: current jobs first, then by start date (newest first)
         self.resume_data["work"].sort(key=get_sort_date, reverse=True)
     
     def sort_education_by_date(self):
         """Sort education by start date (most recent first)"""
-        if "education" not in self.resume_data or not self.resume_data["education"]:
+        if "education" not in self.resume_data or not self.resume_data["education"] or "education" in self.pinned_sections:
+            return
+        if self.defer_sorting:
             return
         
         def get_education_sort_date(edu_item):
             """Extract date for sorting education"""
-            # Current studies should appear first
-            if edu_item.get("isStudyingHere", False):
-                return "9999-12-31"  # Future date to sort current studies first
-            
-            # For completed education, use start date
-            start_date = edu_item.get("startDate", "")
-            if start_date:
-                try:
-                    return start_date.split("T")[0]
-                except:
-                    return "1900-01-01"
-            
-            return "1900-01-01"
+            return resume_model.sort_date(edu_item.get("isStudyingHere", False), edu_item.get("startDate") or "")
         
         # Sort education: current studies first, then by start date (newest first)
         self.resume_data["education"].sort(key=get_education_sort_date, reverse=True)
     
     def get_available_resumes(self):
         """Get list of available resume files"""
-        resume_files = []
+        scan_started = time.perf_counter()
         
-        # Get files from resumes directory only
-        pattern = os.path.join(self.resumes_directory, "*.json")
-        for filepath in glob.glob(pattern):
-            filename = os.path.basename(filepath)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    name = data.get('basics', {}).get('name', 'Untitled Resume')
-                    modified = datetime.fromtimestamp(os.path.getmtime(filepath))
-                    resume_files.append({
-                        'filename': filename,
-                        'name': name,
-                        'modified': modified.strftime('%Y-%m-%d %H:%M:%S'),
-                        'path': filepath
-                    })
-            except:
-                continue
+        # Get files from resumes directory only, newest first; unchanged files are not re-parsed
+        resume_files = self.get_catalog().entries()
         
-        # Sort by modified date (newest first)
-        resume_files.sort(key=lambda x: x['modified'], reverse=True)
+        metrics.CATALOG_SCAN_DURATION.observe(time.perf_counter() - scan_started)
+        metrics.CATALOG_FILES.set(len(resume_files))
         return resume_files
     
     def create_new_resume(self, name="New Resume"):
         """Create a new blank resume"""
-        self.initialize_empty_resume()
-        return self.resume_data
+        with self.lock.write():
+            self.cache_open_resume()
+            self._journal = None
+            self.initialize_empty_resume()
+            return self.resume_data
     
     def load_resume(self, filename):
         """Load a specific resume file"""
-        try:
-            # Only load from resumes directory
-            filepath = os.path.join(self.resumes_directory, filename)
-            
-            with open(filepath, "r", encoding="utf-8") as file:
-                self.resume_data = json.load(file)
-                self.current_filename = filename
-                
-                # Sort work and education by date after loading
-                self.sort_work_by_date()
-                self.sort_education_by_date()
-                
+        with self.lock.write():
+            entry = None
+            if filename != self.current_filename:
+                entry = self.cache.take(filename, self.cached_valid)
+            if entry is not None:
+                self.adopt(entry)
+                # Normally clean: only a resume whose compaction failed when it was switched away from is not
+                self.compact_journal()
                 return True
-        except Exception as e:
-            print(f"Error loading resume {filename}: {e}")
-            return False
+            try:
+                # Only load from resumes directory
+                filepath = os.path.join(self.resumes_directory, filename)
+            
+                # Plain files, content-addressed manifests and variants load alike
+                with locks.file_lock(filepath).read():
+                    document = resume_storage.read_document(filepath)
+                    if resume_variants.is_variant(document):
+                        # A variant is resolved from its bases' files, so they need their journaled edits first
+                        self.compact_files(resume_variants.bases(self.resumes_directory, filename))
+                    data = resume_storage.resolve_document(filepath, document)
+                    dependencies = ()
+                    if resume_variants.is_variant(document):
+                        dependencies = resume_variants.load(self.resumes_directory, filename)[1][1:]
+                pinned = resume_variants.pinned_sections(document)
+                data = self.sync_journal(filename, data, pinned)
+                # Validate while decoding, then sort work and education by date (unless a variant pins the order)
+                model = resume_model.Resume.from_dict(data)
+                resume_variants.sort_sections(model, pinned)
+                data = model.to_dict()
+            except Exception as e:
+                print(f"Error loading resume {filename}: {e}")
+                return False
+            
+            if filename != self.current_filename:
+                self.cache_open_resume()
+                self._journal = None
+            self.resume_data = data
+            self.current_filename = filename
+            self.variant = document if resume_variants.is_variant(document) else None
+            self.pinned_sections = pinned
+            self._file_signature = self.file_signature(filename)
+            self._dependencies = dependencies
+            self.mark_changed()
+            self._model = model
+            self._model_version = self.content_version
+            # Write any edits the journal replayed into the file, so other readers of it see them
+            self.compact_journal()
+            return True
+    
+    def adopt(self, entry):
+        """Make a resume taken from the cache the open one"""
+        self.cache_open_resume()
+        self.resume_data = entry.data
+        self.current_filename = entry.filename
+        self.variant = entry.variant
+        self.pinned_sections = entry.pinned
+        self._file_signature = entry.signatures[0][1]
+        self._dependencies = entry.signatures[1:]
+        self._journal = entry.journal
+        self.mark_changed()
+        if entry.model is not None:
+            self._model = entry.model
+            self._model_version = self.content_version
+    
+    def cache_open_resume(self):
+        """Write the open resume's journaled edits into its file and hand it to the cache before switching away
+        
+        If that write fails, the entry stays dirty and the cache retries when it evicts it (or the app exits).
+        """
+        filename = self.current_filename
+        if filename is None or self._file_signature is None:
+            return
+        self.compact_journal()
+        journal = self._journal if self._journal is not None and self._journal.filename == filename else self.get_journal()
+        dirty = journal is not None and journal.exists() and journal.pending()[0] > 0
+        model = self._model if self._model_version == self.content_version else None
+        self.cache.put(resume_cache.CachedResume(
+            filename, self.resume_data, ((filename, self._file_signature),) + self._dependencies,
+            len(resume_storage.encode(self.resume_data)), journal, self.variant, self.pinned_sections, model, dirty))
+    
+    def cached_valid(self, entry):
+        """True while a cached resume still matches its files and journal"""
+        for name, signature in entry.signatures:
+            if self.file_signature(name) != signature:
+                return False
+        if entry.journal is not None and entry.journal.exists():
+            entry.journal.refresh()
+            return entry.journal.revision == resume_model.revision(entry.data)
+        return not (app.config['JOURNAL'] and self.get_journal(entry.filename).exists())
+    
+    def flush_cached(self, entry):
+        """resume_cache flush callback: write a cached resume's journaled edits into its file"""
+        with locks.file_lock(os.path.join(self.resumes_directory, entry.filename)).write():
+            if not self.cached_valid(entry):
+                # Another process or tool changed it since; loading reconciles the journal with the file
+                print(f"Not compacting cached resume {entry.filename}: it changed since it was cached")
+                return
+            self.write_resume(entry.filename, entry.data, entry.variant, entry.pinned)
+            signature = self.file_signature(entry.filename)
+            entry.journal.compact(copy.deepcopy(entry.data), signature)
+            entry.signatures = ((entry.filename, signature),) + entry.signatures[1:]
+    
+    def compact_file(self, filename):
+        """Write a resume's journaled edits into its file, whichever editor made them; True if it was rewritten"""
+        with self.lock.write():
+            if filename == self.current_filename:
+                return self.compact_journal()
+            if not bulk_edit.has_pending_edits(self.resumes_directory, filename):
+                return False
+            filepath = os.path.join(self.resumes_directory, filename)
+            with locks.file_lock(filepath).write():
+                document = resume_storage.read_document(filepath)
+                variant = document if resume_variants.is_variant(document) else None
+                pinned = resume_variants.pinned_sections(document)
+                data = self.sync_journal(filename, resume_storage.resolve_document(filepath, document), pinned)
+                journal = self.get_journal(filename)
+                if journal.pending()[0] <= 0:
+                    # The file changed behind the journal, which took it as the newest version
+                    return False
+                model = resume_model.Resume.from_dict(data)
+                resume_variants.sort_sections(model, pinned)
+                data = model.to_dict()
+                self.write_resume(filename, data, variant, pinned)
+                journal.compact(copy.deepcopy(data), self.file_signature(filename))
+            # A cached copy (dirty or not) now describes an older file
+            self.cache.discard(filename)
+            return True
+    
+    def compact_files(self, filenames):
+        """compact_file each of filenames, before code that reads them from disk (variants, batch rendering)"""
+        for filename in filenames:
+            try:
+                self.compact_file(filename)
+            except Exception as e:
+                print(f"Error compacting journal of {filename}: {e}")
+    
+    def write_resume(self, filename, data, variant=None, pinned=frozenset()):
+        """Write resume data in the configured layout (a variant only writes its overrides); returns the bytes written"""
+        with metrics.SAVE_DURATION.time():
+            if variant is not None:
+                written = resume_variants.write_variant(self.resumes_directory, filename, variant["base"], data, pinned)
+            else:
+                written = self.storage.write(self.resumes_directory, filename, data)
+        metrics.SAVE_BYTES.inc(written)
+        return written
     
     def save_resume(self, filename=None, save_as=False):
         """Save resume data to JSON file"""
-        # Sort work and education by date before saving
-        self.sort_work_by_date()
-        self.sort_education_by_date()
-        
-        if filename is None and self.current_filename is None:
-            # Generate filename based on name and timestamp
-            name = self.resume_data.get('basics', {}).get('name', 'Resume')
-            # Clean filename
-            clean_name = re.sub(r'[^\w\s-]', '', name).strip()
-            clean_name = re.sub(r'[-\s]+', '_', clean_name)
-            if not clean_name:
-                clean_name = "Resume"
-            timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            filename = f"{clean_name}_{timestamp}.json"
-        elif filename is None:
-            filename = self.current_filename
+        with self.lock.write():
+            # Sort work and education by date before saving
+            self.sort_work_by_date()
+            self.sort_education_by_date()
         
-        # Always save to resumes directory
-        filepath = os.path.join(self.resumes_directory, filename)
+            if filename is None and self.current_filename is None:
+                # Generate filename based on name and timestamp
+                name = self.resume_data.get('basics', {}).get('name', 'Resume')
+                # Clean filename
+                clean_name = re.sub(r'[^\w\s-]', '', name).strip()
+                clean_name = re.sub(r'[-\s]+', '_', clean_name)
+                if not clean_name:
+                    clean_name = "Resume"
+                timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+                filename = f"{clean_name}_{timestamp}.json"
+            elif filename is None:
+                filename = self.current_filename
         
+            # Other writers of this file (another editor, retention) wait; other files do not
+            with locks.file_lock(os.path.join(self.resumes_directory, filename)).write():
+                if filename == self.current_filename and not save_as:
+                    self.check_disk_revision(filename)
+                
+                try:
+                    # Always save to resumes directory; a variant stays a variant
+                    self.write_resume(filename, self.resume_data, self.variant, self.pinned_sections)
+                    
+                    if save_as or self.current_filename is None:
+                        self.current_filename = filename
+                    if filename == self.current_filename:
+                        self._file_signature = self.file_signature(filename)
+                        journal = self.get_journal()
+                        if journal is not None and journal.exists():
+                            journal.compact(copy.deepcopy(self.resume_data), self._file_signature)
+                    
+                    return filename
+                except Exception as e:
+                    metrics.SAVE_FAILURES.inc()
+                    print(f"Error saving resume: {e}")
+                    return None
+    
+    def check_disk_revision(self, filename):
+        """Raise RevisionConflict instead of overwriting a file another process saved at a newer revision"""
+        signature = self.file_signature(filename)
+        if signature is None or self._file_signature is None or signature == self._file_signature:
+            return
         try:
-            with open(filepath, "w", encoding="utf-8") as file:
-                json.dump(self.resume_data, file, indent=4, ensure_ascii=False)
-            
-            if save_as or self.current_filename is None:
-                self.current_filename = filename
-            
-            return filename
-        except Exception as e:
-            print(f"Error saving resume: {e}")
-            return None
+            on_disk = resume_model.revision(resume_storage.read_resume(os.path.join(self.resumes_directory, filename)))
+        except (OSError, ValueError) as e:
+            print(f"Could not read the revision of {filename}: {e}")
+            return
+        if on_disk > self.revision:
+            raise resume_model.RevisionConflict(on_disk)
     
     def delete_resume(self, filename):
         """Delete a resume file"""
         try:
             filepath = os.path.join(self.resumes_directory, filename)
-            if os.path.exists(filepath):
+            with locks.file_lock(filepath).write():
+                if not os.path.exists(filepath):
+                    return False, "Resume file not found"
                 os.remove(filepath)
+                self.cache.discard(filename)
+                journal = self.get_journal(filename)
+                if journal is not None:
+                    journal.delete()
                 return True, "Resume deleted successfully"
-            else:
-                return False, "Resume file not found"
         except Exception as e:
             return False, f"Error deleting resume: {str(e)}"
     
@@ -212,6 +819,10 @@ class ResumeWebApp:
         if "location" not in basics:
             basics["location"] = {}
         basics["location"]["city"] = data.get("city", "")
+        # Sanitize once here; the model and renderers reuse the memoized result
+        sanitize.sanitize_html(basics["summary"])
+        sanitize.sanitize_html(basics["objective"])
+        self.mark_changed()
     
     def add_work_experience(self, work_data):
         """Add or update work experience"""
@@ -219,7 +830,7 @@ class ResumeWebApp:
             self.resume_data["work"] = []
         
         work_item = {
-            "id": work_data.get("id", str(uuid.uuid4().hex[:16])),
+            "id": work_data.get("id") or str(uuid.uuid4().hex[:16]),
             "name": work_data.get("company", ""),
             "position": work_data.get("position", ""),
             "startDate": f"{work_data.get('startDate', '')}T04:00:00.000Z" if work_data.get('startDate') else "",
@@ -230,6 +841,13 @@ class ResumeWebApp:
             "url": "",
             "years": ""
         }
+        # A bulleted summary is split into highlights once, here, instead of on every export
+        bullets = sanitize.split_bullets(work_item["summary"])
+        if bullets:
+            work_item["highlights"] = list(bullets)
+        elif isinstance(work_data.get("highlights"), list):
+            work_item["highlights"] = [str(highlight).strip() for highlight in work_data["highlights"] if str(highlight).strip()]
+        sanitize.sanitize_html(work_item["summary"])
         
         # Check if updating existing item
         work_id = work_data.get("id")
@@ -239,12 +857,32 @@ class ResumeWebApp:
                     self.resume_data["work"][i] = work_item
                     # Sort after updating
                     self.sort_work_by_date()
+                    self.mark_changed()
                     return
         
         # Add new item
         self.resume_data["work"].append(work_item)
         # Sort after adding
         self.sort_work_by_date()
+        self.mark_changed()
+    
+    def find_work(self, work_id):
+        """Return the work item dict with the given ID, or None"""
+        for work in self.resume_data.get("work", []):
+            if work.get("id") == work_id:
+                return work
+        return None
+    
+    def set_highlights(self, work_id, highlights):
+        """Replace a work item's highlights and rebuild its summary from them"""
+        work = self.find_work(work_id)
+        if work is None:
+            return False
+        summary = sanitize.bullet_summary(highlights)
+        work["summary"] = summary
+        work["highlights"] = list(sanitize.split_bullets(summary))
+        self.mark_changed()
+        return True
     
     def delete_work_experience(self, work_id):
         """Delete work experience by ID"""
@@ -255,6 +893,7 @@ class ResumeWebApp:
             ]
             # Re-sort after deletion (though order shouldn't change)
             self.sort_work_by_date()
+            self.mark_changed()
     
     def add_education(self, education_data):
         """Add or update education entry"""
@@ -262,7 +901,7 @@ class ResumeWebApp:
             self.resume_data["education"] = []
         
         education_item = {
-            "id": education_data.get("id", str(uuid.uuid4().hex[:16])),
+            "id": education_data.get("id") or str(uuid.uuid4().hex[:16]),
             "institution": education_data.get("institution", ""),
             "area": education_data.get("area", ""),
             "studyType": education_data.get("studyType", ""),
@@ -274,6 +913,7 @@ class ResumeWebApp:
             "summary": f"<p>{education_data.get('summary', '').strip()}</p>" if education_data.get('summary', '').strip() else "",
             "url": ""
         }
+        sanitize.sanitize_html(education_item["summary"])
         
         # Check if updating existing item
         education_id = education_data.get("id")
@@ -283,12 +923,14 @@ class ResumeWebApp:
                     self.resume_data["education"][i] = education_item
                     # Sort after updating
                     self.sort_education_by_date()
+                    self.mark_changed()
                     return
         
         # Add new item
         self.resume_data["education"].append(education_item)
         # Sort after adding
         self.sort_education_by_date()
+        self.mark_changed()
     
     def delete_education(self, education_id):
         """Delete education entry by ID"""
@@ -299,6 +941,7 @@ class ResumeWebApp:
             ]
             # Re-sort after deletion
             self.sort_education_by_date()
+            self.mark_changed()
     
     def add_skill(self, skill_name):
         """Add a skill"""
@@ -314,6 +957,7 @@ class ResumeWebApp:
                 "name": skill_name,
                 "level": 0
             })
+            self.mark_changed()
     
     def delete_skill(self, skill_index):
         """Delete skill by index"""
@@ -321,302 +965,32 @@ class ResumeWebApp:
             technologies = self.resume_data["skills"]["technologies"]
             if 0 <= skill_index < len(technologies):
                 del technologies[skill_index]
+                self.mark_changed()
     
     def clean_html(self, text):
-        """Remove simple HTML tags for display"""
-        if not text:
-            return ""
-        text = re.sub(r'<p>|</p>|<br>|&nbsp;', '', text)
-        text = re.sub(r'•\s*', '• ', text)
-        return text.strip()
+        """Return the reportlab-safe markup for a stored HTML field"""
+        return sanitize.sanitize_html(text).markup
     
     def format_date(self, date_string):
-        """Format ISO date string to readable format"""
-        if not date_string:
-            return ""
-        try:
-            date_obj = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
-            return date_obj.strftime("%B %Y")
-        except:
-            return date_string[:10] if len(date_string) >= 10 else date_string
+        """Format ISO date string to readable format (parsed and formatted once per distinct string)"""
+        return resume_model.format_date(date_string)
     
-    def create_pdf(self):
-        """Create compact, modern, ATS-compliant PDF with reduced spacing"""
+    def create_pdf(self, trace=None):
+        """Create compact, modern, ATS-compliant PDF with reduced spacing
+        
+        Pass a metrics.RenderTrace to record per-stage timings and counts.
+        """
+        trace = trace or metrics.NULL_TRACE
         try:
-            # Sort work and education by date before PDF generation
-            self.sort_work_by_date()
-            self.sort_education_by_date()
-            
-            buffer = io.BytesIO()
-            
-            # Create document with tighter margins for more content
-            doc = SimpleDocTemplate(buffer, pagesize=letter,
-                                  rightMargin=36, leftMargin=36,  # Reduced from 54
-                                  topMargin=36, bottomMargin=36)  # Reduced from 54
-            
-            # Get default styles and create custom ones
-            styles = getSampleStyleSheet()
-            
-            # Define modern, ATS-compliant color palette
-            primary_color = colors.HexColor('#2c3e50')    # Dark blue-gray
-            accent_color = colors.HexColor('#3498db')     # Professional blue  
-            text_color = colors.HexColor('#2c3e50')       # Dark text
-            light_gray = colors.HexColor('#7f8c8d')       # Light gray for dates
-            
-            # Create compact paragraph styles with reduced spacing
-            base_font = 'Helvetica'  # ATS-compliant standard font
-            
-            # Compact header styles
-            name_style = ParagraphStyle(
-                'CompactName',
-                parent=styles['Heading1'],
-                fontName='Helvetica-Bold',
-                fontSize=22,                # Reduced from 26
-                spaceAfter=4,              # Reduced from 8
-                alignment=TA_CENTER,
-                textColor=primary_color,
-                leading=24                 # Reduced from 30
-            )
-            
-            title_style = ParagraphStyle(
-                'CompactTitle', 
-                parent=styles['Normal'],
-                fontName='Helvetica',
-                fontSize=12,               # Reduced from 14
-                spaceAfter=3,              # Reduced from 6
-                alignment=TA_CENTER,
-                textColor=accent_color,
-                leading=14                 # Reduced from 16
-            )
-            
-            contact_style = ParagraphStyle(
-                'CompactContact',
-                parent=styles['Normal'],
-                fontName='Helvetica',
-                fontSize=10,
-                spaceAfter=8,              # Reduced from 18
-                alignment=TA_CENTER,
-                textColor=text_color,
-                leading=11                 # Reduced from 12
-            )
-            
-            # Compact section header style
-            section_style = ParagraphStyle(
-                'CompactSection',
-                parent=styles['Heading2'],
-                fontName='Helvetica-Bold',
-                fontSize=12,               # Reduced from 14
-                spaceBefore=10,            # Reduced from 20
-                spaceAfter=6,              # Reduced from 10
-                textColor=primary_color,
-                leading=14                 # Reduced from 16
-            )
-            
-            # Compact job title style
-            job_title_style = ParagraphStyle(
-                'CompactJobTitle',
-                parent=styles['Normal'],
-                fontName='Helvetica-Bold',
-                fontSize=11,               # Reduced from 12
-                spaceBefore=6,             # Reduced from 12
-                spaceAfter=1,              # Reduced from 2
-                textColor=primary_color,
-                leading=12                 # Reduced from 14
-            )
-            
-            # Compact company and date style
-            company_style = ParagraphStyle(
-                'CompactCompany',
-                parent=styles['Normal'],
-                fontName='Helvetica',
-                fontSize=10,               # Reduced from 11
-                spaceAfter=1,              # Reduced from 2
-                textColor=accent_color,
-                leading=11                 # Reduced from 13
-            )
-            
-            date_style = ParagraphStyle(
-                'CompactDate',
-                parent=styles['Normal'],
-                fontName='Helvetica-Oblique',
-                fontSize=9,
-                spaceAfter=4,              # Reduced from 8
-                textColor=light_gray,
-                leading=10                 # Reduced from 11
-            )
-            
-            # Compact content text style
-            content_style = ParagraphStyle(
-                'CompactContent',
-                parent=styles['Normal'],
-                fontName='Helvetica',
-                fontSize=9,                # Reduced from 10
-                spaceAfter=6,              # Reduced from 12
-                textColor=text_color,
-                leading=11,                # Reduced from 13
-                alignment=TA_JUSTIFY
-            )
-            
-            # Compact skills style
-            skills_style = ParagraphStyle(
-                'CompactSkills',
-                parent=styles['Normal'],
-                fontName='Helvetica',
-                fontSize=9,                # Reduced from 10
-                spaceAfter=6,              # Reduced from 12
-                textColor=text_color,
-                leading=12                 # Reduced from 14
-            )
-            
-            story = []
-            basics = self.resume_data.get("basics", {})
-            
-            # Compact header section
-            if basics.get("name"):
-                story.append(Paragraph(basics["name"].upper(), name_style))
-            else:
-                story.append(Paragraph("YOUR NAME HERE", name_style))
-            
-            # Professional Title
-            if basics.get("label"):
-                story.append(Paragraph(basics["label"], title_style))
-            
-            # Contact Information (simplified without icons)
-            contact_info = []
-            if basics.get("email"):
-                contact_info.append(basics["email"])
-            if basics.get("phone"):
-                contact_info.append(basics["phone"])
-            if basics.get("location", {}).get("city"):
-                contact_info.append(basics["location"]["city"])
-            
-            if contact_info:
-                story.append(Paragraph("  •  ".join(contact_info), contact_style))
-            
-            # Minimal separator space
-            story.append(Spacer(1, 6))     # Reduced from 20
-            
-            # Professional Summary
-            if basics.get("summary") and basics["summary"].strip():
-                story.append(Paragraph("PROFESSIONAL SUMMARY", section_style))
-                clean_summary = self.clean_html(basics["summary"])
-                story.append(Paragraph(clean_summary, content_style))
-                story.append(Spacer(1, 4))  # Reduced from 10
-            
-            # Career Objective
-            if basics.get("objective") and basics["objective"].strip():
-                story.append(Paragraph("CAREER OBJECTIVE", section_style))
-                clean_objective = self.clean_html(basics["objective"])
-                story.append(Paragraph(clean_objective, content_style))
-                story.append(Spacer(1, 4))  # Reduced from 10
-            
-            # Work Experience (already sorted)
-            work_items = self.resume_data.get("work", [])
-            if work_items:
-                story.append(Paragraph("PROFESSIONAL EXPERIENCE", section_style))
-                
-                for work in work_items:
-                    company = work.get("name", "")
-                    position = work.get("position", "")
-                    
-                    if position:
-                        story.append(Paragraph(position, job_title_style))
-                    
-                    if company:
-                        story.append(Paragraph(company, company_style))
-                    
-                    # Date range
-                    start_date = self.format_date(work.get("startDate", ""))
-                    end_date = self.format_date(work.get("endDate", "")) if work.get("endDate") else "Present"
-                    
-                    if start_date:
-                        date_text = f"{start_date} - {end_date}"
-                        story.append(Paragraph(date_text, date_style))
-                    
-                    # Job description
-                    if work.get("summary") and work["summary"].strip():
-                        clean_summary = self.clean_html(work["summary"])
-                        # Format bullet points properly
-                        if '•' in clean_summary:
-                            bullets = [bullet.strip() for bullet in clean_summary.split('•') if bullet.strip()]
-                            for bullet in bullets:
-                                if bullet:
-                                    story.append(Paragraph(f"• {bullet}", content_style))
-                        else:
-                            story.append(Paragraph(clean_summary, content_style))
-                    
-                    story.append(Spacer(1, 4))  # Reduced from 8
-            
-            # Education (already sorted)
-            education_items = self.resume_data.get("education", [])
-            if education_items:
-                story.append(Paragraph("EDUCATION", section_style))
-                
-                for education in education_items:
-                    institution = education.get("institution", "")
-                    area = education.get("area", "")
-                    study_type = education.get("studyType", "")
-                    
-                    if institution:
-                        story.append(Paragraph(institution, job_title_style))
-                    
-                    # Degree information
-                    degree_info = []
-                    if study_type:
-                        degree_info.append(study_type)
-                    if area:
-                        degree_info.append(f"in {area}")
-                    
-                    if degree_info:
-                        story.append(Paragraph(" ".join(degree_info), company_style))
-                    
-                    # Date range
-                    start_date = self.format_date(education.get("startDate", ""))
-                    end_date = self.format_date(education.get("endDate", "")) if education.get("endDate") else "Present"
-                    
-                    if start_date:
-                        date_text = f"{start_date} - {end_date}"
-                        story.append(Paragraph(date_text, date_style))
-                    
-                    # GPA (on same line as dates to save space)
-                    if education.get("gpa"):
-                        story.append(Paragraph(f"GPA: {education['gpa']}", content_style))
-                    
-                    # Additional details
-                    if education.get("summary") and education["summary"].strip():
-                        clean_summary = self.clean_html(education["summary"])
-                        story.append(Paragraph(clean_summary, content_style))
-                    
-                    # Relevant courses (more compact formatting)
-                    if education.get("courses") and len(education["courses"]) > 0:
-                        valid_courses = [course.strip() for course in education["courses"] if course.strip()]
-                        if valid_courses:
-                            courses_text = f"Coursework: {', '.join(valid_courses)}"
-                            story.append(Paragraph(courses_text, content_style))
-                    
-                    story.append(Spacer(1, 4))  # Reduced from 8
-            
-            # Technical Skills (more compact)
-            skills = self.resume_data.get("skills", {})
-            technologies = skills.get("technologies", [])
-            if technologies:
-                story.append(Paragraph("TECHNICAL SKILLS", section_style))
-                
-                skill_names = [tech.get("name", "") for tech in technologies if tech.get("name")]
-                if skill_names:
-                    # More compact skill formatting
-                    skills_text = " • ".join(skill_names)
-                    story.append(Paragraph(skills_text, skills_style))
-            
-            # Minimal footer space
-            story.append(Spacer(1, 8))      # Reduced from 20
+            # Work and education are kept sorted by the edits, so reading never reorders them
+            cached, layout, version = self.export_snapshot("pdf", trace)
+            if cached is not None:
+                return io.BytesIO(cached)
             
-            # If no content exists, add a placeholder
-            if len(story) <= 3:  # Only header elements
-                story.append(Paragraph("This resume is empty. Please add your information using the web interface.", content_style))
-            
-            doc.build(story)
-            buffer.seek(0)
+            # reportlab is imported on the first export, not at startup
+            pdf_export = load_pdf_export()
+            buffer = pdf_export.render_pdf(layout, trace)
+            self.store_export("pdf", buffer.getvalue(), version)
             return buffer
             
         except Exception as e:
@@ -624,22 +998,26 @@ class ResumeWebApp:
             print(f"Full traceback: {traceback.format_exc()}")
             raise e
     
-def create_html(self):
-    """Create clean, styled HTML resume for copy/paste into static sites"""
-    try:
-        # Sort work and education by date before HTML generation
-        self.sort_work_by_date()
-        self.sort_education_by_date()
-        
-        basics = self.resume_data.get("basics", {})
+    def create_html(self, trace=None):
+        """Create clean, styled HTML resume for copy/paste into static sites
         
-        # Generate HTML content
-        html_content = '''<!DOCTYPE html>
+        Pass a metrics.RenderTrace to record per-stage timings and counts.
+        """
+        trace = trace or metrics.NULL_TRACE
+        try:
+            cached, layout, version = self.export_snapshot("html", trace)
+            if cached is not None:
+                return cached
+            
+            assemble_started = time.perf_counter()
+            
+            # Generate HTML content
+            html_content = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>''' + (basics.get("name", "Resume") + " - Resume") + '''</title>
+    <title>''' + (layout.name.markup + " - Resume") + '''</title>
     <style>
         * {
             margin: 0;
@@ -776,139 +1154,402 @@ def create_html(self):
 </head>
 <body>
     <header class="header">'''
-        
-        # Add name, title, contact info
-        if basics.get("name"):
-            html_content += f'\n        <h1 class="name">{basics["name"]}</h1>'
-        
-        if basics.get("label"):
-            html_content += f'\n        <div class="title">{basics["label"]}</div>'
-        
-        # Contact info
-        contact_info = []
-        if basics.get("email"):
-            contact_info.append(f'📧 {basics["email"]}')
-        if basics.get("phone"):
-            contact_info.append(f'📱 {basics["phone"]}')
-        if basics.get("location", {}).get("city"):
-            contact_info.append(f'📍 {basics["location"]["city"]}')
-        
-        if contact_info:
-            html_content += f'\n        <div class="contact-info">{" • ".join(contact_info)}</div>'
-        
-        html_content += '\n    </header>\n'
-        
-        # Professional Summary
-        if basics.get("summary") and basics["summary"].strip():
-            clean_summary = self.clean_html(basics["summary"])
-            html_content += f'''
-    <section class="section">
-        <h2 class="section-title">Professional Summary</h2>
-        <div>{clean_summary}</div>
-    </section>'''
-        
-        # Work Experience
-        work_items = self.resume_data.get("work", [])
-        if work_items:
-            html_content += '\n    <section class="section">\n        <h2 class="section-title">Professional Experience</h2>'
             
-            for work in work_items:
-                current_badge = '<span class="current-badge">Current</span>' if work.get("isWorkingHere") else ''
-                start_date = self.format_date(work.get("startDate", ""))
-                end_date = self.format_date(work.get("endDate", "")) if work.get("endDate") else "Present"
-                
-                html_content += f'''
-        <div class="job">
-            <div class="job-title">{work.get("position", "Position")}{current_badge}</div>
-            <div class="company">{work.get("name", "Company")}</div>'''
-                
-                if start_date:
-                    html_content += f'\n            <div class="date-range">{start_date} - {end_date}</div>'
-                
-                if work.get("summary") and work["summary"].strip():
-                    clean_summary = self.clean_html(work["summary"])
-                    if '•' in clean_summary:
-                        bullets = [bullet.strip() for bullet in clean_summary.split('•') if bullet.strip()]
-                        html_content += '\n            <ul>'
-                        for bullet in bullets:
-                            html_content += f'\n                <li>{bullet}</li>'
-                        html_content += '\n            </ul>'
-                    else:
-                        html_content += f'\n            <div>{clean_summary}</div>'
-                
-                html_content += '\n        </div>'
+            # Add name, title, contact info
+            if layout.name.text:
+                html_content += f'\n        <h1 class="name">{layout.name.markup}</h1>'
             
-            html_content += '\n    </section>'
-        
-        # Education
-        education_items = self.resume_data.get("education", [])
-        if education_items:
-            html_content += '\n    <section class="section">\n        <h2 class="section-title">Education</h2>'
+            if layout.label.text:
+                html_content += f'\n        <div class="title">{layout.label.markup}</div>'
             
-            for education in education_items:
-                current_badge = '<span class="current-badge">Current</span>' if education.get("isStudyingHere") else ''
-                start_date = self.format_date(education.get("startDate", ""))
-                end_date = self.format_date(education.get("endDate", "")) if education.get("endDate") else "Present"
+            # Contact info
+            contact_info = [f'{CONTACT_ICONS[kind]} {contact.markup}' for kind, contact in layout.contacts]
+            
+            if contact_info:
+                html_content += f'\n        <div class="contact-info">{" • ".join(contact_info)}</div>'
+            
+            html_content += '\n    </header>\n'
+            
+            for section in layout.sections:
+                # Professional Summary
+                if section.key == "summary":
+                    html_content += f'''
+    <section class="section">
+        <h2 class="section-title">{section.title}</h2>
+        <div>{section.blocks[0].runs[0].markup}</div>
+    </section>'''
                 
-                degree_info = []
-                if education.get("studyType"):
-                    degree_info.append(education["studyType"])
-                if education.get("area"):
-                    degree_info.append(f"in {education['area']}")
+                # Work Experience
+                elif section.key == "work":
+                    html_content += f'\n    <section class="section">\n        <h2 class="section-title">{section.title}</h2>'
+                    
+                    for work in section.blocks:
+                        current_badge = '<span class="current-badge">Current</span>' if work.current else ''
+                        
+                        html_content += f'''
+        <div class="job">
+            <div class="job-title">{work.title.markup}{current_badge}</div>
+            <div class="company">{work.subtitle.markup}</div>'''
+                        
+                        if work.dates:
+                            html_content += f'\n            <div class="date-range">{work.dates}</div>'
+                        
+                        for block in work.details:
+                            if block.kind == "highlights":
+                                html_content += '\n            <ul>'
+                                for highlight in block.runs:
+                                    html_content += f'\n                <li>{highlight.markup}</li>'
+                                html_content += '\n            </ul>'
+                            else:
+                                html_content += f'\n            <div>{block.runs[0].markup}</div>'
+                        
+                        html_content += '\n        </div>'
+                    
+                    html_content += '\n    </section>'
                 
-                html_content += f'''
+                # Education
+                elif section.key == "education":
+                    html_content += f'\n    <section class="section">\n        <h2 class="section-title">{section.title}</h2>'
+                    
+                    for education in section.blocks:
+                        current_badge = '<span class="current-badge">Current</span>' if education.current else ''
+                        
+                        html_content += f'''
         <div class="education-item">
-            <div class="edu-title">{education.get("institution", "Institution")}{current_badge}</div>'''
-                
-                if degree_info:
-                    html_content += f'\n            <div class="institution">{" ".join(degree_info)}</div>'
-                
-                if start_date:
-                    html_content += f'\n            <div class="date-range">{start_date} - {end_date}</div>'
-                
-                if education.get("gpa"):
-                    html_content += f'\n            <div>GPA: {education["gpa"]}</div>'
+            <div class="edu-title">{education.title.markup}{current_badge}</div>'''
+                        
+                        if education.subtitle.text:
+                            html_content += f'\n            <div class="institution">{education.subtitle.markup}</div>'
+                        
+                        if education.dates:
+                            html_content += f'\n            <div class="date-range">{education.dates}</div>'
+                        
+                        for block in education.details:
+                            if block.kind == "gpa":
+                                html_content += f'\n            <div>GPA: {block.runs[0].markup}</div>'
+                        
+                        html_content += '\n        </div>'
+                    
+                    html_content += '\n    </section>'
                 
-                html_content += '\n        </div>'
-            
-            html_content += '\n    </section>'
-        
-        # Skills
-        skills = self.resume_data.get("skills", {})
-        technologies = skills.get("technologies", [])
-        if technologies:
-            html_content += '''
+                # Skills
+                elif section.key == "skills":
+                    html_content += f'''
     <section class="section">
-        <h2 class="section-title">Technical Skills</h2>
+        <h2 class="section-title">{section.title}</h2>
         <div class="skills-list">'''
+                    
+                    for skill in section.blocks[0].runs:
+                        html_content += f'\n            <span class="skill-tag">{skill.markup}</span>'
+                    
+                    html_content += '\n        </div>\n    </section>'
+            
+            # Close HTML
+            html_content += '\n</body>\n</html>'
+            trace.add("assemble", time.perf_counter() - assemble_started)
             
-            skill_names = [tech.get("name", "") for tech in technologies if tech.get("name")]
-            for skill in skill_names:
-                html_content += f'\n            <span class="skill-tag">{skill}</span>'
+            if trace.enabled:
+                trace.count("sections", html_content.count('<section class="section">'))
+                trace.count("bytes", len(html_content.encode('utf-8')))
+            return self.store_export("html", html_content, version)
             
-            html_content += '\n        </div>\n    </section>'
+        except Exception as e:
+            print(f"HTML Creation Error: {str(e)}")
+            print(f"Full traceback: {traceback.format_exc()}")
+            raise e
+
+    def create_text(self, export_format="txt", trace=None):
+        """Create a plain-text ("txt") or Markdown ("md") resume for ATS ingestion and email bodies
         
-        # Close HTML
-        html_content += '\n</body>\n</html>'
+        Pass a metrics.RenderTrace to record per-stage timings and counts.
+        """
+        trace = trace or metrics.NULL_TRACE
+        cached, layout, version = self.export_snapshot(export_format, trace)
+        if cached is not None:
+            return cached
         
-        return html_content
+        with trace.stage("assemble"):
+            content = text_export.render(layout, export_format)
         
-    except Exception as e:
-        print(f"HTML Creation Error: {str(e)}")
-        print(f"Full traceback: {traceback.format_exc()}")
-        raise e
+        if trace.enabled:
+            trace.count("sections", len(layout.sections))
+            trace.count("bytes", len(content.encode('utf-8')))
+        return self.store_export(export_format, content, version)
 
 # Initialize the resume app
 resume_app = ResumeWebApp()
 
+watcher = None
+watcher_lock = threading.Lock()
+
+def start_watcher():
+    """Start the resumes directory watcher once per process (after any fork) when enabled"""
+    global watcher
+    if watcher is not None or not app.config['WATCH_RESUMES']:
+        return watcher
+    with watcher_lock:
+        if watcher is None:
+            new_watcher = resume_watcher.ResumeWatcher(resume_app.resumes_directory)
+            resume_app.get_catalog().watch(new_watcher)
+            new_watcher.subscribe(resume_app.on_file_event)
+            watcher = new_watcher.start()
+    return watcher
+
+event_broker = None
+event_broker_lock = threading.Lock()
+
+def start_event_broker():
+    """Start following the shared event log once per process (after any fork) when enabled"""
+    global event_broker
+    if event_broker is not None or not app.config['LIVE_EVENTS']:
+        return event_broker
+    with event_broker_lock:
+        if event_broker is None:
+            broker = resume_events.EventBroker(resume_app.resumes_directory)
+            broker.subscribe(resume_app.on_change_event)
+            resume_app.events = broker
+            event_broker = broker.start()
+    return event_broker
+
+compactor = None
+compactor_lock = threading.Lock()
+
+def get_compactor():
+    """The retention compactor for the resumes directory, sharing the app's catalog"""
+    global compactor
+    with compactor_lock:
+        if compactor is None or compactor.directory != resume_app.resumes_directory:
+            compactor = retention.Compactor(
+                resume_app.resumes_directory, app.config['RETENTION_POLICY'], app.config['RETENTION_MODE'],
+                catalog=resume_app.get_catalog(),
+                # The open resume, and cached ones whose journaled edits are not in their files yet
+                protected=lambda: ([resume_app.current_filename] if resume_app.current_filename else []) + resume_app.cache.dirty())
+        return compactor
+
+def start_compactor():
+    """Start background retention once per process (after any fork) when enabled"""
+    if app.config['RETENTION'] and (compactor is None or compactor.thread is None):
+        get_compactor().start(app.config['RETENTION_INTERVAL'])
+
+journal_flusher = None
+journal_flusher_lock = threading.Lock()
+
+def flush_idle_journals(interval):
+    """Compact the open resume once its journal goes idle, and retry cached resumes left dirty"""
+    while True:
+        time.sleep(interval)
+        try:
+            resume_app.compact_journal(force=False)
+            resume_app.cache.flush_all()
+        except Exception as e:
+            print(f"Error compacting idle journal: {e}")
+
+def start_journal_flusher():
+    """Start the idle journal check once per process (after any fork) when journaling is on"""
+    global journal_flusher
+    idle = app.config['JOURNAL_IDLE_SECONDS']
+    if journal_flusher is not None or not app.config['JOURNAL'] or idle <= 0:
+        return journal_flusher
+    with journal_flusher_lock:
+        if journal_flusher is None:
+            thread = threading.Thread(target=flush_idle_journals, args=(max(idle / 2, 0.5),), name="journal-flusher",
+                                      daemon=True)
+            thread.start()
+            journal_flusher = thread
+    return journal_flusher
+
+# Leave the open resume complete on disk when the process exits
+atexit.register(resume_app.compact_journal)
+atexit.register(resume_app.cache.flush_all)
+
+@app.before_request
+def sync_external_changes():
+    start_watcher()
+    start_event_broker()
+    start_compactor()
+    start_journal_flusher()
+    resume_app.apply_external_changes()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    metrics.HTTP_IN_FLIGHT.inc()
+
+@app.after_request
+def record_request_metrics(response):
+    if 'request_started' in g:
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        metrics.HTTP_LATENCY.observe(time.perf_counter() - g.request_started, route=route, method=request.method)
+        metrics.HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    if g.pop('request_started', None) is not None:
+        metrics.HTTP_IN_FLIGHT.dec()
+
+request_profiler = profiling.RequestProfiler(app.config['PROFILE_DIRECTORY'])
+
+@app.before_request
+def start_request_profile():
+    if not app.config['PROFILING_ENABLED']:
+        return
+    mode = profiling.requested_mode(request.headers.get('X-Profile') or request.args.get('profile'))
+    if mode:
+        g.profile_session = request_profiler.start(mode, request.method, request.path)
+
+@app.after_request
+def finish_request_profile(response):
+    profile_session = g.pop('profile_session', None)
+    if profile_session is not None:
+        response.headers['X-Profile-Id'] = profile_session.stop(response.status_code)
+    return response
+
+@app.teardown_request
+def abandon_request_profile(exc):
+    profile_session = g.pop('profile_session', None)
+    if profile_session is not None:
+        profile_session.stop(500)
+
+def if_match_revision():
+    """The resume revision named by the If-Match header, or None when the client did not ask for a check"""
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    tag = next(iter(request.if_match.as_set(include_weak=True)))
+    # A tag that is not a revision never matches, so the client gets the current one back
+    return int(tag) if tag.isdigit() else -1
+
+@app.errorhandler(resume_model.RevisionConflict)
+def revision_conflict(error):
+    """409 for an edit based on an outdated revision; the client refetches and retries"""
+    response = jsonify({
+        "success": False,
+        "message": "The resume was changed by someone else; reload it and try again",
+        "version": error.current
+    })
+    response.status_code = 409
+    response.set_etag(str(error.current))
+    return response
+
+@app.route('/api/profiles')
+def list_profiles():
+    """List stored request profiles"""
+    if not app.config['PROFILING_ENABLED']:
+        abort(404)
+    return jsonify({"success": True, "profiles": request_profiler.list_profiles()})
+
+@app.route('/api/profiles/<path:filename>')
+def download_profile(filename):
+    """Download a stored .pstats, .collapsed or .json profile artifact"""
+    if not app.config['PROFILING_ENABLED'] or not request_profiler.is_artifact(filename):
+        abort(404)
+    return send_from_directory(os.path.abspath(request_profiler.directory), filename, as_attachment=True)
+
+@app.route('/metrics')
+def get_metrics():
+    """Expose request, export, save and catalog metrics in Prometheus text format"""
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/retention')
+def get_retention():
+    """Retention policy and what the compactor has reclaimed so far"""
+    current = get_compactor()
+    return jsonify({
+        "success": True,
+        "enabled": app.config['RETENTION'],
+        "mode": current.mode,
+        "policy": current.policy._asdict(),
+        "totals": current.totals
+    })
+
+@app.route('/api/retention/run', methods=['POST'])
+def run_retention():
+    """Run one full retention pass now; {"dry_run": true} only reports what would go"""
+    dry_run = bool((request.get_json(silent=True) or {}).get('dry_run', False))
+    report = get_compactor().run(dry_run=dry_run)
+    return jsonify({"success": True, "dry_run": dry_run, "files": report["files"], "reclaimed_bytes": report["bytes"]})
+
+@app.route('/api/bulk-edit', methods=['POST'])
+def run_bulk_edit():
+    """Apply {"transform": {...}, "where": {...}} to every matching resume file; "dry_run" only reports"""
+    data = request.get_json(silent=True) or {}
+    dry_run = bool(data.get('dry_run', False))
+    with resume_app.lock.write():
+        # Files with journaled edits are skipped, and the open resume nearly always has some: write them out first
+        resume_app.compact_journal()
+        resume_app.cache.flush_all()
+        catalog = resume_app.get_catalog()
+    # Not held during the run: an edit made meanwhile is journaled, and write_file then skips or refuses that file
+    try:
+        report = bulk_edit.run(resume_app.resumes_directory, data.get('transform'), data.get('where') or {},
+                               app.config['BULK_EDIT_WORKERS'], dry_run, catalog=catalog)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    changed = {result["filename"] for result in report["results"] if result["status"] == "changed"}
+    reload = False
+    if not dry_run and changed:
+        with resume_app.lock.write():
+            filename = resume_app.current_filename
+            reload = filename in changed and resume_app.file_signature(filename) != resume_app._file_signature
+            if reload:
+                # Pick up the edited file now instead of waiting for the watcher
+                resume_app.load_resume(filename)
+    if reload:
+        announce_reload()
+    return jsonify({"success": True, **report})
+
+def event_subscription(broker, resume, kind=resume_events.Subscription):
+    """A subscription to resume's events (a file name, "" for an unsaved resume), or the open resume's for None"""
+    return kind(broker, resume if resume is not None else lambda: resume_app.current_filename)
+
+stream_slots = threading.Semaphore(app.config['EVENT_STREAMS']) if app.config['EVENT_STREAMS'] > 0 else None
+
+class StreamSlot:
+    """An event stream's messages, holding one of the EVENT_STREAMS slots until the response is closed"""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.held = True
+
+    def __iter__(self):
+        return self.messages
+
+    def close(self):
+        self.messages.close()
+        if self.held:
+            self.held = False
+            stream_slots.release()
+
+@app.route('/api/events')
+def stream_events():
+    """Server-Sent Events for ?resume=<filename> ("" for an unsaved resume), by default whichever resume is open"""
+    broker = start_event_broker()
+    if broker is None:
+        return jsonify({"success": False, "message": "Live updates are disabled"}), 404
+    # Streams beyond the budget would take the threads edits need; the tab goes without live updates instead
+    if stream_slots is not None and not stream_slots.acquire(blocking=False):
+        return jsonify({"success": False, "message": "Too many open live update streams"}), 503
+    subscription = event_subscription(broker, request.args.get('resume'))
+    messages = subscription.messages(request.headers.get('Last-Event-ID'))
+    response = Response(StreamSlot(messages) if stream_slots is not None else messages, mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def announce_reload():
+    """Tell this process's open tabs the editor switched to another resume"""
+    if resume_app.events is not None:
+        resume_app.events.announce({"type": "reload", "resume": resume_app.current_filename})
+
 @app.route('/')
 def index():
-    # Sort work and education by date before rendering
-    resume_app.sort_work_by_date()
-    resume_app.sort_education_by_date()
-    return render_template('index.html', 
-                         resume_data=resume_app.resume_data, 
-                         current_filename=resume_app.current_filename)
+    # Work and education are kept sorted by date on every change
+    with resume_app.lock.read():
+        return render_template('index.html', 
+                             resume_data=resume_app.resume_data, 
+                             current_filename=resume_app.current_filename,
+                             live_events=app.config['LIVE_EVENTS'])
 
 @app.route('/api/resumes')
 def get_resumes():
@@ -923,12 +1564,14 @@ def get_resumes():
 @app.route('/api/resume/new', methods=['POST'])
 def create_new_resume():
     """Create a new resume"""
-    resume_app.create_new_resume()
-    return jsonify({
-        "success": True, 
-        "message": "New resume created",
-        "resume_data": resume_app.resume_data
-    })
+    with resume_app.lock.write():
+        resume_app.create_new_resume()
+        announce_reload()
+        return jsonify({
+            "success": True, 
+            "message": "New resume created",
+            "resume_data": resume_app.resume_data
+        })
 
 @app.route('/api/resume/load', methods=['POST'])
 def load_resume():
@@ -939,15 +1582,16 @@ def load_resume():
     if not filename:
         return jsonify({"success": False, "message": "Filename is required"})
     
-    if resume_app.load_resume(filename):
-        return jsonify({
-            "success": True, 
-            "message": f"Resume '{filename}' loaded successfully",
-            "resume_data": resume_app.resume_data,
-            "current_filename": resume_app.current_filename
-        })
-    else:
-        return jsonify({"success": False, "message": f"Failed to load resume '{filename}'"})
+    with resume_app.lock.write():
+        if resume_app.load_resume(filename):
+            announce_reload()
+            return jsonify({
+                "success": True, 
+                "message": f"Resume '{filename}' loaded successfully",
+                "resume_data": resume_app.resume_data,
+                "current_filename": resume_app.current_filename
+            })
+    return jsonify({"success": False, "message": f"Failed to load resume '{filename}'"})
 
 @app.route('/api/resume/save', methods=['POST'])
 def save_resume():
@@ -955,8 +1599,10 @@ def save_resume():
     data = request.get_json()
     filename = data.get('filename')
     save_as = data.get('save_as', False)
+    with resume_app.lock.write():
+        resume_app.check_revision(if_match_revision())
+        saved_filename = resume_app.save_resume(filename, save_as)
     
-    saved_filename = resume_app.save_resume(filename, save_as)
     
     if saved_filename:
         return jsonify({
@@ -979,83 +1625,322 @@ def delete_resume():
     success, message = resume_app.delete_resume(filename)
     return jsonify({"success": success, "message": message})
 
+def history_response(version, message):
+    """Response for undo/redo/restore: the restored data, like a resume load"""
+    if version is None:
+        return jsonify({"success": False, "message": message})
+    response = jsonify({
+        "success": True,
+        "message": f"Restored version {version}",
+        "version": version,
+        "resume_data": resume_app.resume_data
+    })
+    response.set_etag(str(resume_app.revision))
+    return response
+
+def parse_batch_operation(index, operation):
+    """[op, args] for one requested batch operation, with its fields checked"""
+    op = operation.get('op') if isinstance(operation, dict) else None
+    if op not in BATCH_OPS:
+        raise BatchError(index, f"unknown operation {op!r}; expected one of: {', '.join(BATCH_OPS)}")
+    args = []
+    for field in BATCH_OPS[op]:
+        value = operation.get(field)
+        expected = BATCH_FIELD_TYPES[field]
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise BatchError(index, f"{op} needs '{field}' ({expected.__name__})")
+        if field == "name" and not value.strip():
+            raise BatchError(index, "Skill name is required")
+        if field == "highlights" and not all(isinstance(highlight, str) for highlight in value):
+            raise BatchError(index, "highlights must be a list of strings")
+        args.append(value)
+    return [op, args]
+
+@app.route('/api/resume/<path:resume_id>/batch', methods=['POST'])
+def batch_edit(resume_id):
+    """Apply {"operations": [{"op": ..., ...}, ...]} to the open resume as one edit: all of them or none"""
+    operations = (request.get_json(silent=True) or {}).get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"success": False, "message": "operations must be a non-empty list"}), 400
+    try:
+        operations = [parse_batch_operation(index, operation) for index, operation in enumerate(operations)]
+        with resume_app.lock.write():
+            # "current" names the open resume even before its first save
+            if resume_id not in ("current", resume_app.current_filename):
+                return jsonify({"success": False, "message": f"Resume '{resume_id}' is not the open resume"}), 409
+            event = resume_app.apply("batch", operations, expected=if_match_revision())
+            response = jsonify({
+                "success": True,
+                "message": f"Applied {len(operations)} operations",
+                "version": event["version"],
+                "resume_data": resume_app.resume_data
+            })
+    except BatchError as e:
+        return jsonify({"success": False, "message": str(e), "index": e.index}), 400
+    response.set_etag(str(event["version"]))
+    return response
+
+@app.route('/api/resume/history')
+def get_history():
+    """Journaled edits of the open resume, oldest first"""
+    journal = resume_app.get_journal()
+    history = journal.history() if journal is not None and journal.exists() else []
+    return jsonify({
+        "success": True,
+        "history": history,
+        "current": history[-1]["position"] if history else None,
+        "can_redo": bool(journal and journal.redo_stack)
+    })
+
+@app.route('/api/resume/undo', methods=['POST'])
+def undo_edit():
+    with resume_app.lock.write():
+        return history_response(resume_app.undo(if_match_revision()), "Nothing to undo")
+
+@app.route('/api/resume/redo', methods=['POST'])
+def redo_edit():
+    with resume_app.lock.write():
+        return history_response(resume_app.redo(if_match_revision()), "Nothing to redo")
+
+@app.route('/api/resume/restore', methods=['POST'])
+def restore_version():
+    """Restore a journal version given as {"version": n} or {"timestamp": "YYYY-MM-DDTHH:MM:SS"}"""
+    data = request.get_json(silent=True) or {}
+    journal = resume_app.get_journal()
+    try:
+        if journal is None or not journal.exists():
+            raise resume_journal.JournalError("This resume has no edit history yet")
+        if isinstance(data.get('version'), int):
+            version = data['version']
+        elif isinstance(data.get('timestamp'), str):
+            version = journal.seq_at(data['timestamp'])
+        else:
+            return jsonify({"success": False, "message": "version or timestamp is required"}), 400
+        with resume_app.lock.write():
+            return history_response(resume_app.restore_version(version, if_match_revision()), "")
+    except resume_journal.JournalError as e:
+        return jsonify({"success": False, "message": str(e)}), 404
+
+@app.route('/api/variants')
+def list_variants():
+    """Variants inheriting from ?base=<filename>"""
+    base = request.args.get('base')
+    if not base:
+        return jsonify({"success": False, "message": "base is required"}), 400
+    resume_app.compact_files(resume_variants.family(resume_app.resumes_directory, base))
+    documents = resume_variants.family_documents(resume_app.resumes_directory, base)
+    return jsonify({
+        "success": True,
+        "base": base,
+        "variants": [{"filename": filename, "name": document.get("name"), "parent": document["base"],
+                      "overrides": document.get("overrides", {})} for filename, document in documents.items()]
+    })
+
+@app.route('/api/variants', methods=['POST'])
+def create_variant():
+    """Create a variant of {"base": filename} from {"overrides": {...}}, optionally as {"filename": ...}"""
+    data = request.get_json(silent=True) or {}
+    base, overrides = data.get('base'), data.get('overrides', {})
+    if not base or not isinstance(overrides, dict):
+        return jsonify({"success": False, "message": "base and an overrides object are required"}), 400
+    resume_app.compact_files([base] + resume_variants.bases(resume_app.resumes_directory, base))
+    try:
+        filename = resume_variants.create_variant(resume_app.resumes_directory, base, overrides, data.get('filename'))
+    except resume_variants.VariantError as e:
+        return jsonify({"success": False, "message": str(e)}), 404
+    except (resume_model.ResumeValidationError, AttributeError, TypeError) as e:
+        return jsonify({"success": False, "message": f"Invalid overrides: {e}"}), 400
+    return jsonify({"success": True, "message": f"Variant saved as '{filename}'", "filename": filename})
+
+@app.route('/api/variants/export', methods=['POST'])
+def export_variants():
+    """Render {"base": filename} and all its variants as {"formats": ["pdf", "txt", "md"]} into one zip"""
+    data = request.get_json(silent=True) or {}
+    base, formats = data.get('base'), data.get('formats', ["pdf"])
+    if not base or not isinstance(formats, list) or not formats:
+        return jsonify({"success": False, "message": "base and a list of formats are required"}), 400
+    if "pdf" in formats:
+        load_pdf_export()
+    directory = resume_app.resumes_directory
+    resume_app.compact_files([base] + resume_variants.bases(directory, base) + resume_variants.family(directory, base))
+    archive = io.BytesIO()
+    try:
+        with metrics.EXPORT_DURATION.time(format="variants"), zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as bundle:
+            for filename, export_format, payload in resume_variants.render_family(resume_app.resumes_directory, base, formats):
+                bundle.writestr(f"{os.path.splitext(filename)[0]}.{export_format}", payload)
+    except resume_variants.VariantError as e:
+        return jsonify({"success": False, "message": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    archive.seek(0)
+    metrics.EXPORT_BYTES.observe(archive.getbuffer().nbytes, format="variants")
+    return send_file(archive, as_attachment=True, download_name=f"{os.path.splitext(base)[0]}_variants.zip",
+                     mimetype='application/zip')
+
+def change_response(event, message, **extra):
+    """Response for an edit: the changed section or item, so the page patches it instead of refetching"""
+    response = jsonify({"success": True, "message": message, "version": event["version"], "change": event["change"], **extra})
+    response.set_etag(str(event["version"]))
+    return response
+
 @app.route('/api/basics', methods=['POST'])
 def update_basics():
     data = request.get_json()
-    resume_app.update_basics(data)
-    resume_app.save_resume()
-    return jsonify({"success": True, "message": "Basic information updated successfully"})
+    event = resume_app.apply("update_basics", data, expected=if_match_revision())
+    return change_response(event, "Basic information updated successfully")
 
 @app.route('/api/work', methods=['POST'])
 def add_work():
     data = request.get_json()
-    resume_app.add_work_experience(data)
-    resume_app.save_resume()
-    return jsonify({"success": True, "message": "Work experience added successfully"})
+    event = resume_app.apply("add_work_experience", data, expected=if_match_revision())
+    return change_response(event, "Work experience added successfully")
 
 @app.route('/api/work/<work_id>', methods=['DELETE'])
 def delete_work(work_id):
-    resume_app.delete_work_experience(work_id)
-    resume_app.save_resume()
-    return jsonify({"success": True, "message": "Work experience deleted successfully"})
+    event = resume_app.apply("delete_work_experience", work_id, expected=if_match_revision())
+    return change_response(event, "Work experience deleted successfully")
+
+@app.route('/api/work/<work_id>/highlights', methods=['GET'])
+def get_highlights(work_id):
+    with resume_app.lock.read():
+        work = resume_app.find_work(work_id)
+        if work is None:
+            return jsonify({"success": False, "message": "Work experience not found"}), 404
+        return jsonify({"success": True, "highlights": work.get("highlights", [])})
+
+@app.route('/api/work/<work_id>/highlights', methods=['PUT'])
+def replace_highlights(work_id):
+    highlights = (request.get_json(silent=True) or {}).get('highlights')
+    if not isinstance(highlights, list) or not all(isinstance(highlight, str) for highlight in highlights):
+        return jsonify({"success": False, "message": "highlights must be a list of strings"}), 400
+    with resume_app.lock.write():
+        event = resume_app.apply("set_highlights", work_id, highlights, expected=if_match_revision())
+        if not event:
+            return jsonify({"success": False, "message": "Work experience not found"}), 404
+        return change_response(event, "Highlights updated successfully", highlights=resume_app.find_work(work_id)["highlights"])
+
+@app.route('/api/work/<work_id>/highlights', methods=['POST'])
+def add_highlight(work_id):
+    data = request.get_json(silent=True) or {}
+    highlight = data.get('text')
+    if not isinstance(highlight, str) or not highlight.strip():
+        return jsonify({"success": False, "message": "Highlight text is required"}), 400
+    # Read, modify and write the list under one lock so concurrent inserts are not lost
+    with resume_app.lock.write():
+        work = resume_app.find_work(work_id)
+        if work is None:
+            return jsonify({"success": False, "message": "Work experience not found"}), 404
+        highlights = list(work.get("highlights", []))
+        index = data.get('index', len(highlights))
+        if not isinstance(index, int) or not 0 <= index <= len(highlights):
+            return jsonify({"success": False, "message": "Highlight index out of range"}), 400
+        highlights.insert(index, highlight)
+        event = resume_app.apply("set_highlights", work_id, highlights, expected=if_match_revision())
+        return change_response(event, "Highlight added successfully", highlights=work["highlights"])
+
+@app.route('/api/work/<work_id>/highlights/<int:index>', methods=['PUT', 'DELETE'])
+def edit_highlight(work_id, index):
+    with resume_app.lock.write():
+        work = resume_app.find_work(work_id)
+        if work is None:
+            return jsonify({"success": False, "message": "Work experience not found"}), 404
+        highlights = list(work.get("highlights", []))
+        if not 0 <= index < len(highlights):
+            return jsonify({"success": False, "message": "Highlight index out of range"}), 404
+        if request.method == 'DELETE':
+            del highlights[index]
+            message = "Highlight deleted successfully"
+        else:
+            highlight = (request.get_json(silent=True) or {}).get('text')
+            if not isinstance(highlight, str) or not highlight.strip():
+                return jsonify({"success": False, "message": "Highlight text is required"}), 400
+            highlights[index] = highlight
+            message = "Highlight updated successfully"
+        event = resume_app.apply("set_highlights", work_id, highlights, expected=if_match_revision())
+        return change_response(event, message, highlights=work["highlights"])
 
 @app.route('/api/education', methods=['POST'])
 def add_education():
     data = request.get_json()
-    resume_app.add_education(data)
-    resume_app.save_resume()
-    return jsonify({"success": True, "message": "Education entry added successfully"})
+    event = resume_app.apply("add_education", data, expected=if_match_revision())
+    return change_response(event, "Education entry added successfully")
 
 @app.route('/api/education/<education_id>', methods=['DELETE'])
 def delete_education(education_id):
-    resume_app.delete_education(education_id)
-    resume_app.save_resume()
-    return jsonify({"success": True, "message": "Education entry deleted successfully"})
+    event = resume_app.apply("delete_education", education_id, expected=if_match_revision())
+    return change_response(event, "Education entry deleted successfully")
 
 @app.route('/api/skills', methods=['POST'])
 def add_skill():
     data = request.get_json()
     skill_name = data.get('name')
     if skill_name:
-        resume_app.add_skill(skill_name)
-        resume_app.save_resume()
-        return jsonify({"success": True, "message": "Skill added successfully"})
+        event = resume_app.apply("add_skill", skill_name, expected=if_match_revision())
+        return change_response(event, "Skill added successfully")
     return jsonify({"success": False, "message": "Skill name is required"})
 
 @app.route('/api/skills/<int:skill_index>', methods=['DELETE'])
 def delete_skill(skill_index):
-    resume_app.delete_skill(skill_index)
-    resume_app.save_resume()
-    return jsonify({"success": True, "message": "Skill deleted successfully"})
+    event = resume_app.apply("delete_skill", skill_index, expected=if_match_revision())
+    return change_response(event, "Skill deleted successfully")
 
 @app.route('/api/data')
 def get_data():
-    # Sort work and education by date before sending to frontend
-    resume_app.sort_work_by_date()
-    resume_app.sort_education_by_date()
-    return jsonify(resume_app.resume_data)
+    # Work and education are kept sorted by date on every change
+    with resume_app.lock.read():
+        response = jsonify(resume_app.resume_data)
+        # The revision to send back in If-Match with the next edit
+        response.set_etag(str(resume_app.revision))
+    return response
+
+@app.route('/api/timeline')
+def get_timeline():
+    """Work and education entries overlapping ?start= and/or ?end= (ISO dates)"""
+    range_start = resume_model.parse_date(request.args.get('start', ''))
+    range_end = resume_model.parse_date(request.args.get('end', ''))
+    if (request.args.get('start') and range_start is None) or (request.args.get('end') and range_end is None):
+        return jsonify({"success": False, "message": "start and end must be ISO dates (YYYY-MM-DD)"}), 400
+    
+    with resume_app.lock.read():
+        work, education = resume_app.get_model().between(range_start, range_end)
+    return jsonify({
+        "success": True,
+        "work": [item.to_dict() for item in work],
+        "education": [item.to_dict() for item in education]
+    })
+
+def export_filename(extension):
+    """Use the current filename for the export name or generate one from the name"""
+    with resume_app.lock.read():
+        filename = resume_app.current_filename
+        name = resume_app.resume_data.get('basics', {}).get('name')
+    if filename:
+        base_name = os.path.splitext(filename)[0]
+        return f"{base_name}.{extension}"
+    if name:
+        clean_name = re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_')
+        return f"{clean_name}_resume.{extension}"
+    return f"resume.{extension}"
 
 @app.route('/api/export/pdf')
 def export_pdf():
     try:
-        pdf_buffer = resume_app.create_pdf()
-        # Use current filename for PDF name or generate one from name
-        pdf_name = 'resume.pdf'
-        if resume_app.current_filename:
-            base_name = os.path.splitext(resume_app.current_filename)[0]
-            pdf_name = f"{base_name}.pdf"
-        elif resume_app.resume_data.get('basics', {}).get('name'):
-            name = resume_app.resume_data['basics']['name']
-            clean_name = re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_')
-            pdf_name = f"{clean_name}_resume.pdf"
-        
-        return send_file(
+        trace = metrics.RenderTrace("pdf")
+        with metrics.EXPORT_DURATION.time(format="pdf"):
+            pdf_buffer = resume_app.create_pdf(trace)
+        trace.publish()
+        metrics.EXPORT_BYTES.observe(pdf_buffer.getbuffer().nbytes, format="pdf")
+        response = send_file(
             pdf_buffer,
             as_attachment=True,
-            download_name=pdf_name,
+            download_name=export_filename("pdf"),
             mimetype='application/pdf'
         )
+        if app.config['SERVER_TIMING']:
+            response.headers['Server-Timing'] = trace.server_timing()
+        return response
     except Exception as e:
+        metrics.EXPORT_FAILURES.inc(format="pdf")
         print(f"Export PDF Error: {str(e)}")
         print(f"Full traceback: {traceback.format_exc()}")
         return jsonify({"success": False, "error": f"PDF export failed: {str(e)}"}), 500
@@ -1064,32 +1949,59 @@ def export_pdf():
 def export_html():
     """Export resume as HTML file for copy/paste into static sites"""
     try:
-        html_content = resume_app.create_html()
-        
-        # Generate filename
-        html_name = 'resume.html'
-        if resume_app.current_filename:
-            base_name = os.path.splitext(resume_app.current_filename)[0]
-            html_name = f"{base_name}.html"
-        elif resume_app.resume_data.get('basics', {}).get('name'):
-            name = resume_app.resume_data['basics']['name']
-            clean_name = re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_')
-            html_name = f"{clean_name}_resume.html"
+        trace = metrics.RenderTrace("html")
+        with metrics.EXPORT_DURATION.time(format="html"):
+            html_content = resume_app.create_html(trace)
+        trace.publish()
         
         # Create HTML file in memory
         html_buffer = io.BytesIO(html_content.encode('utf-8'))
         html_buffer.seek(0)
+        metrics.EXPORT_BYTES.observe(html_buffer.getbuffer().nbytes, format="html")
         
-        return send_file(
+        response = send_file(
             html_buffer,
             as_attachment=True,
-            download_name=html_name,
+            download_name=export_filename("html"),
             mimetype='text/html'
         )
+        if app.config['SERVER_TIMING']:
+            response.headers['Server-Timing'] = trace.server_timing()
+        return response
     except Exception as e:
+        metrics.EXPORT_FAILURES.inc(format="html")
         print(f"Export HTML Error: {str(e)}")
         print(f"Full traceback: {traceback.format_exc()}")
         return jsonify({"success": False, "error": f"HTML export failed: {str(e)}"}), 500
 
+@app.route('/api/export/<any(txt, md):export_format>')
+def export_text(export_format):
+    """Export resume as plain text or Markdown, without reportlab or HTML"""
+    try:
+        trace = metrics.RenderTrace(export_format)
+        with metrics.EXPORT_DURATION.time(format=export_format):
+            content = resume_app.create_text(export_format, trace)
+        trace.publish()
+        
+        text_buffer = io.BytesIO(content.encode('utf-8'))
+        metrics.EXPORT_BYTES.observe(text_buffer.getbuffer().nbytes, format=export_format)
+        
+        response = send_file(
+            text_buffer,
+            as_attachment=True,
+            download_name=export_filename(export_format),
+            mimetype=text_export.FORMATS[export_format]
+        )
+        if app.config['SERVER_TIMING']:
+            response.headers['Server-Timing'] = trace.server_timing()
+        return response
+    except Exception as e:
+        metrics.EXPORT_FAILURES.inc(format=export_format)
+        print(f"Export {export_format.upper()} Error: {str(e)}")
+        print(f"Full traceback: {traceback.format_exc()}")
+        return jsonify({"success": False, "error": f"{export_format.upper()} export failed: {str(e)}"}), 500
+
+metrics.IMPORT_DURATION.set(time.perf_counter() - IMPORT_STARTED, module="app")
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
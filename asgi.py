@@ -0,0 +1,277 @@
+"""ASGI serving mode for the Flask app.
+
+Run it under any ASGI server, for example:
+
+    pip install uvicorn
+    uvicorn asgi:application --host 0.0.0.0 --port 5000 --timeout-keep-alive 300
+
+or ``python asgi.py``, which does the same when uvicorn is installed.
+
+The event loop only parses requests and writes responses, so idle keep-alive
+connections cost a socket and a coroutine rather than a thread.  Every route
+but one still runs in the regular Flask app (no second copy of the API to
+keep in sync), on an executor thread, so blocking work never runs on the
+loop:
+
+* ``io`` executor: JSON edits, loads, saves and catalog scans, which are
+  short and mostly file I/O.
+* ``render`` executor: ``/api/export/*``, which is CPU bound.  It is sized to
+  the CPU count, so a burst of exports queues instead of starving edits.
+
+``/api/events`` Server-Sent Events streams mostly wait for the next event,
+so they are served on the loop itself: each open tab is a coroutine
+awaiting its ``resume_events.AsyncSubscription``, with no thread and no
+limit besides sockets, and a closed tab is noticed as soon as the server
+reports the disconnect.  When live updates are off the route falls through
+to Flask (which answers 404).
+
+No ASGI framework is required; the bridge below implements the parts of the
+ASGI HTTP and lifespan protocols the app needs.
+"""
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+import metrics
+import resume_events
+from app import app, event_subscription, start_event_broker
+
+# Largest request body accepted; resume JSON is a few kilobytes
+MAX_BODY_BYTES = 16 * 1024 * 1024
+# Response bytes gathered per executor round trip when draining a WSGI iterable
+CHUNK_BYTES = 64 * 1024
+
+RENDER_PREFIXES = ("/api/export/",)
+STREAM_PREFIXES = ("/api/events",)
+
+
+def build_environ(scope, body):
+    """Translate an ASGI HTTP scope and request body into a WSGI environ"""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]) if server[1] is not None else "80",
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": str(client[0]),
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+            continue
+        if name == "CONTENT_LENGTH":
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class WsgiCall:
+    """One WSGI invocation, driven step by step from executor threads"""
+
+    def __init__(self, wsgi_app, environ):
+        self.wsgi_app = wsgi_app
+        self.environ = environ
+        self.status = None
+        self.headers = None
+        self.iterator = None
+        self.iterable = None
+        # Event streams are passed on part by part
+        self.streaming = False
+
+    def start_response(self, status, headers, exc_info=None):
+        if exc_info and self.status is not None:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.status = int(status.split(" ", 1)[0])
+        self.headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+        self.streaming = any(name == b"content-type" and value.startswith(b"text/event-stream")
+                             for name, value in self.headers)
+
+    def start(self):
+        """Run the app up to its first chunk; returns (chunk, more)"""
+        self.iterable = self.wsgi_app(self.environ, self.start_response)
+        self.iterator = iter(self.iterable)
+        return self.read()
+
+    def read(self):
+        """Gather up to CHUNK_BYTES of body; returns (chunk, more)"""
+        parts = []
+        size = 0
+        for part in self.iterator:
+            if part:
+                parts.append(part)
+                size += len(part)
+                if size >= CHUNK_BYTES or self.streaming:
+                    return b"".join(parts), True
+        return b"".join(parts), False
+
+    def close(self):
+        if hasattr(self.iterable, "close"):
+            self.iterable.close()
+
+
+class AsgiBridge:
+    """ASGI application serving a WSGI app from bounded executor pools"""
+
+    def __init__(self, wsgi_app, io_workers=32, render_workers=None,
+                 render_prefixes=RENDER_PREFIXES, stream_prefixes=STREAM_PREFIXES):
+        self.wsgi_app = wsgi_app
+        self.render_prefixes = tuple(render_prefixes)
+        self.stream_prefixes = tuple(stream_prefixes)
+        self.executors = {
+            "io": ThreadPoolExecutor(io_workers, thread_name_prefix="asgi-io"),
+            "render": ThreadPoolExecutor(render_workers or os.cpu_count() or 1, thread_name_prefix="asgi-render"),
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            await self.http(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1000})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def shutdown(self):
+        for executor in self.executors.values():
+            executor.shutdown(wait=True)
+
+    def executor_name(self, path):
+        return "render" if path.startswith(self.render_prefixes) else "io"
+
+    async def wait_disconnect(self, receive):
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    async def read_body(self, receive):
+        """Return the request body, or None when the client left or it is too large"""
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    async def events(self, scope, receive, send):
+        """Serve an event stream on the loop; returns False (nothing sent) when live updates are off"""
+        loop = asyncio.get_running_loop()
+        broker = await loop.run_in_executor(self.executors["io"], start_event_broker)
+        if broker is None:
+            return False
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+        headers = dict(scope.get("headers", []))
+        last_event_id = headers.get(b"last-event-id", b"").decode("latin-1") or None
+        subscription = event_subscription(broker, query.get("resume", [None])[0], resume_events.AsyncSubscription)
+        messages = subscription.stream(last_event_id)
+        message = None
+        disconnected = asyncio.ensure_future(self.wait_disconnect(receive))
+        try:
+            await send({"type": "http.response.start", "status": 200, "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache"),
+                # Keep reverse proxies from buffering the stream
+                (b"x-accel-buffering", b"no"),
+            ]})
+            while True:
+                message = asyncio.ensure_future(messages.__anext__())
+                await asyncio.wait((message, disconnected), return_when=asyncio.FIRST_COMPLETED)
+                if not message.done():
+                    return True
+                await send({"type": "http.response.body", "body": message.result().encode("utf-8"), "more_body": True})
+        finally:
+            disconnected.cancel()
+            if message is not None and not message.done():
+                # The client left while the stream waited for an event; stop it before closing it
+                message.cancel()
+                await asyncio.gather(message, return_exceptions=True)
+            await messages.aclose()
+
+    async def http(self, scope, receive, send):
+        if scope["method"] == "GET" and scope["path"].startswith(self.stream_prefixes):
+            if await self.events(scope, receive, send):
+                return
+        body = await self.read_body(receive)
+        if body is None:
+            await send({"type": "http.response.start", "status": 413,
+                        "headers": [(b"content-type", b"application/json")]})
+            await send({"type": "http.response.body",
+                        "body": b'{"success": false, "message": "Request body too large or incomplete"}'})
+            return
+
+        name = self.executor_name(scope["path"])
+        executor = self.executors[name]
+        loop = asyncio.get_running_loop()
+        call = WsgiCall(self.wsgi_app, build_environ(scope, body))
+
+        metrics.ASGI_PENDING.inc(executor=name)
+        disconnected = None
+        try:
+            chunk, more = await loop.run_in_executor(executor, call.start)
+            await send({"type": "http.response.start", "status": call.status, "headers": call.headers})
+            if call.streaming:
+                # A stream only ends when the client leaves, which servers may not report through send()
+                disconnected = asyncio.ensure_future(self.wait_disconnect(receive))
+            while more:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                if disconnected is not None and disconnected.done():
+                    return
+                chunk, more = await loop.run_in_executor(executor, call.read)
+            await send({"type": "http.response.body", "body": chunk})
+        finally:
+            metrics.ASGI_PENDING.dec(executor=name)
+            if disconnected is not None:
+                disconnected.cancel()
+            if call.iterable is not None:
+                await loop.run_in_executor(executor, call.close)
+
+
+application = AsgiBridge(app)
+
+
+def main():
+    try:
+        import uvicorn
+    except ImportError:
+        print("ASGI mode needs an ASGI server, for example: pip install uvicorn")
+        return 1
+    uvicorn.run(application, host=os.environ.get("SEEME_HOST", "0.0.0.0"),
+                port=int(os.environ.get("SEEME_PORT", "5000")), timeout_keep_alive=300)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
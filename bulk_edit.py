@@ -0,0 +1,269 @@
+"""Bulk edits across every resume in a directory.
+
+A bulk edit is a transformation plus an optional predicate:
+
+* transformations: ``rename_skill`` (``from``, ``to``; case-insensitive, and
+  merged into an existing skill of the new name), ``remove_skill``
+  (``name``) and ``normalize_dates`` (work and education dates in the form
+  the editor stores, ``YYYY-MM-DDT04:00:00.000Z``; empty end dates become
+  null)
+* predicates: ``name`` (substring of the person's name) and ``files`` (a
+  glob over file names) are answered from the ``resume_catalog`` index, so
+  files they exclude are never opened; ``has_skill`` needs the resume itself
+
+Candidate files are read and transformed on a process pool.  The parent
+writes each changed resume back in its own layout (plain or
+content-addressed) with an atomic rename, under the file's lock, after
+checking the file did not change in between, and with ``meta.revision``
+bumped so open editors notice.  Variants are skipped (they only hold
+overrides of their base), and so are files whose journal holds edits not
+yet written into them.
+
+    python bulk_edit.py resumes rename-skill JS JavaScript --dry-run
+    python bulk_edit.py resumes normalize-dates --name "Skylor" --workers 4
+    python bulk_edit.py resumes remove-skill Flash
+"""
+import argparse
+import fnmatch
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import locks
+import metrics
+import resume_catalog
+import resume_journal
+import resume_model
+import resume_storage
+import resume_variants
+
+# Forms normalize_dates accepts besides ISO dates
+DATE_FORMATS = ("%Y-%m", "%Y", "%m/%Y", "%m/%d/%Y", "%Y/%m/%d", "%B %Y", "%b %Y")
+
+
+def technologies(data):
+    skills = data.get("skills")
+    return skills.get("technologies", []) if isinstance(skills, dict) else []
+
+
+def rename_skill(data, old, new):
+    """Rename a skill; returns the number of skills changed"""
+    matches = [skill for skill in technologies(data) if skill.get("name", "").casefold() == old.casefold()]
+    if not matches:
+        return 0
+    # A skill already listed under the new name keeps its entry (and level); the renamed one merges into it
+    existing = {skill.get("name", "").casefold() for skill in technologies(data) if skill not in matches}
+    kept = []
+    for skill in technologies(data):
+        if skill in matches:
+            if new.casefold() in existing:
+                continue
+            existing.add(new.casefold())
+            skill = dict(skill, name=new)
+        kept.append(skill)
+    data["skills"]["technologies"] = kept
+    return len(matches)
+
+
+def remove_skill(data, name):
+    kept = [skill for skill in technologies(data) if skill.get("name", "").casefold() != name.casefold()]
+    removed = len(technologies(data)) - len(kept)
+    if removed:
+        data["skills"]["technologies"] = kept
+    return removed
+
+
+def normalize_date(value):
+    """A date in the editor's stored form, or None when value is not a recognizable date"""
+    text = value.strip()
+    parsed = resume_model.parse_date(text)
+    if parsed is None:
+        for date_format in DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(text, date_format).timetuple()[:3]
+                break
+            except ValueError:
+                continue
+    if parsed is None:
+        return None
+    return f"{parsed[0]:04d}-{parsed[1]:02d}-{parsed[2]:02d}T04:00:00.000Z"
+
+
+def normalize_dates(data):
+    changed = 0
+    for section in ("work", "education"):
+        for item in data.get(section) or []:
+            for key in ("startDate", "endDate"):
+                value = item.get(key)
+                if key == "endDate" and value == "":
+                    item[key] = None
+                    changed += 1
+                elif isinstance(value, str) and value.strip():
+                    normalized = normalize_date(value)
+                    if normalized is not None and normalized != value:
+                        item[key] = normalized
+                        changed += 1
+    return changed
+
+
+# name -> (function, the transform fields passed to it in order)
+TRANSFORMS = {
+    "rename_skill": (rename_skill, ("from", "to")),
+    "remove_skill": (remove_skill, ("name",)),
+    "normalize_dates": (normalize_dates, ()),
+}
+PREDICATES = ("name", "files", "has_skill")
+PENDING_MESSAGE = "has journaled edits not yet saved to the file"
+
+
+def check(transform, where):
+    """Raise ValueError unless transform and where describe a valid bulk edit"""
+    if not isinstance(transform, dict) or transform.get("op") not in TRANSFORMS:
+        raise ValueError(f"transform op must be one of: {', '.join(TRANSFORMS)}")
+    for field in TRANSFORMS[transform["op"]][1]:
+        if not isinstance(transform.get(field), str) or not transform[field].strip():
+            raise ValueError(f"{transform['op']} needs '{field}'")
+    if not isinstance(where, dict) or any(key not in PREDICATES for key in where):
+        raise ValueError(f"where may only use: {', '.join(PREDICATES)}")
+    if not all(isinstance(value, str) for value in where.values()):
+        raise ValueError("where values must be strings")
+
+
+def candidates(catalog, where):
+    """File names the catalog says may match; variants are left out"""
+    names = []
+    for entry in catalog.entries():
+        if entry.get("variant_of"):
+            continue
+        if "name" in where and where["name"].casefold() not in (entry["name"] or "").casefold():
+            continue
+        if "files" in where and not fnmatch.fnmatch(entry["filename"], where["files"]):
+            continue
+        names.append(entry["filename"])
+    return sorted(names)
+
+
+def edit_file(task):
+    """Pool worker: read and transform one resume; returns its result, with the new data when it changed"""
+    directory, filename, transform, where = task
+    path = os.path.join(directory, filename)
+    result = {"filename": filename, "status": "unchanged", "changes": 0}
+    try:
+        signature = resume_storage.file_signature(path)
+        document = resume_storage.read_document(path)
+        if resume_variants.is_variant(document):
+            return dict(result, status="skipped", message="variant")
+        data = resume_storage.resolve_document(path, document)
+        if "has_skill" in where and not any(skill.get("name", "").casefold() == where["has_skill"].casefold()
+                                            for skill in technologies(data)):
+            return dict(result, status="skipped", message="does not match")
+        function, fields = TRANSFORMS[transform["op"]]
+        changes = function(data, *(transform[field] for field in fields))
+    except (OSError, ValueError, AttributeError, TypeError) as e:
+        return dict(result, status="error", message=str(e))
+    if not changes:
+        return result
+    resume_model.set_revision(data, resume_model.revision(data) + 1)
+    layout = "cas" if resume_storage.is_manifest(document) else "files"
+    return dict(result, status="changed", changes=changes, data=data, layout=layout, signature=signature)
+
+
+def map_files(tasks, workers):
+    if workers <= 1 or len(tasks) < 2:
+        return [edit_file(task) for task in tasks]
+    # Spawned rather than forked, so the app's watcher and broker threads are not copied mid-operation;
+    # scripts that call run() need the usual `if __name__ == "__main__"` guard
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context) as pool:
+        return list(pool.map(edit_file, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+def has_pending_edits(directory, filename):
+    """True when the file's journal holds edits the file does not, which rewriting it would drop"""
+    journal = resume_journal.ResumeJournal(directory, filename)
+    return journal.exists() and journal.pending()[0] > 0
+
+
+def write_file(directory, result, dry_run=False):
+    """Write one changed resume back unless it changed meanwhile or gained unwritten journal edits"""
+    filename = result["filename"]
+    path = os.path.join(directory, filename)
+    with locks.file_lock(path).write():
+        if has_pending_edits(directory, filename):
+            return dict(result, status="skipped", message=PENDING_MESSAGE)
+        if resume_storage.file_signature(path) != result["signature"]:
+            return dict(result, status="conflict", message="changed while being edited")
+        if not dry_run:
+            resume_storage.get_storage(result["layout"]).write(directory, filename, result["data"])
+    return result
+
+
+def run(directory, transform, where=None, workers=None, dry_run=False, catalog=None):
+    """Apply a bulk edit to a resumes directory; returns {"candidates": n, "changed": n, "results": [...]}"""
+    where = where or {}
+    check(transform, where)
+    catalog = catalog or resume_catalog.ResumeCatalog(directory)
+    names = candidates(catalog, where)
+    pending = {filename for filename in names if has_pending_edits(directory, filename)}
+    tasks = [(directory, filename, transform, where) for filename in names if filename not in pending]
+    results = map_files(tasks, workers or os.cpu_count() or 1)
+    results += [{"filename": filename, "status": "skipped", "changes": 0, "message": PENDING_MESSAGE}
+                for filename in pending]
+    results.sort(key=lambda result: result["filename"])
+    report = []
+    for result in results:
+        if result["status"] == "changed":
+            result = write_file(directory, result, dry_run)
+        metrics.BULK_EDIT_FILES.inc(status=result["status"])
+        report.append({key: value for key, value in result.items() if key not in ("data", "layout", "signature")})
+    return {
+        "candidates": len(names),
+        "changed": sum(1 for result in report if result["status"] == "changed"),
+        "dry_run": dry_run,
+        "results": report,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Edit every matching resume in a directory")
+    parser.add_argument("directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rename_parser = commands.add_parser("rename-skill", help="Rename a skill")
+    rename_parser.add_argument("old")
+    rename_parser.add_argument("new")
+    remove_parser = commands.add_parser("remove-skill", help="Remove a skill")
+    remove_parser.add_argument("skill")
+    commands.add_parser("normalize-dates", help="Store work and education dates in one form")
+    for command in commands.choices.values():
+        command.add_argument("--name", help="Only resumes whose person name contains this")
+        command.add_argument("--files", help="Only file names matching this glob")
+        command.add_argument("--has-skill", help="Only resumes listing this skill")
+        command.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: CPUs)")
+        command.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    args = parser.parse_args(argv)
+
+    if args.command == "rename-skill":
+        transform = {"op": "rename_skill", "from": args.old, "to": args.new}
+    elif args.command == "remove-skill":
+        transform = {"op": "remove_skill", "name": args.skill}
+    else:
+        transform = {"op": "normalize_dates"}
+    where = {key: value for key, value in (("name", args.name), ("files", args.files), ("has_skill", args.has_skill))
+             if value is not None}
+    try:
+        report = run(args.directory, transform, where, args.workers, args.dry_run)
+    except ValueError as e:
+        parser.error(str(e))
+    for result in report["results"]:
+        if result["status"] != "unchanged":
+            detail = result.get("message") or f"{result['changes']} changes"
+            print(f"{result['status']:<9} {result['filename']}: {detail}")
+    action = "Would change" if args.dry_run else "Changed"
+    print(f"{action} {report['changed']} of {report['candidates']} resumes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""Synthetic resume corpus generator for load and scale testing.
+
+Resumes are built by driving the real ``ResumeWebApp`` mutators
+(``update_basics``, ``add_work_experience``, ``add_education``,
+``add_skill``) so the output is always in exactly the schema the web app
+produces.  Every resume is generated from its own RNG seeded with
+``(seed, index)``, which keeps the corpus byte-for-byte reproducible no
+matter how many workers are used.
+
+Usage:
+    python generate_resumes.py --count 5000 --output synthetic_resumes --seed 42
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Section size distributions, as inclusive (low, high) ranges
+DEFAULT_PROFILE = {
+    "work": (1, 8),
+    "education": (0, 3),
+    "skills": (3, 25),
+    "summary_sentences": (1, 6),
+    "courses": (0, 6),
+    "bullet_ratio": 0.5,      # Share of work summaries written as bullet lists
+    "current_ratio": 0.3,     # Share of resumes with a current job / ongoing study
+    "unicode_ratio": 0.2,     # Share of words drawn from the non-ASCII pools
+}
+
+FIRST_NAMES = ["Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery",
+               "Quinn", "Skylor", "Chezney", "Dana", "Reese", "Parker", "Rowan", "Sage"]
+LAST_NAMES = ["Smith", "Johnson", "Garcia", "Nguyen", "Patel", "Kim", "Lopez", "Brown",
+              "Piersall", "Miller", "Davis", "Wilson", "Moore", "Clark", "Lewis", "Hall"]
+UNICODE_FIRST_NAMES = ["José", "Zoë", "Søren", "Łukasz", "Ngọc", "Ayşe", "Björk", "Renée",
+                       "François", "Małgorzata", "Даниил", "Αλέξανδρος", "美咲", "지훈", "محمد", "דנה"]
+UNICODE_LAST_NAMES = ["Müller", "Ødegaard", "Çelik", "Dvořák", "Núñez", "Škoda", "Żółć",
+                      "Иванова", "Παπαδόπουλος", "山田", "김", "حداد", "כהן", "Nguyễn"]
+
+POSITIONS = ["Software Engineer", "Low Voltage Technician", "Project Manager", "Data Analyst",
+             "Customer Service Representative", "Registered Nurse", "Daycare Provider",
+             "Professional Cleaner", "Sales Associate", "Operations Lead", "Fiber Technician",
+             "Office Manager", "Shift Supervisor", "QA Engineer", "Support Specialist"]
+COMPANIES = ["Bevo Security Solutions", "Teen Parents Succeeding", "5 Star Cleaning Services",
+             "NexVolt LLC", "Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Industries",
+             "Wayne Enterprises", "Hooli", "Vandelay Industries", "Soylent Foods", "Cyberdyne"]
+UNICODE_COMPANIES = ["Société Générale", "Nestlé", "Škoda Auto", "Łódź Logistics", "Müller GmbH",
+                     "Ørsted", "株式会社トヨタ", "삼성전자", "Яндекс", "Ελληνικά Πετρέλαια"]
+INSTITUTIONS = ["Wawasee High School", "State University", "Community College",
+                "Institute of Technology", "Florida Gulf Coast University", "Online Academy"]
+UNICODE_INSTITUTIONS = ["Universität Wien", "École Polytechnique", "Università di Bologna",
+                        "Universidad de Córdoba", "東京大学", "서울대학교", "МГУ"]
+STUDY_TYPES = ["High School Diploma", "Associate", "Bachelor", "Master", "Doctorate", "Certificate"]
+AREAS = ["General Studies", "Computer Science", "Nursing", "Business Administration",
+         "Electrical Engineering", "Early Childhood Education", "Mathematics", "Design"]
+SKILLS = ["Customer Service", "Shift Management", "Vitals", "Patient Care", "Communication",
+          "Sales", "Leadership", "Office Management", "FTTH", "CCTV", "Access Control",
+          "Structured Cabling", "Python", "JavaScript", "SQL", "Excel", "Scheduling",
+          "Inventory", "Troubleshooting", "Fiber Splicing", "Project Planning", "Negotiation",
+          "Budgeting", "Training", "Networking", "Safety Compliance", "Documentation"]
+UNICODE_SKILLS = ["Gestión de proyectos", "Präsentation", "Qualitätssicherung", "Négociation",
+                  "Сварка", "データ分析", "고객 서비스", "Ρομποτική", "C++ & C#", "Ångström-level QA"]
+CITIES = ["Cape Coral, FL", "Syracuse, IN", "Austin, TX", "Denver, CO", "Portland, OR"]
+UNICODE_CITIES = ["São Paulo", "Zürich", "Kraków", "Reykjavík", "Montréal", "東京", "Москва"]
+
+WORDS = ["installed", "configured", "maintained", "delivered", "supported", "ensured",
+         "managed", "coordinated", "improved", "reduced", "trained", "resolved", "systems",
+         "customers", "projects", "safety", "standards", "quality", "operations", "teams",
+         "schedules", "reports", "clients", "equipment", "processes", "efficiency", "daily"]
+UNICODE_WORDS = ["café", "naïve", "résumé", "über", "façade", "coöperation", "señor",
+                 "Straße", "efficiënt", "доставка", "качество", "品質", "안전", "ποιότητα",
+                 "🚀", "✅", "📈", "—", "“quoted”", "≥99.9%"]
+
+
+def pick(rng, ascii_pool, unicode_pool, unicode_ratio):
+    """Pick from the ASCII pool or, with probability unicode_ratio, the Unicode pool"""
+    if unicode_pool and rng.random() < unicode_ratio:
+        return rng.choice(unicode_pool)
+    return rng.choice(ascii_pool)
+
+
+def span(rng, bounds):
+    """Draw an integer from an inclusive (low, high) range"""
+    low, high = bounds
+    return rng.randint(low, max(low, high))
+
+
+def sentence(rng, unicode_ratio, min_words=6, max_words=16):
+    """Build one pseudo-sentence"""
+    words = [pick(rng, WORDS, UNICODE_WORDS, unicode_ratio)
+             for _ in range(rng.randint(min_words, max_words))]
+    text = " ".join(words)
+    return text[0].upper() + text[1:] + "."
+
+
+def paragraph(rng, profile):
+    """Build a multi-sentence paragraph"""
+    count = span(rng, profile["summary_sentences"])
+    return " ".join(sentence(rng, profile["unicode_ratio"]) for _ in range(count))
+
+
+def random_month(rng, start_year, end_year):
+    """Return a YYYY-MM-01 date string between the given years"""
+    return f"{rng.randint(start_year, end_year):04d}-{rng.randint(1, 12):02d}-01"
+
+
+def generate_resume(resume_app, index, seed=0, profile=None):
+    """Populate resume_app with the synthetic resume for the given index"""
+    profile = dict(DEFAULT_PROFILE, **(profile or {}))
+    rng = random.Random(f"{seed}:{index}")
+    unicode_ratio = profile["unicode_ratio"]
+
+    resume_app.initialize_empty_resume()
+
+    first = pick(rng, FIRST_NAMES, UNICODE_FIRST_NAMES, unicode_ratio)
+    last = pick(rng, LAST_NAMES, UNICODE_LAST_NAMES, unicode_ratio)
+    resume_app.update_basics({
+        "name": f"{first} {last}",
+        "label": rng.choice(POSITIONS),
+        "email": f"user{index}@example.com",
+        "phone": f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "city": pick(rng, CITIES, UNICODE_CITIES, unicode_ratio),
+        "summary": paragraph(rng, profile),
+        "objective": paragraph(rng, profile) if rng.random() < 0.7 else "",
+    })
+
+    has_current = rng.random() < profile["current_ratio"]
+    for position in range(span(rng, profile["work"])):
+        current = has_current and position == 0
+        start_year = rng.randint(1995, 2024)
+        if rng.random() < profile["bullet_ratio"]:
+            bullets = [sentence(rng, unicode_ratio) for _ in range(span(rng, profile["summary_sentences"]))]
+            summary = "\n".join(f"• {bullet}" for bullet in bullets)
+        else:
+            summary = paragraph(rng, profile)
+        resume_app.add_work_experience({
+            "id": f"{rng.getrandbits(64):016x}",
+            "company": pick(rng, COMPANIES, UNICODE_COMPANIES, unicode_ratio),
+            "position": rng.choice(POSITIONS),
+            "startDate": random_month(rng, start_year, start_year),
+            "endDate": "" if current else random_month(rng, start_year, min(start_year + 6, 2025)),
+            "currentlyWorking": current,
+            "summary": summary,
+        })
+
+    for position in range(span(rng, profile["education"])):
+        current = has_current and position == 0 and rng.random() < 0.5
+        start_year = rng.randint(1990, 2024)
+        courses = [pick(rng, AREAS, UNICODE_WORDS, unicode_ratio)
+                   for _ in range(span(rng, profile["courses"]))]
+        resume_app.add_education({
+            "id": f"{rng.getrandbits(64):016x}",
+            "institution": pick(rng, INSTITUTIONS, UNICODE_INSTITUTIONS, unicode_ratio),
+            "area": rng.choice(AREAS),
+            "studyType": rng.choice(STUDY_TYPES),
+            "startDate": random_month(rng, start_year, start_year),
+            "endDate": "" if current else random_month(rng, start_year + 1, start_year + 5),
+            "currentlyStudying": current,
+            "gpa": f"{rng.uniform(2.0, 4.0):.2f}" if rng.random() < 0.5 else "",
+            "courses": ", ".join(courses),
+            "summary": paragraph(rng, profile) if rng.random() < 0.3 else "",
+        })
+
+    for _ in range(span(rng, profile["skills"])):
+        resume_app.add_skill(pick(rng, SKILLS, UNICODE_SKILLS, unicode_ratio))
+
+    return resume_app.resume_data
+
+
+def corpus_filename(index, prefix="synthetic"):
+    """Return the file name used for the resume at the given index"""
+    return f"{prefix}_{index:06d}.json"
+
+
+def write_chunk(directory, indices, seed, profile, prefix, storage="files"):
+    """Generate and save one chunk of resumes (runs inside a worker process)"""
+    # Imported here so worker processes only pay for the app import once per chunk
+    from app import ResumeWebApp
+    import resume_storage
+
+    resume_app = ResumeWebApp()
+    resume_app.resumes_directory = directory
+    resume_app.storage = resume_storage.get_storage(storage)
+    resume_app.ensure_resumes_directory()
+
+    written = []
+    for index in indices:
+        generate_resume(resume_app, index, seed, profile)
+        filename = resume_app.save_resume(corpus_filename(index, prefix), save_as=True)
+        if filename:
+            written.append(filename)
+    return written
+
+
+def write_corpus(directory, count, seed=0, profile=None, workers=None, prefix="synthetic", chunk_size=100,
+                 storage="files"):
+    """Generate count resumes into directory in parallel, returning the written file names"""
+    workers = workers or os.cpu_count() or 1
+    chunks = [range(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+    if workers == 1:
+        results = [write_chunk(directory, chunk, seed, profile, prefix, storage) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(write_chunk, directory, chunk, seed, profile, prefix, storage) for chunk in chunks]
+            results = [future.result() for future in as_completed(futures)]
+
+    return sorted(filename for chunk in results for filename in chunk)
+
+
+def parse_range(value):
+    """Parse a LOW-HIGH or N command line range"""
+    low, _, high = value.partition("-")
+    return (int(low), int(high or low))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume corpus")
+    parser.add_argument("--count", type=int, default=1000, help="Number of resumes to generate")
+    parser.add_argument("--output", default="synthetic_resumes", help="Target directory")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--prefix", default="synthetic", help="File name prefix")
+    parser.add_argument("--work", type=parse_range, help="Work items per resume, e.g. 1-8")
+    parser.add_argument("--education", type=parse_range, help="Education items per resume, e.g. 0-3")
+    parser.add_argument("--skills", type=parse_range, help="Skills per resume, e.g. 3-25")
+    parser.add_argument("--sentences", type=parse_range, help="Sentences per summary, e.g. 1-6")
+    parser.add_argument("--unicode-ratio", type=float, help="Share of non-ASCII words (0-1)")
+    parser.add_argument("--storage", choices=["files", "cas"], default="files",
+                        help="Write plain files or content-addressed manifests (see resume_storage.py)")
+    args = parser.parse_args(argv)
+
+    profile = {}
+    for key, value in (("work", args.work), ("education", args.education), ("skills", args.skills),
+                       ("summary_sentences", args.sentences), ("unicode_ratio", args.unicode_ratio)):
+        if value is not None:
+            profile[key] = value
+
+    os.makedirs(args.output, exist_ok=True)
+    started = time.perf_counter()
+    written = write_corpus(args.output, args.count, args.seed, profile, args.workers, args.prefix,
+                           storage=args.storage)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {len(written)} resumes to {args.output} in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
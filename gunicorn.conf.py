@@ -0,0 +1,58 @@
+"""gunicorn settings for production: gunicorn -c gunicorn.conf.py wsgi:application
+
+Every value can be overridden with the SEEME_* environment variables below.
+
+Worker model: gthread workers.  Editor calls are short JSON edits with
+small file writes, so a handful of threads per worker keeps them flowing
+while another thread builds a PDF.  Exports are CPU bound and hold the GIL,
+so CPU parallelism only comes from more worker processes.
+
+Each open ``/api/events`` stream (one per browser tab) holds a thread for
+as long as the tab is open.  So the default is 64 threads, and at most
+SEEME_EVENT_STREAMS streams (default: half of SEEME_THREADS) are open at
+once.  Past that, ``/api/events`` answers 503 and the tab works without
+live updates, trying again a minute later, while the other threads keep
+serving edits.  For many tabs, use the ASGI mode (asgi.py), where streams
+do not hold threads.
+
+The editor keeps the open resume in process memory (``app.resume_app``), so
+an editing session must keep talking to the same process.  Therefore the
+default is one worker.  Raise SEEME_WORKERS (about one per core) only behind
+a load balancer with sticky sessions.  For the same reason, worker recycling
+(SEEME_MAX_REQUESTS) is off unless it is asked for.
+
+Reloads: ``kill -HUP <master>`` starts fresh workers with the new config and
+lets the old ones finish in-flight requests for up to graceful_timeout.
+Because the app is preloaded in the master, a HUP does not pick up new code.
+To deploy code without dropping connections, send USR2 (start a new master)
+and then WINCH/QUIT to the old master.
+"""
+import os
+
+bind = os.environ.get("SEEME_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("SEEME_WORKERS", "1"))
+worker_class = "gthread"
+threads = int(os.environ.get("SEEME_THREADS", "64"))
+# Read by the app when the master preloads it
+os.environ.setdefault("SEEME_EVENT_STREAMS", str(max(threads // 2, 1)))
+
+# Import the app, reportlab and the PDF styles once in the master (see wsgi.py)
+preload_app = True
+
+# A large PDF build takes well under a second; anything near this is stuck
+timeout = int(os.environ.get("SEEME_TIMEOUT", "60"))
+graceful_timeout = int(os.environ.get("SEEME_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("SEEME_KEEPALIVE", "5"))
+
+max_requests = int(os.environ.get("SEEME_MAX_REQUESTS", "0"))
+max_requests_jitter = max(max_requests // 10, 0)
+
+accesslog = os.environ.get("SEEME_ACCESS_LOG", "-")
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Workers are forked from the preloaded master; report their own start time
+    import time
+    import metrics
+    metrics.PROCESS_START_TIME.set(time.time())
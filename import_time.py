@@ -0,0 +1,93 @@
+"""Measure the cold import cost of an app module.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and
+reports the total import time, the slowest imports by cumulative time,
+whether reportlab was loaded and the child's peak RSS:
+
+    python import_time.py                 # the app as a JSON-only worker sees it
+    python import_time.py --module wsgi   # the preloading gunicorn master
+    python import_time.py --json --repeat 5
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+
+DEFAULT_MODULE = "app"
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into (module, self_us, cumulative_us) tuples"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue
+        imports.append((fields[2].strip(), self_us, cumulative_us))
+    return imports
+
+
+def peak_child_rss_kb():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # Linux reports kilobytes, macOS bytes
+    return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+
+def measure(module):
+    """Import module in a fresh interpreter; returns the parsed report"""
+    code = f"import {module}, sys; print(any(name.startswith('reportlab') for name in sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+    imports = parse_importtime(result.stderr)
+    total = next((cumulative for name, _, cumulative in reversed(imports) if name == module), None)
+    return {
+        "module": module,
+        "total_ms": round((total or 0) / 1000, 3),
+        "modules_imported": len(imports),
+        "reportlab_loaded": result.stdout.strip() == "True",
+        "peak_rss_kb": peak_child_rss_kb(),
+        "slowest": [{"module": name, "self_ms": round(self_us / 1000, 3), "cumulative_ms": round(cumulative_us / 1000, 3)}
+                    for name, self_us, cumulative_us in sorted(imports, key=lambda item: item[2], reverse=True)],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold import time of an app module")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="Module to import (default: app)")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs to take the fastest of")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        runs = [measure(args.module) for _ in range(max(args.repeat, 1))]
+    except RuntimeError as e:
+        print(f"Error importing {args.module}: {str(e)}", file=sys.stderr)
+        return 1
+    report = min(runs, key=lambda run: run["total_ms"])
+    report["slowest"] = report["slowest"][:args.top]
+
+    if args.json:
+        print(json.dumps(report, indent=4))
+        return 0
+
+    print(f"import {report['module']}: {report['total_ms']:.1f} ms, {report['modules_imported']} modules, "
+          f"reportlab {'loaded' if report['reportlab_loaded'] else 'not loaded'}, peak RSS {report['peak_rss_kb'] / 1024:.1f} MiB")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for entry in report["slowest"]:
+        print(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>9.1f}  {entry['module']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""HTTP load driver that replays realistic editor sessions against the Flask app.
+
+Each simulated editor follows the same call pattern as ``static/js/app.js``:
+``loadData`` on page load, then a loop of ``saveBasics``, ``saveWork`` and
+``addSkill`` (each followed by the ``loadData`` refresh the front end does),
+the ``scheduleAutoSave`` save and finally ``exportPDF``.  Latencies are
+recorded per endpoint and summarised as histograms with error rates and
+throughput.
+
+Only localhost targets are accepted.  With ``--serve`` the app is started
+in-process on a free port against a temporary resumes directory, so nothing
+in ``resumes/`` is touched.
+
+Usage:
+    python load_test.py --serve --editors 20 --duration 30
+    python load_test.py --url http://127.0.0.1:5000 --editors 50 --iterations 10 --json
+"""
+import argparse
+import http.client
+import json
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class EndpointStats:
+    """Latency samples and error counts for one endpoint"""
+
+    def __init__(self):
+        self.samples = []
+        self.errors = 0
+
+    def percentile(self, fraction):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def histogram(self):
+        """Return (upper bound, count) pairs; the last bound is +inf"""
+        counts = [0] * (len(BUCKETS_MS) + 1)
+        for sample in self.samples:
+            for i, bound in enumerate(BUCKETS_MS):
+                if sample <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return list(zip(BUCKETS_MS + [float("inf")], counts))
+
+
+class LoadRecorder:
+    """Thread-safe collector of per-endpoint results"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, endpoint, elapsed_ms, ok):
+        with self.lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.samples.append(elapsed_ms)
+            if not ok:
+                stats.errors += 1
+
+    def summary(self, wall_seconds):
+        report = {"wall_seconds": wall_seconds, "endpoints": {}}
+        total = errors = 0
+        for endpoint, stats in sorted(self.endpoints.items()):
+            count = len(stats.samples)
+            total += count
+            errors += stats.errors
+            report["endpoints"][endpoint] = {
+                "requests": count,
+                "errors": stats.errors,
+                "error_rate": stats.errors / count if count else 0.0,
+                "throughput_rps": count / wall_seconds if wall_seconds else 0.0,
+                "mean_ms": sum(stats.samples) / count if count else 0.0,
+                "p50_ms": stats.percentile(0.50),
+                "p90_ms": stats.percentile(0.90),
+                "p99_ms": stats.percentile(0.99),
+                "max_ms": max(stats.samples) if stats.samples else 0.0,
+                "histogram": [[bound if bound != float("inf") else "+Inf", count]
+                              for bound, count in stats.histogram()],
+            }
+        report["requests"] = total
+        report["errors"] = errors
+        report["error_rate"] = errors / total if total else 0.0
+        report["throughput_rps"] = total / wall_seconds if wall_seconds else 0.0
+        return report
+
+
+class EditorSession:
+    """One simulated browser tab running the app.js call pattern"""
+
+    def __init__(self, host, port, recorder, rng, think_ms, corpus=None):
+        self.connection = http.client.HTTPConnection(host, port, timeout=60)
+        self.recorder = recorder
+        self.rng = rng
+        self.think_ms = think_ms
+        self.corpus = corpus or []
+
+    def call(self, endpoint, method, path, payload=None):
+        """Issue one request and record its latency under endpoint"""
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        started = time.perf_counter()
+        ok = False
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            data = response.read()
+            ok = 200 <= response.status < 300
+            if ok and response.getheader("Content-Type", "").startswith("application/json"):
+                result = json.loads(data)
+                if isinstance(result, dict) and result.get("success") is False:
+                    ok = False
+        except (OSError, http.client.HTTPException, ValueError):
+            self.connection.close()
+        self.recorder.record(endpoint, (time.perf_counter() - started) * 1000, ok)
+
+    def think(self):
+        if self.think_ms:
+            time.sleep(self.rng.uniform(0, self.think_ms) / 1000)
+
+    def load_data(self):
+        self.call("loadData GET /api/data", "GET", "/api/data")
+
+    def run_iteration(self, editor_id, iteration):
+        rng = self.rng
+        self.think()
+        self.call("saveBasics POST /api/basics", "POST", "/api/basics", {
+            "name": f"Load Editor {editor_id}",
+            "label": rng.choice(["Engineer", "Technician", "Manager"]),
+            "email": f"editor{editor_id}@example.com",
+            "phone": "555-000-0000",
+            "city": "Cape Coral, FL",
+            "summary": f"Iteration {iteration} summary • first point • second point",
+            "objective": "Keep the server responsive under load.",
+        })
+        self.load_data()
+
+        self.think()
+        self.call("saveWork POST /api/work", "POST", "/api/work", {
+            "id": f"load{editor_id:04d}{iteration % 5:04d}",
+            "company": f"Company {iteration % 5}",
+            "position": "Load Tester",
+            "startDate": f"20{10 + iteration % 10:02d}-0{1 + iteration % 9}-01",
+            "endDate": "",
+            "currentlyWorking": iteration % 5 == 0,
+            "summary": "• Replayed editor sessions\n• Measured latencies",
+        })
+        self.load_data()
+
+        self.think()
+        self.call("addSkill POST /api/skills", "POST", "/api/skills",
+                  {"name": f"Skill {rng.randint(0, 50)}"})
+        self.load_data()
+
+        # scheduleAutoSave fires after the idle period
+        self.think()
+        self.call("scheduleAutoSave POST /api/resume/save", "POST", "/api/resume/save", {})
+
+        self.think()
+        self.call("exportPDF GET /api/export/pdf", "GET", "/api/export/pdf")
+
+    def run(self, editor_id, iterations, deadline):
+        if self.corpus:
+            self.call("loadResume POST /api/resume/load", "POST", "/api/resume/load",
+                      {"filename": self.rng.choice(self.corpus)})
+        self.load_data()
+        iteration = 0
+        while (iterations is None or iteration < iterations) and (deadline is None or time.monotonic() < deadline):
+            self.run_iteration(editor_id, iteration)
+            iteration += 1
+        self.connection.close()
+
+
+def serve_in_process(threaded=True):
+    """Start the app on a free localhost port backed by a temporary resumes directory"""
+    from werkzeug.serving import make_server
+    import app as resume_web
+
+    directory = tempfile.mkdtemp(prefix="seeme-load-")
+    resume_web.resume_app.resumes_directory = directory
+    resume_web.resume_app.initialize_empty_resume()
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    server = make_server("127.0.0.1", 0, resume_web.app, threaded=threaded)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, directory
+
+
+def run_load(host, port, editors, iterations=None, duration=None, think_ms=0, seed=0,
+             ramp_up=0.0, corpus=None):
+    """Run the editors concurrently and return the summary report"""
+    recorder = LoadRecorder()
+    deadline = time.monotonic() + duration if duration else None
+    threads = []
+    started = time.perf_counter()
+    for editor_id in range(editors):
+        session = EditorSession(host, port, recorder, random.Random(f"{seed}:{editor_id}"), think_ms, corpus)
+        thread = threading.Thread(target=session.run, args=(editor_id, iterations, deadline), daemon=True)
+        thread.start()
+        threads.append(thread)
+        if ramp_up and editors > 1:
+            time.sleep(ramp_up / (editors - 1))
+    for thread in threads:
+        thread.join()
+    report = recorder.summary(time.perf_counter() - started)
+    report["editors"] = editors
+    return report
+
+
+def print_report(report):
+    print(f"\n{report['editors']} editors, {report['requests']} requests in {report['wall_seconds']:.2f}s "
+          f"({report['throughput_rps']:.1f} req/s, {report['error_rate']:.2%} errors)\n")
+    header = f"{'endpoint':<42} {'reqs':>6} {'err%':>6} {'rps':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+    print(header)
+    print("-" * len(header))
+    for endpoint, stats in report["endpoints"].items():
+        print(f"{endpoint:<42} {stats['requests']:>6} {stats['error_rate']:>6.1%} {stats['throughput_rps']:>7.1f} "
+              f"{stats['p50_ms']:>7.1f}ms {stats['p90_ms']:>6.1f}ms {stats['p99_ms']:>6.1f}ms {stats['max_ms']:>6.1f}ms")
+    print("\nLatency histograms (ms):")
+    for endpoint, stats in report["endpoints"].items():
+        print(f"  {endpoint}")
+        peak = max(count for _, count in stats["histogram"]) or 1
+        for bound, count in stats["histogram"]:
+            if count:
+                label = f"<= {bound}" if bound != "+Inf" else f"> {BUCKETS_MS[-1]}"
+                print(f"    {label:>10} {count:>6} {'#' * max(1, round(40 * count / peak))}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay concurrent editor sessions against the resume app")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="Base URL (localhost only)")
+    parser.add_argument("--serve", action="store_true", help="Start the app in-process on a free port")
+    parser.add_argument("--editors", type=int, default=10, help="Concurrent simulated editors")
+    parser.add_argument("--iterations", type=int, help="Edit loops per editor")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument("--think-ms", type=float, default=0, help="Maximum random think time between calls")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which editors are started")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the simulated editors")
+    parser.add_argument("--corpus", nargs="*", help="Resume file names each editor loads first")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.iterations is None and args.duration is None:
+        args.iterations = 5
+
+    server = directory = None
+    if args.serve:
+        server, directory = serve_in_process()
+        host, port = server.host, server.port
+    else:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+        if host not in LOCAL_HOSTS:
+            parser.error(f"refusing to load test non-local host '{host}'")
+
+    try:
+        report = run_load(host, port, args.editors, args.iterations, args.duration, args.think_ms,
+                          args.seed, args.ramp_up, args.corpus)
+    finally:
+        if server is not None:
+            server.shutdown()
+            shutil.rmtree(directory, ignore_errors=True)
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
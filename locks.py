@@ -0,0 +1,175 @@
+"""Reader/writer locks for resumes shared between request threads.
+
+Threaded servers (gunicorn's gthread workers, the ASGI executors, Werkzeug's
+threaded dev server) handle several requests for the same resume at once.
+Each open resume has an ``RWLock``:
+
+* readers (``/api/data``, exports, the timeline) share it and run concurrently
+* writers (edits, loads, saves, undo) hold it alone
+
+Writers are preferred: once one is waiting, new readers queue behind it, so
+a steady stream of exports cannot starve edits.  A thread holding the write
+lock may take it again or take the read lock (a save inside an edit, a
+reload inside a request), which is how ``ResumeWebApp`` methods nest.  A read
+lock cannot be upgraded; code that reads and then writes takes the write
+lock up front.
+
+``files`` hands out one lock per resume file for code that works on files
+rather than on an open resume (saving, deleting, retention), so writers of
+the same file exclude each other while other files proceed.
+
+``process_lock`` adds an advisory ``flock`` on a lock file to that, for state
+shared by every worker process (the object store, the retention archive).
+"""
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+import metrics
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory locks, and no forked workers either
+    fcntl = None
+
+
+class RWLock:
+    """Writer-preferring reader/writer lock, reentrant per thread"""
+
+    def __init__(self):
+        self.condition = threading.Condition(threading.Lock())
+        self.readers = 0
+        self.writer = None
+        self.writer_depth = 0
+        self.waiting_writers = 0
+        # Per thread: read holds, and whether they count in self.readers
+        self.local = threading.local()
+
+    def held_reads(self):
+        return getattr(self.local, "reads", 0)
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        with self.condition:
+            if self.held_reads():
+                self.local.reads += 1
+                return
+            if self.writer == me:
+                # Nested in this thread's write; nothing to wait for
+                self.local.reads, self.local.counted = 1, False
+                return
+            if self.writer is not None or self.waiting_writers:
+                started = time.perf_counter()
+                while self.writer is not None or self.waiting_writers:
+                    self.condition.wait()
+                metrics.LOCK_WAIT.observe(time.perf_counter() - started, mode="read")
+            self.readers += 1
+            self.local.reads, self.local.counted = 1, True
+
+    def release_read(self):
+        with self.condition:
+            if not self.held_reads():
+                raise RuntimeError("Read lock released by a thread that does not hold it")
+            self.local.reads -= 1
+            if self.local.reads == 0 and self.local.counted:
+                self.readers -= 1
+                if self.readers == 0:
+                    self.condition.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self.condition:
+            if self.writer == me:
+                self.writer_depth += 1
+                return
+            if self.held_reads():
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            if self.writer is not None or self.readers:
+                started = time.perf_counter()
+                self.waiting_writers += 1
+                try:
+                    while self.writer is not None or self.readers:
+                        self.condition.wait()
+                finally:
+                    self.waiting_writers -= 1
+                metrics.LOCK_WAIT.observe(time.perf_counter() - started, mode="write")
+            self.writer = me
+            self.writer_depth = 1
+
+    def release_write(self):
+        with self.condition:
+            if self.writer != threading.get_ident():
+                raise RuntimeError("Write lock released by a thread that does not hold it")
+            self.writer_depth -= 1
+            if self.writer_depth:
+                return
+            self.writer = None
+            if self.held_reads() and not self.local.counted:
+                # Still reading after the write ended: keep other writers out
+                self.readers += 1
+                self.local.counted = True
+            self.condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
+
+
+class LockRegistry:
+    """One RWLock per key, kept only while someone holds or waits for it"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.locks = weakref.WeakValueDictionary()
+
+    def get(self, key):
+        with self.lock:
+            lock = self.locks.get(key)
+            if lock is None:
+                lock = self.locks[key] = RWLock()
+            return lock
+
+    def __len__(self):
+        return len(self.locks)
+
+
+files = LockRegistry()
+
+
+def file_lock(path):
+    """The lock for one resume file, whatever relative or absolute path names it"""
+    return files.get(os.path.normcase(os.path.abspath(path)))
+
+
+@contextmanager
+def process_lock(path, shared=False):
+    """Hold the lock file at path against other threads and other processes
+
+    Shared holders run together, an exclusive one runs alone.  Nesting in a
+    thread that already holds it (shared inside exclusive, or the same mode)
+    takes nothing more.
+    """
+    lock = file_lock(path)
+    nested = lock.writer == threading.get_ident() or lock.held_reads()
+    with lock.read() if shared else lock.write():
+        if nested or fcntl is None:
+            yield
+            return
+        with open(path, "a") as file:
+            fcntl.flock(file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield
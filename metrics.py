@@ -0,0 +1,363 @@
+"""In-process metrics registry rendered in the Prometheus text exposition format.
+
+No client library or external service is needed: counters, gauges and
+histograms live in this process and ``REGISTRY.render()`` produces the text
+served from ``/metrics``.  Each worker process keeps its own registry, so a
+scraper behind a load balancer sees one worker per scrape.
+"""
+import bisect
+import threading
+import time
+
+# Latency buckets in seconds, from cheap JSON edits up to slow PDF builds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Size buckets in bytes, from small JSON writes up to large exports
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in pairs) + "}"
+
+
+class Metric:
+    """Base class for a named metric family with optional labels"""
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def label_key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self):
+        with self.lock:
+            return [(f"{self.name}{format_labels(self.labelnames, key)}", value)
+                    for key, value in sorted(self.values.items())]
+
+    def render(self):
+        lines = self.header()
+        lines.extend(f"{name} {format_value(value)}" for name, value in self.samples())
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        with self.lock:
+            return self.values.get(self.label_key(labels), 0)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][bisect.bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def time(self, **labels):
+        """Context manager observing the elapsed wall time of its block"""
+        return Timer(lambda elapsed: self.observe(elapsed, **labels))
+
+    def render(self):
+        lines = self.header()
+        with self.lock:
+            items = sorted((key, (list(entry[0]), entry[1], entry[2])) for key, entry in self.values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = format_labels(self.labelnames, key, ("le", format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Timer:
+    """Measure a block with perf_counter and hand the elapsed seconds to a callback
+
+    Blocks that raise are not observed; failures are counted separately.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.callback(time.perf_counter() - self.started)
+        return False
+
+
+class RenderTrace:
+    """Stage timings and counts collected while rendering one export
+
+    Renderers call ``stage(name)`` around the work they do and ``count(name, n)``
+    for things they produce.  Repeated stages (``format_date`` runs once per
+    date) accumulate, so each stage reports its total time and call count.
+    """
+
+    enabled = True
+
+    def __init__(self, export_format):
+        self.format = export_format
+        self.stages = {}
+        self.calls = {}
+        self.counts = {}
+
+    def stage(self, name):
+        return Timer(lambda elapsed: self.add(name, elapsed))
+
+    def add(self, name, elapsed):
+        self.stages[name] = self.stages.get(name, 0.0) + elapsed
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def wrap(self, name, func):
+        """Return func timed under the given stage"""
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - started)
+        return timed
+
+    def count(self, name, amount=1):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def publish(self):
+        """Feed the collected stages and counts into the registry"""
+        for name, elapsed in self.stages.items():
+            RENDER_STAGE_DURATION.observe(elapsed, format=self.format, stage=name)
+            RENDER_STAGE_CALLS.inc(self.calls[name], format=self.format, stage=name)
+        for name, amount in self.counts.items():
+            RENDER_ITEMS.inc(amount, format=self.format, item=name)
+
+    def server_timing(self):
+        """Render the stages as a Server-Timing header value"""
+        entries = [f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in self.stages.items()]
+        entries.extend(f'{name};desc="{amount}"' for name, amount in self.counts.items())
+        return ", ".join(entries)
+
+
+class NullTrace:
+    """Drop-in RenderTrace that records nothing and adds no per-call overhead"""
+
+    enabled = False
+
+    def stage(self, name):
+        return NULL_TIMER
+
+    def add(self, name, elapsed):
+        pass
+
+    def wrap(self, name, func):
+        return func
+
+    def count(self, name, amount=1):
+        pass
+
+    def publish(self):
+        pass
+
+    def server_timing(self):
+        return ""
+
+
+class NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_TIMER = NullTimer()
+NULL_TRACE = NullTrace()
+
+
+class CacheStats:
+    """Hit/miss counters for named caches, plus a derived hit ratio gauge"""
+
+    def __init__(self, registry):
+        self.lookups = registry.counter(
+            "seeme_cache_requests_total", "Cache lookups by cache and result", ["cache", "result"])
+        registry.collectors.append(self.render_ratios)
+
+    def hit(self, cache):
+        self.lookups.inc(cache=cache, result="hit")
+
+    def miss(self, cache):
+        self.lookups.inc(cache=cache, result="miss")
+
+    def render_ratios(self):
+        totals = {}
+        with self.lookups.lock:
+            for (cache, result), value in self.lookups.values.items():
+                hits, count = totals.get(cache, (0, 0))
+                totals[cache] = (hits + (value if result == "hit" else 0), count + value)
+        lines = ["# HELP seeme_cache_hit_ratio Share of cache lookups that were hits",
+                 "# TYPE seeme_cache_hit_ratio gauge"]
+        for cache, (hits, count) in sorted(totals.items()):
+            ratio = hits / count if count else 0.0
+            lines.append(f'seeme_cache_hit_ratio{{cache="{escape_label(cache)}"}} {format_value(ratio)}')
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together"""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        with self.lock:
+            self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        """Render every metric in the Prometheus text format"""
+        lines = []
+        for metric in list(self.metrics):
+            lines.extend(metric.render())
+        for collector in list(self.collectors):
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "seeme_http_requests_total", "HTTP requests by route, method and status", ["route", "method", "status"])
+HTTP_LATENCY = REGISTRY.histogram(
+    "seeme_http_request_duration_seconds", "HTTP request latency by route", ["route", "method"])
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "seeme_http_requests_in_flight", "Requests currently being handled")
+EXPORT_DURATION = REGISTRY.histogram(
+    "seeme_export_duration_seconds", "Time spent rendering an export", ["format"])
+EXPORT_BYTES = REGISTRY.histogram(
+    "seeme_export_size_bytes", "Size of rendered exports", ["format"], buckets=SIZE_BUCKETS)
+EXPORT_FAILURES = REGISTRY.counter(
+    "seeme_export_failures_total", "Exports that raised an error", ["format"])
+SAVE_BYTES = REGISTRY.counter(
+    "seeme_save_bytes_total", "Bytes written when saving resumes")
+SAVE_DURATION = REGISTRY.histogram(
+    "seeme_save_duration_seconds", "Time spent serializing and writing a resume")
+SAVE_FAILURES = REGISTRY.counter(
+    "seeme_save_failures_total", "Resume saves that failed")
+CATALOG_SCAN_DURATION = REGISTRY.histogram(
+    "seeme_catalog_scan_duration_seconds", "Time spent listing the resumes directory")
+CATALOG_FILES = REGISTRY.gauge(
+    "seeme_catalog_files", "Resume files found by the last catalog scan")
+RENDER_STAGE_DURATION = REGISTRY.histogram(
+    "seeme_render_stage_duration_seconds", "Time per export by renderer stage", ["format", "stage"])
+RENDER_STAGE_CALLS = REGISTRY.counter(
+    "seeme_render_stage_calls_total", "Times each renderer stage ran", ["format", "stage"])
+RENDER_ITEMS = REGISTRY.counter(
+    "seeme_render_items_total", "Flowables, paragraphs and bytes produced by renderers", ["format", "item"])
+ASGI_PENDING = REGISTRY.gauge(
+    "seeme_asgi_pending_requests", "ASGI requests queued or running on an executor", ["executor"])
+CACHE = CacheStats(REGISTRY)
+WATCH_EVENTS = REGISTRY.counter(
+    "seeme_watch_events_total", "Resume directory changes seen by the watcher", ["kind"])
+IMPORT_DURATION = REGISTRY.gauge(
+    "seeme_import_duration_seconds", "Wall time spent importing app modules", ["module"])
+LOCK_WAIT = REGISTRY.histogram(
+    "seeme_lock_wait_seconds", "Time spent waiting for a contended resume lock", ["mode"])
+EVENTS_PUBLISHED = REGISTRY.counter(
+    "seeme_events_published_total", "Change events appended to the shared event log", ["type"])
+EVENT_STREAMS = REGISTRY.gauge(
+    "seeme_event_streams", "Open /api/events connections in this process")
+RETENTION_FILES = REGISTRY.counter(
+    "seeme_retention_files_total", "Old resume versions removed by the retention compactor", ["action"])
+RETENTION_RECLAIMED_BYTES = REGISTRY.counter(
+    "seeme_retention_reclaimed_bytes_total", "Bytes freed in the resumes directory by the retention compactor")
+RETENTION_PASS_DURATION = REGISTRY.histogram(
+    "seeme_retention_pass_duration_seconds", "Time per incremental retention pass")
+RESUME_CACHE_ENTRIES = REGISTRY.gauge(
+    "seeme_resume_cache_entries", "Resumes kept parsed in memory after the editor switched away")
+RESUME_CACHE_BYTES = REGISTRY.gauge(
+    "seeme_resume_cache_bytes", "Size of the cached resumes as compact JSON")
+RESUME_CACHE_EVICTIONS = REGISTRY.counter(
+    "seeme_resume_cache_evictions_total", "Resumes dropped from the cache, by whether they had to be written first", ["state"])
+BULK_EDIT_FILES = REGISTRY.counter(
+    "seeme_bulk_edit_files_total", "Resumes visited by bulk edits, by outcome", ["status"])
+PROCESS_START_TIME = REGISTRY.gauge(
+    "seeme_process_start_time_seconds", "Unix time the process started")
+PROCESS_START_TIME.set(time.time())
@@ -0,0 +1,251 @@
+"""PDF rendering with reportlab.
+
+This is the only module that imports reportlab.  ``app.py`` imports it on the
+first export (see ``load_pdf_export``), so workers that only serve JSON edits
+never load reportlab.  ``wsgi.py`` imports it on purpose in the gunicorn
+master so preforked workers share it.
+"""
+import io
+import time
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+
+import sanitize
+
+
+# Built once per process; gunicorn builds it in the master before forking (see wsgi.py)
+@lru_cache(maxsize=None)
+def pdf_styles():
+    """Build the PDF paragraph styles once per process and share them between exports"""
+    styles = getSampleStyleSheet()
+    
+    # Define modern, ATS-compliant color palette
+    primary_color = colors.HexColor('#2c3e50')    # Dark blue-gray
+    accent_color = colors.HexColor('#3498db')     # Professional blue  
+    text_color = colors.HexColor('#2c3e50')       # Dark text
+    light_gray = colors.HexColor('#7f8c8d')       # Light gray for dates
+    
+    # Create compact paragraph styles with reduced spacing
+    base_font = 'Helvetica'  # ATS-compliant standard font
+    
+    # Compact header styles
+    name_style = ParagraphStyle(
+        'CompactName',
+        parent=styles['Heading1'],
+        fontName='Helvetica-Bold',
+        fontSize=22,                # Reduced from 26
+        spaceAfter=4,              # Reduced from 8
+        alignment=TA_CENTER,
+        textColor=primary_color,
+        leading=24                 # Reduced from 30
+    )
+    
+    title_style = ParagraphStyle(
+        'CompactTitle', 
+        parent=styles['Normal'],
+        fontName='Helvetica',
+        fontSize=12,               # Reduced from 14
+        spaceAfter=3,              # Reduced from 6
+        alignment=TA_CENTER,
+        textColor=accent_color,
+        leading=14                 # Reduced from 16
+    )
+    
+    contact_style = ParagraphStyle(
+        'CompactContact',
+        parent=styles['Normal'],
+        fontName='Helvetica',
+        fontSize=10,
+        spaceAfter=8,              # Reduced from 18
+        alignment=TA_CENTER,
+        textColor=text_color,
+        leading=11                 # Reduced from 12
+    )
+    
+    # Compact section header style
+    section_style = ParagraphStyle(
+        'CompactSection',
+        parent=styles['Heading2'],
+        fontName='Helvetica-Bold',
+        fontSize=12,               # Reduced from 14
+        spaceBefore=10,            # Reduced from 20
+        spaceAfter=6,              # Reduced from 10
+        textColor=primary_color,
+        leading=14                 # Reduced from 16
+    )
+    
+    # Compact job title style
+    job_title_style = ParagraphStyle(
+        'CompactJobTitle',
+        parent=styles['Normal'],
+        fontName='Helvetica-Bold',
+        fontSize=11,               # Reduced from 12
+        spaceBefore=6,             # Reduced from 12
+        spaceAfter=1,              # Reduced from 2
+        textColor=primary_color,
+        leading=12                 # Reduced from 14
+    )
+    
+    # Compact company and date style
+    company_style = ParagraphStyle(
+        'CompactCompany',
+        parent=styles['Normal'],
+        fontName='Helvetica',
+        fontSize=10,               # Reduced from 11
+        spaceAfter=1,              # Reduced from 2
+        textColor=accent_color,
+        leading=11                 # Reduced from 13
+    )
+    
+    date_style = ParagraphStyle(
+        'CompactDate',
+        parent=styles['Normal'],
+        fontName='Helvetica-Oblique',
+        fontSize=9,
+        spaceAfter=4,              # Reduced from 8
+        textColor=light_gray,
+        leading=10                 # Reduced from 11
+    )
+    
+    # Compact content text style
+    content_style = ParagraphStyle(
+        'CompactContent',
+        parent=styles['Normal'],
+        fontName='Helvetica',
+        fontSize=9,                # Reduced from 10
+        spaceAfter=6,              # Reduced from 12
+        textColor=text_color,
+        leading=11,                # Reduced from 13
+        alignment=TA_JUSTIFY
+    )
+    
+    # Compact skills style
+    skills_style = ParagraphStyle(
+        'CompactSkills',
+        parent=styles['Normal'],
+        fontName='Helvetica',
+        fontSize=9,                # Reduced from 10
+        spaceAfter=6,              # Reduced from 12
+        textColor=text_color,
+        leading=12                 # Reduced from 14
+    )
+    
+    return {
+        "name": name_style,
+        "title": title_style,
+        "contact": contact_style,
+        "section": section_style,
+        "job_title": job_title_style,
+        "company": company_style,
+        "date": date_style,
+        "content": content_style,
+        "skills": skills_style,
+    }
+
+
+def render_pdf(layout, trace):
+    """Emit a compiled resume_ir layout as a compact, ATS-compliant PDF; returns a BytesIO"""
+    styles_started = time.perf_counter()
+    buffer = io.BytesIO()
+    
+    # Create document with tighter margins for more content
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                          rightMargin=36, leftMargin=36,  # Reduced from 54
+                          topMargin=36, bottomMargin=36)  # Reduced from 54
+    
+    # Paragraph styles are built once per process
+    styles = pdf_styles()
+    name_style, title_style, contact_style = styles["name"], styles["title"], styles["contact"]
+    section_style, job_title_style, company_style = styles["section"], styles["job_title"], styles["company"]
+    date_style, content_style, skills_style = styles["date"], styles["content"], styles["skills"]
+    
+    trace.add("styles", time.perf_counter() - styles_started)
+    
+    story_started = time.perf_counter()
+    story = []
+    
+    # Compact header section
+    if layout.name.text:
+        story.append(Paragraph(sanitize.escape(layout.name.text.upper()), name_style))
+    else:
+        story.append(Paragraph("YOUR NAME HERE", name_style))
+    
+    # Professional Title
+    if layout.label.text:
+        story.append(Paragraph(layout.label.markup, title_style))
+    
+    # Contact Information (simplified without icons)
+    if layout.contacts:
+        story.append(Paragraph("  •  ".join(contact.markup for _, contact in layout.contacts), contact_style))
+    
+    # Minimal separator space
+    story.append(Spacer(1, 6))     # Reduced from 20
+    
+    for section in layout.sections:
+        story.append(Paragraph(section.title.upper(), section_style))
+    
+        if section.key in ("summary", "objective"):
+            # Professional Summary / Career Objective
+            for block in section.blocks:
+                story.append(Paragraph(block.runs[0].markup, content_style))
+            story.append(Spacer(1, 4))  # Reduced from 10
+    
+        elif section.key in ("work", "education"):
+            # Work Experience and Education (already sorted)
+            for entry in section.blocks:
+                if entry.title.text:
+                    story.append(Paragraph(entry.title.markup, job_title_style))
+    
+                if entry.subtitle.text:
+                    story.append(Paragraph(entry.subtitle.markup, company_style))
+    
+                # Date range
+                if entry.dates:
+                    story.append(Paragraph(entry.dates, date_style))
+    
+                # Job description, GPA, details and coursework (more compact formatting)
+                for block in entry.details:
+                    if block.kind == "highlights":
+                        for highlight in block.runs:
+                            story.append(Paragraph(f"• {highlight.markup}", content_style))
+                    elif block.kind == "gpa":
+                        story.append(Paragraph(f"GPA: {block.runs[0].markup}", content_style))
+                    elif block.kind == "courses":
+                        courses_text = f"Coursework: {', '.join(course.markup for course in block.runs)}"
+                        story.append(Paragraph(courses_text, content_style))
+                    else:
+                        story.append(Paragraph(block.runs[0].markup, content_style))
+    
+                story.append(Spacer(1, 4))  # Reduced from 8
+    
+        elif section.key == "skills":
+            # Technical Skills (more compact)
+            for block in section.blocks:
+                if block.runs:
+                    skills_text = " • ".join(skill.markup for skill in block.runs)
+                    story.append(Paragraph(skills_text, skills_style))
+    
+    # Minimal footer space
+    story.append(Spacer(1, 8))      # Reduced from 20
+    
+    # If no content exists, add a placeholder
+    if len(story) <= 3:  # Only header elements
+        story.append(Paragraph("This resume is empty. Please add your information using the web interface.", content_style))
+    
+    trace.add("story", time.perf_counter() - story_started)
+    
+    # Count before building, doc.build consumes the story list
+    if trace.enabled:
+        trace.count("flowables", len(story))
+        trace.count("paragraphs", sum(1 for flowable in story if isinstance(flowable, Paragraph)))
+    
+    with trace.stage("build"):
+        doc.build(story)
+    buffer.seek(0)
+    trace.count("bytes", buffer.getbuffer().nbytes)
+    return buffer
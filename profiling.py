@@ -0,0 +1,182 @@
+"""Opt-in per-request profiling.
+
+A request is profiled when profiling is enabled in the app config and the
+request asks for it with an ``X-Profile`` header or ``profile`` query
+parameter.  Two modes are supported:
+
+* ``cprofile``: deterministic cProfile of the handling thread, saved as
+  ``.pstats``, plus a sampled ``.collapsed`` stack file for flame graphs.
+* ``sample``: only the low-overhead stack sampler, saved as ``.collapsed``.
+
+Every profile also gets a small ``.json`` metadata file that the index
+endpoint lists.  Collapsed stacks use the ``frame;frame;frame count`` format
+read by flamegraph.pl and speedscope.
+"""
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+MODES = ("cprofile", "sample")
+ARTIFACT_EXTENSIONS = (".pstats", ".collapsed", ".json")
+
+
+def requested_mode(value):
+    """Map a header or query value to a profiling mode, or None when not requested"""
+    if not value:
+        return None
+    value = value.strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return "cprofile"
+    return value if value in MODES else None
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval from a helper thread"""
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileSession:
+    """One in-flight profiled request"""
+
+    def __init__(self, profiler, mode, method, path):
+        self.profiler = profiler
+        self.mode = mode
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.created = datetime.now()
+        self.cprofile = cProfile.Profile() if mode == "cprofile" else None
+        self.sampler = StackSampler(threading.get_ident(), profiler.sample_interval)
+        self.profile_id = None
+
+    def start(self):
+        self.sampler.start()
+        if self.cprofile:
+            self.cprofile.enable()
+        return self
+
+    def stop(self, status=None):
+        """Stop profiling and write the artifacts; returns the profile id"""
+        if self.profile_id is not None:
+            return self.profile_id
+        if self.cprofile:
+            self.cprofile.disable()
+        self.sampler.stop()
+        elapsed = time.perf_counter() - self.started
+        self.profile_id = self.profiler.save(self, elapsed, status)
+        return self.profile_id
+
+
+class RequestProfiler:
+    """Create profiling sessions and manage the stored profiles"""
+
+    def __init__(self, directory="profiles", sample_interval=0.001, max_profiles=200):
+        self.directory = directory
+        self.sample_interval = sample_interval
+        self.max_profiles = max_profiles
+        self.lock = threading.Lock()
+
+    def start(self, mode, method, path):
+        return ProfileSession(self, mode, method, path).start()
+
+    def save(self, session, elapsed, status):
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r'[^\w-]+', '_', session.path.strip('/')) or 'root'
+        profile_id = f"{session.created.strftime('%Y%m%dT%H%M%S%f')}_{session.method}_{slug}"[:120]
+        base = os.path.join(self.directory, profile_id)
+
+        files = []
+        if session.cprofile:
+            session.cprofile.dump_stats(base + ".pstats")
+            files.append(profile_id + ".pstats")
+        with open(base + ".collapsed", "w", encoding="utf-8") as file:
+            file.write(session.sampler.collapsed())
+        files.append(profile_id + ".collapsed")
+
+        metadata = {
+            "id": profile_id,
+            "mode": session.mode,
+            "method": session.method,
+            "path": session.path,
+            "status": status,
+            "created": session.created.strftime('%Y-%m-%d %H:%M:%S'),
+            "duration_ms": round(elapsed * 1000, 3),
+            "samples": session.sampler.samples,
+            "files": files,
+        }
+        with open(base + ".json", "w", encoding="utf-8") as file:
+            json.dump(metadata, file, indent=4)
+
+        self.prune()
+        return profile_id
+
+    def list_profiles(self):
+        """Return stored profile metadata, newest first"""
+        profiles = []
+        if not os.path.isdir(self.directory):
+            return profiles
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), "r", encoding="utf-8") as file:
+                    profiles.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+        profiles.sort(key=lambda profile: profile.get("id", ""), reverse=True)
+        return profiles
+
+    def prune(self):
+        """Delete the oldest profiles beyond max_profiles"""
+        with self.lock:
+            for profile in self.list_profiles()[self.max_profiles:]:
+                for extension in ARTIFACT_EXTENSIONS:
+                    path = os.path.join(self.directory, profile["id"] + extension)
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def is_artifact(self, filename):
+        """True when filename names a stored profile artifact"""
+        return (os.path.basename(filename) == filename
+                and filename.endswith(ARTIFACT_EXTENSIONS)
+                and os.path.isfile(os.path.join(self.directory, filename)))
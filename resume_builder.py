@@ -4,6 +4,9 @@ from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
 import uuid
 import re
+import resume_ir
+import resume_model
+import resume_storage
 
 class ResumeBuilder:
     def __init__(self, root):
@@ -497,96 +500,68 @@ class ResumeBuilder:
         # Story (content) list
         story = []
         
-        # Get data
-        basics = self.resume_data.get("basics", {})
-        location = basics.get("location", {})
+        # Compile the shared layout IR (escaped fields, sanitized summaries, formatted dates)
+        layout = resume_ir.compile_resume(resume_model.Resume.from_dict(self.resume_data))
+        sections = {section.key: section for section in layout.sections}
         
         # Header - Name and Title
-        if basics.get("name"):
-            story.append(Paragraph(basics["name"], title_style))
+        if layout.name.text:
+            story.append(Paragraph(layout.name.markup, title_style))
         
-        if basics.get("label"):
-            story.append(Paragraph(basics["label"], subtitle_style))
+        if layout.label.text:
+            story.append(Paragraph(layout.label.markup, subtitle_style))
         
         # Contact information
-        contact_info = []
-        if basics.get("email"):
-            contact_info.append(basics["email"])
-        if basics.get("phone"):
-            contact_info.append(basics["phone"])
-        if location.get("city"):
-            contact_info.append(location["city"])
-        
-        if contact_info:
-            story.append(Paragraph(" | ".join(contact_info), 
+        if layout.contacts:
+            story.append(Paragraph(" | ".join(contact.markup for _, contact in layout.contacts), 
                                  ParagraphStyle('ContactInfo', 
                                               parent=styles['Normal'],
                                               alignment=TA_CENTER,
                                               spaceAfter=20)))
         
-        # Summary
-        if basics.get("summary"):
-            story.append(Paragraph("PROFESSIONAL SUMMARY", section_style))
-            clean_summary = self.clean_html(basics["summary"])
-            story.append(Paragraph(clean_summary, styles['Normal']))
-            story.append(Spacer(1, 12))
-        
-        # Objective
-        if basics.get("objective"):
-            story.append(Paragraph("CAREER OBJECTIVE", section_style))
-            clean_objective = self.clean_html(basics["objective"])
-            story.append(Paragraph(clean_objective, styles['Normal']))
-            story.append(Spacer(1, 12))
+        # Summary and Objective
+        for key, heading in (("summary", "PROFESSIONAL SUMMARY"), ("objective", "CAREER OBJECTIVE")):
+            if key in sections:
+                story.append(Paragraph(heading, section_style))
+                story.append(Paragraph(sections[key].blocks[0].runs[0].markup, styles['Normal']))
+                story.append(Spacer(1, 12))
         
         # Work Experience
-        work_items = self.resume_data.get("work", [])
-        if work_items:
+        if "work" in sections:
             story.append(Paragraph("WORK EXPERIENCE", section_style))
             
-            for work in work_items:
+            for work in sections["work"].blocks:
                 # Company and position
-                company = work.get("name", "")
-                position = work.get("position", "")
-                
-                if company or position:
-                    job_title = f"<b>{position}</b>" if position else ""
-                    if company:
-                        job_title += f" - {company}" if job_title else f"<b>{company}</b>"
+                if work.title.text or work.subtitle.text:
+                    job_title = f"<b>{work.title.markup}</b>" if work.title.text else ""
+                    if work.subtitle.text:
+                        job_title += f" - {work.subtitle.markup}" if job_title else f"<b>{work.subtitle.markup}</b>"
                     story.append(Paragraph(job_title, styles['Heading3']))
                 
                 # Dates
-                start_date = self.format_date(work.get("startDate", ""))
-                end_date = self.format_date(work.get("endDate", "")) if work.get("endDate") else "Present"
-                
-                if start_date:
-                    date_range = f"{start_date} - {end_date}"
-                    story.append(Paragraph(date_range, 
+                if work.dates:
+                    story.append(Paragraph(work.dates, 
                                          ParagraphStyle('DateStyle',
                                                       parent=styles['Normal'],
                                                       fontSize=10,
                                                       textColor=colors.grey,
                                                       spaceAfter=6)))
                 
-                # Job summary
-                if work.get("summary"):
-                    clean_summary = self.clean_html(work["summary"])
-                    # Split by bullet points and format
-                    lines = [line.strip() for line in clean_summary.split('•') if line.strip()]
-                    for line in lines:
-                        if line:
-                            story.append(Paragraph(f"• {line}", styles['Normal']))
+                # Job summary, one bullet per highlight
+                for block in work.details:
+                    for line in block.runs:
+                        if line.markup:
+                            story.append(Paragraph(f"• {line.markup}", styles['Normal']))
                 
                 story.append(Spacer(1, 12))
         
         # Skills
-        skills = self.resume_data.get("skills", {})
-        technologies = skills.get("technologies", [])
-        if technologies:
+        if "skills" in sections:
             story.append(Paragraph("TECHNICAL SKILLS", section_style))
             
-            skill_names = [tech.get("name", "") for tech in technologies if tech.get("name")]
+            skill_names = sections["skills"].blocks[0].runs
             if skill_names:
-                skills_text = " • ".join(skill_names)
+                skills_text = " • ".join(skill.markup for skill in skill_names)
                 story.append(Paragraph(skills_text, styles['Normal']))
                 story.append(Spacer(1, 12))
         
@@ -611,12 +586,12 @@ class ResumeBuilder:
         )
         if file_path:
             try:
-                with open(file_path, "r", encoding="utf-8") as file:
-                    self.resume_data = json.load(file)
-                    self.current_file = file_path
-                    self.populate_fields()
-                    self.update_status(f"✅ File opened: {file_path}")
-                    messagebox.showinfo("Success", "Resume data loaded successfully!")
+                # Manifests and variants are resolved; saving writes a plain file
+                self.resume_data = resume_storage.read_resume(file_path)
+                self.current_file = file_path
+                self.populate_fields()
+                self.update_status(f"✅ File opened: {file_path}")
+                messagebox.showinfo("Success", "Resume data loaded successfully!")
             except Exception as e:
                 self.update_status(f"❌ Failed to open file: {str(e)}")
                 messagebox.showerror("Error", f"Failed to load file: {str(e)}")
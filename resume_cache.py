@@ -0,0 +1,131 @@
+"""Bounded working set of the resumes an editor has open or recently had open.
+
+Opening a resume reads its file, resolves a manifest or variant base,
+replays the journal and validates the result into a ``resume_model.Resume``.
+When the editor switches to another resume, the one it leaves goes into a
+``ResumeCache`` as it stands, so opening it again skips all of that.
+
+* An entry is used only while every file it was read from (the resume and,
+  for a variant, its bases) still has the (mtime_ns, size) recorded, and its
+  journal is still at the entry's revision.  Anything else is a miss and the
+  file is read again.
+* At most ``max_entries`` entries and ``max_bytes`` of resume JSON are kept;
+  the least recently used go first.
+* An entry is dirty while it holds journaled edits its file does not.  The
+  cache calls ``flush(entry)`` before dropping a dirty entry, and
+  ``flush_all`` writes every dirty entry (at exit).
+
+The open resume itself is not in the cache: ``take`` hands an entry to the
+editor and ``put`` gives it back.
+"""
+import threading
+from collections import OrderedDict
+
+import metrics
+
+
+class CachedResume:
+    """One resume as the editor left it"""
+
+    def __init__(self, filename, data, signatures, size, journal=None, variant=None, pinned=frozenset(),
+                 model=None, dirty=False):
+        self.filename = filename
+        self.data = data
+        # ((filename, (mtime_ns, size)), ...) for the file and any variant bases it was read from
+        self.signatures = signatures
+        # Bytes of the resume as compact JSON, counted against max_bytes
+        self.size = size
+        # The file's resume_journal, kept so its redo stack survives switching away
+        self.journal = journal
+        self.variant = variant
+        self.pinned = pinned
+        self.model = model
+        self.dirty = dirty
+
+
+class ResumeCache:
+    def __init__(self, max_entries=16, max_bytes=8 * 1024 * 1024, flush=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.flush = flush
+        self.lock = threading.Lock()
+        # filename -> CachedResume, least recently used first
+        self.entries = OrderedDict()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, filename):
+        return filename in self.entries
+
+    def take(self, filename, valid):
+        """Remove and return the entry for filename if valid(entry) holds, else None"""
+        with self.lock:
+            entry = self.entries.pop(filename, None)
+            if entry is not None:
+                self.bytes -= entry.size
+        self.publish_size()
+        if entry is None or not valid(entry):
+            # A stale dirty entry is dropped unwritten: its journal is reconciled with the newer file on load
+            metrics.CACHE.miss("resume")
+            return None
+        metrics.CACHE.hit("resume")
+        return entry
+
+    def put(self, entry):
+        """Keep an entry as the most recently used, evicting the least recently used beyond the limits"""
+        evicted = []
+        with self.lock:
+            previous = self.entries.pop(entry.filename, None)
+            if previous is not None:
+                self.bytes -= previous.size
+            self.entries[entry.filename] = entry
+            self.bytes += entry.size
+            while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+                _, victim = self.entries.popitem(last=False)
+                self.bytes -= victim.size
+                evicted.append(victim)
+        # Flushing writes files, so it happens outside the cache lock
+        for victim in evicted:
+            self.evict(victim)
+        self.publish_size()
+
+    def evict(self, entry):
+        metrics.RESUME_CACHE_EVICTIONS.inc(state="dirty" if entry.dirty else "clean")
+        self.write(entry)
+
+    def write(self, entry):
+        """Flush a dirty entry; returns False when it could not be written"""
+        if not entry.dirty or self.flush is None:
+            return True
+        try:
+            self.flush(entry)
+        except Exception as e:
+            print(f"Error flushing cached resume {entry.filename}: {e}")
+            return False
+        entry.dirty = False
+        return True
+
+    def discard(self, filename):
+        """Drop an entry without flushing it (its file was deleted)"""
+        with self.lock:
+            entry = self.entries.pop(filename, None)
+            if entry is not None:
+                self.bytes -= entry.size
+        self.publish_size()
+
+    def dirty(self):
+        """File names of the entries holding unwritten edits"""
+        with self.lock:
+            return [filename for filename, entry in self.entries.items() if entry.dirty]
+
+    def flush_all(self):
+        """Write every dirty entry, keeping them cached; returns the number written"""
+        with self.lock:
+            entries = [entry for entry in self.entries.values() if entry.dirty]
+        return sum(1 for entry in entries if self.write(entry))
+
+    def publish_size(self):
+        metrics.RESUME_CACHE_ENTRIES.set(len(self.entries))
+        metrics.RESUME_CACHE_BYTES.set(self.bytes)
@@ -0,0 +1,115 @@
+"""Incremental index of the resumes directory behind ``/api/resumes``.
+
+A catalog entry holds what the resume list shows (file name, person name,
+modification time, and for a variant the file it inherits from), so listing
+does not have to open and parse every file every time.
+
+The catalog has two modes:
+
+* Unwatched: ``entries()`` lists the directory and stats each file, and only
+  re-parses files whose (mtime, size) changed since the last listing.
+* Watched: a ``resume_watcher.ResumeWatcher`` feeds ``apply(event)`` and
+  listing uses the index as it stands, with no directory scan at all.  A
+  ``rescan`` event (lost events) drops back to one full validation.
+"""
+import os
+import threading
+from datetime import datetime
+
+import metrics
+import resume_storage
+import resume_variants
+from resume_watcher import is_resume_file
+
+
+class ResumeCatalog:
+    def __init__(self, directory):
+        self.directory = directory
+        self.lock = threading.Lock()
+        # filename -> entry dict (see read_entry)
+        self.index = {}
+        # Set while a watcher keeps the index current
+        self.watched = False
+        self.needs_scan = True
+
+    def read_entry(self, filename, stat=None):
+        """Parse one file into a catalog entry, or None when it is unreadable"""
+        filepath = os.path.join(self.directory, filename)
+        try:
+            stat = stat or os.stat(filepath)
+            document = resume_storage.read_document(filepath)
+            # Manifests and variants carry the name, so no objects or bases are read for the listing
+            name = resume_storage.resume_name(document)
+        except (OSError, ValueError, AttributeError):
+            return None
+        return {
+            'filename': filename,
+            'name': name,
+            'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+            'path': filepath,
+            'variant_of': document.get('base') if resume_variants.is_variant(document) else None,
+            'signature': (stat.st_mtime_ns, stat.st_size),
+        }
+
+    def validate(self):
+        """Bring the index in line with the directory, re-parsing only changed files"""
+        seen = set()
+        try:
+            with os.scandir(self.directory) as listing:
+                for dir_entry in listing:
+                    if not is_resume_file(dir_entry.name):
+                        continue
+                    try:
+                        stat = dir_entry.stat()
+                    except OSError:
+                        continue
+                    seen.add(dir_entry.name)
+                    current = self.index.get(dir_entry.name)
+                    if current is not None and current['signature'] == (stat.st_mtime_ns, stat.st_size):
+                        metrics.CACHE.hit("catalog")
+                        continue
+                    metrics.CACHE.miss("catalog")
+                    entry = self.read_entry(dir_entry.name, stat)
+                    if entry is None:
+                        self.index.pop(dir_entry.name, None)
+                    else:
+                        self.index[dir_entry.name] = entry
+        except FileNotFoundError:
+            pass
+        for filename in list(self.index):
+            if filename not in seen:
+                del self.index[filename]
+        self.needs_scan = False
+
+    def entries(self):
+        """Return catalog entries, newest first"""
+        with self.lock:
+            if not self.watched or self.needs_scan:
+                self.validate()
+            elif self.index:
+                metrics.CACHE.hit("catalog")
+            entries = [{key: value for key, value in entry.items() if key != 'signature'}
+                       for entry in self.index.values()]
+        entries.sort(key=lambda x: x['modified'], reverse=True)
+        return entries
+
+    def apply(self, event):
+        """Update the index for one resume_watcher.FileEvent"""
+        with self.lock:
+            if event.kind == "rescan":
+                self.needs_scan = True
+            elif event.kind == "deleted":
+                self.index.pop(event.filename, None)
+            else:
+                entry = self.read_entry(event.filename)
+                if entry is None:
+                    self.index.pop(event.filename, None)
+                else:
+                    self.index[event.filename] = entry
+
+    def watch(self, watcher):
+        """Trust watcher events from now on instead of scanning on every listing"""
+        watcher.subscribe(self.apply)
+        with self.lock:
+            self.watched = True
+            self.needs_scan = True
@@ -0,0 +1,381 @@
+"""Live change events for resumes, shared by every worker process.
+
+Each edit the app persists is published as one JSON line appended to
+``resumes/.events.jsonl``:
+
+    {"type": "change", "resume": "Skylor_Piersall_2025_09_10T05_30_02.json", "op": "add_skill",
+     "version": 7, "change": {"section": "skills", "value": {...}}, "origin": "host/1234"}
+
+Every process tails that file on an ``EventBroker`` thread and hands new
+events to its subscribers: the ``/api/events`` Server-Sent Events streams of
+open browser tabs, and the process's own editor, which reloads a resume
+another worker changed.  The file is the only shared state, so several
+gunicorn workers (or a WSGI and an ASGI process) on one host see each
+other's edits without a separate broker service.
+
+An event's ID is ``<inode>-<offset>``: the log file and the byte offset just
+past its line.  A reconnecting EventSource sends the last ID it saw and gets
+the events after it replayed.  If the log was rotated (replaced by an empty
+file once it exceeds ``max_bytes``) in between, the stream sends ``reset``.
+
+Event types:
+
+* ``change``: one op changed one section or item, given in ``change``
+* ``reload``: the resume changed wholesale (undo, restore, another tool
+  rewrote the file, or the editor opened another one); clients refetch it
+* ``reset``: the client missed events; it refetches
+"""
+import asyncio
+import json
+import os
+import queue
+import socket
+import threading
+
+import metrics
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory locks, and no forked workers either
+    fcntl = None
+
+EVENTS_FILE = ".events.jsonl"
+MAX_LOG_BYTES = 1024 * 1024
+# Seconds between idle comment lines, so dead connections are noticed and proxies keep the stream open
+KEEPALIVE_SECONDS = 15
+# Milliseconds an EventSource waits before reconnecting
+RETRY_MILLISECONDS = 2000
+
+
+def origin():
+    """Identifies the publishing process; evaluated per call so forked workers differ"""
+    return f"{socket.gethostname()}/{os.getpid()}"
+
+
+def parse_event_id(event_id):
+    """(inode, offset) from an event ID, or None"""
+    try:
+        inode, offset = event_id.split("-")
+        return int(inode, 16), int(offset)
+    except (AttributeError, ValueError):
+        return None
+
+
+def format_message(event_id, event):
+    """One Server-Sent Events message; JSON never contains a raw newline"""
+    lines = [f"id: {event_id}"] if event_id else []
+    lines.append(f"event: {event['type']}")
+    payload = {key: value for key, value in event.items() if key != "origin"}
+    lines.append("data: " + json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+    return "\n".join(lines) + "\n\n"
+
+
+def read_lines(file, inode):
+    """(ID, event) for each complete line from the file position on; a partial last line is left unread"""
+    events = []
+    while True:
+        line = file.readline()
+        if not line:
+            break
+        if not line.endswith(b"\n"):
+            # Still being written; read it again on the next poll
+            file.seek(-len(line), os.SEEK_CUR)
+            break
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        events.append((f"{inode:x}-{file.tell()}", event))
+    return events
+
+
+class Subscription:
+    """One client's queue of events, optionally limited to one resume"""
+
+    def __init__(self, broker, resume=None, size=256):
+        self.broker = broker
+        # A file name, "" for the unsaved resume, a callable returning either, or None for all
+        self.resume = resume
+        self.queue = queue.Queue(size)
+        self.overflowed = False
+        self.last = None
+
+    def wants(self, event):
+        if self.resume is None:
+            return True
+        resume = self.resume() if callable(self.resume) else self.resume
+        return (event.get("resume") or "") == (resume or "")
+
+    def __call__(self, event_id, event):
+        if not self.wants(event):
+            return
+        try:
+            self.queue.put_nowait((event_id, event))
+        except queue.Full:
+            # A stalled client; it gets a reset instead of an unbounded backlog
+            self.overflowed = True
+
+    def fresh(self, event_id):
+        """False for an event already sent by the replay"""
+        position = parse_event_id(event_id)
+        if position is None or self.last is None or position[0] != self.last[0]:
+            return True
+        return position[1] > self.last[1]
+
+    def replayed(self, last_event_id):
+        """Messages for the events after last_event_id, or a reset when the log no longer has them"""
+        replay = self.broker.since(last_event_id)
+        messages = [format_message(None, {"type": "reset"})] if replay is None else []
+        for event_id, event in replay or []:
+            if self.wants(event):
+                messages.append(format_message(event_id, event))
+            self.last = parse_event_id(event_id)
+        return messages
+
+    def overflow_reset(self):
+        """A reset message, with the queue emptied, if events were dropped for this client; else None"""
+        if not self.overflowed:
+            return None
+        self.overflowed = False
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        return format_message(None, {"type": "reset"})
+
+    def messages(self, last_event_id=None, keepalive=KEEPALIVE_SECONDS):
+        """Server-Sent Events text for this subscription; runs until the generator is closed"""
+        self.broker.subscribe(self)
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+            if last_event_id:
+                yield from self.replayed(last_event_id)
+            while True:
+                reset = self.overflow_reset()
+                if reset:
+                    yield reset
+                try:
+                    event_id, event = self.queue.get(timeout=keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if self.fresh(event_id):
+                    yield format_message(event_id, event)
+        finally:
+            self.close()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class AsyncSubscription(Subscription):
+    """A Subscription streamed from an asyncio event loop, which waits on it without holding a thread"""
+
+    def __init__(self, broker, resume=None, size=256):
+        super().__init__(broker, resume, size)
+        self.loop = None
+        self.ready = None
+
+    def __call__(self, event_id, event):
+        super().__call__(event_id, event)
+        try:
+            self.loop.call_soon_threadsafe(self.ready.set)
+        except RuntimeError:
+            # The loop has closed; the stream is going away
+            pass
+
+    async def stream(self, last_event_id=None, keepalive=KEEPALIVE_SECONDS):
+        """messages() as an async generator"""
+        self.loop = asyncio.get_running_loop()
+        self.ready = asyncio.Event()
+        self.broker.subscribe(self)
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+            if last_event_id:
+                # Reads the log file, so off the loop
+                for message in await self.loop.run_in_executor(None, self.replayed, last_event_id):
+                    yield message
+            while True:
+                reset = self.overflow_reset()
+                if reset:
+                    yield reset
+                try:
+                    event_id, event = self.queue.get_nowait()
+                except queue.Empty:
+                    # A set() scheduled by the broker thread after this clear() still wakes the wait below
+                    self.ready.clear()
+                    try:
+                        await asyncio.wait_for(self.ready.wait(), keepalive)
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+                    continue
+                if self.fresh(event_id):
+                    yield format_message(event_id, event)
+        finally:
+            self.close()
+
+
+class EventBroker:
+    """Publishes events to the shared log and tails it for this process's subscribers"""
+
+    def __init__(self, directory, interval=0.2, max_bytes=MAX_LOG_BYTES):
+        self.directory = directory
+        self.path = os.path.join(directory, EVENTS_FILE)
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.reader = None
+        self.reader_inode = None
+        self.woken = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def subscribe(self, callback):
+        """Call callback(event_id, event) from the broker thread for every event"""
+        with self.lock:
+            self.subscribers.append(callback)
+        if isinstance(callback, Subscription):
+            metrics.EVENT_STREAMS.inc()
+        return callback
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            if callback not in self.subscribers:
+                return
+            self.subscribers.remove(callback)
+        if isinstance(callback, Subscription):
+            metrics.EVENT_STREAMS.dec()
+
+    # Writing
+
+    def open_log(self):
+        """The log opened for appending and locked against other processes"""
+        while True:
+            file = open(self.path, "ab")
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                if os.fstat(file.fileno()).st_ino == os.stat(self.path).st_ino:
+                    return file
+            except FileNotFoundError:
+                pass
+            # Another process rotated the log between open and lock
+            file.close()
+
+    def rotate(self):
+        """Replace the log with an empty file; tailers finish the old one first"""
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        open(temporary, "wb").close()
+        os.replace(temporary, self.path)
+
+    def publish(self, event):
+        """Append an event to the shared log and return its ID"""
+        event = dict(event, origin=origin())
+        line = (json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with self.write_lock:
+            file = self.open_log()
+            try:
+                size = file.seek(0, os.SEEK_END)
+                if size and size + len(line) > self.max_bytes:
+                    self.rotate()
+                    file.close()
+                    file = self.open_log()
+                file.write(line)
+                file.flush()
+                event_id = f"{os.fstat(file.fileno()).st_ino:x}-{file.tell()}"
+            finally:
+                # Closing releases the lock
+                file.close()
+        metrics.EVENTS_PUBLISHED.inc(type=event["type"])
+        self.woken.set()
+        return event_id
+
+    def announce(self, event):
+        """Deliver an event to this process's subscribers only, without logging it"""
+        self.deliver(None, dict(event, origin=origin()))
+
+    # Reading
+
+    def since(self, last_event_id):
+        """Events logged after last_event_id, or None when they are no longer in the log"""
+        position = parse_event_id(last_event_id)
+        if position is None:
+            return None
+        inode, offset = position
+        try:
+            with open(self.path, "rb") as file:
+                stat = os.fstat(file.fileno())
+                if stat.st_ino != inode or offset > stat.st_size:
+                    return None
+                file.seek(offset)
+                return read_lines(file, inode)
+        except FileNotFoundError:
+            return None
+
+    def follow(self, from_start):
+        """Start tailing the current log file, at its start or its end"""
+        if self.reader is not None:
+            self.reader.close()
+        open(self.path, "ab").close()
+        self.reader = open(self.path, "rb")
+        self.reader_inode = os.fstat(self.reader.fileno()).st_ino
+        if not from_start:
+            self.reader.seek(0, os.SEEK_END)
+
+    def poll(self):
+        """Deliver the events appended since the last poll"""
+        events = read_lines(self.reader, self.reader_inode)
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            inode = None
+        if inode != self.reader_inode:
+            # Rotated: the old file is finished, follow the new one from its start
+            self.follow(from_start=True)
+            events.extend(read_lines(self.reader, self.reader_inode))
+        for event_id, event in events:
+            self.deliver(event_id, event)
+
+    def deliver(self, event_id, event):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for callback in subscribers:
+            try:
+                callback(event_id, event)
+            except Exception as e:
+                print(f"Event subscriber error for {event.get('type')}: {e}")
+
+    def start(self):
+        if self.running:
+            return self
+        os.makedirs(self.directory, exist_ok=True)
+        self.follow(from_start=False)
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name="resume-events", daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self):
+        while not self.stopped.is_set():
+            # publish() wakes the thread so this process's own events go out at once
+            self.woken.wait(self.interval)
+            self.woken.clear()
+            try:
+                self.poll()
+            except OSError as e:
+                print(f"Event broker error: {e}")
+
+    def stop(self):
+        self.stopped.set()
+        self.woken.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
@@ -0,0 +1,128 @@
+"""Immutable layout IR shared by every exporter.
+
+``compile_resume`` turns a ``resume_model.Resume`` into a ``Layout``:
+sections made of blocks made of runs.  All of the normalization that used
+to be repeated by each exporter happens here once: fields are escaped,
+summaries are taken in their sanitized form, bullets come from the
+pre-split highlights and dates are formatted as "Month YYYY - Month YYYY".
+
+A ``Run`` holds the same text twice, as reportlab/HTML-safe ``markup`` and as
+plain ``text``, so markup emitters (PDF, HTML) and text emitters (plain text,
+Markdown) read whichever they need.  Everything is built from tuples and
+namedtuples, so a compiled layout can be cached per content version and
+shared between concurrent exports.
+
+Section keys are ``summary``, ``objective``, ``work``, ``education`` and
+``skills``.  Text block kinds are ``summary``, ``highlights``, ``gpa``,
+``courses`` and ``skills``; work and education items are ``entry`` blocks.
+
+A summary that is not blank in the JSON but sanitizes to nothing (an empty
+``<p></p>`` from the editor) still gets its block, with an empty run: the PDF
+and HTML exports have always emitted an empty paragraph for it, and the text
+exports skip it.
+"""
+from collections import namedtuple
+
+from resume_model import format_date
+from sanitize import escape
+
+Run = namedtuple("Run", ["markup", "text"])
+TextBlock = namedtuple("TextBlock", ["kind", "runs"])
+EntryBlock = namedtuple("EntryBlock", ["kind", "title", "subtitle", "dates", "current", "details"])
+Section = namedtuple("Section", ["key", "title", "blocks"])
+Layout = namedtuple("Layout", ["name", "label", "contacts", "sections"])
+
+EMPTY_RUN = Run("", "")
+
+
+def run(value):
+    """Run for a plain field such as a name or company"""
+    return Run(escape(value), value) if value else EMPTY_RUN
+
+
+def rich_run(markup, text):
+    """Run for a sanitized HTML field"""
+    return Run(markup, text) if markup else EMPTY_RUN
+
+
+def date_range(start_date, end_date):
+    """Return "Start - End" with "Present" for an open end, or "" without a start"""
+    start = format_date(start_date)
+    if not start:
+        return ""
+    end = format_date(end_date) if end_date else "Present"
+    return f"{start} - {end}"
+
+
+def work_entry(work):
+    details = []
+    if work.summary.strip() and not work.bulleted:
+        details.append(TextBlock("summary", (rich_run(work.summary_markup, work.summary_text),)))
+    if work.highlight_markup:
+        details.append(TextBlock("highlights", tuple(
+            Run(markup, text) for markup, text in zip(work.highlight_markup, work.highlights))))
+    return EntryBlock("entry", run(work.position), run(work.name),
+                      date_range(work.start_date, work.end_date), work.is_working_here, tuple(details))
+
+
+def education_entry(education):
+    degree = []
+    if education.study_type:
+        degree.append(education.study_type)
+    if education.area:
+        degree.append(f"in {education.area}")
+
+    details = []
+    if education.gpa:
+        details.append(TextBlock("gpa", (run(education.gpa),)))
+    if education.summary.strip():
+        details.append(TextBlock("summary", (rich_run(education.summary_markup, education.summary_text),)))
+    courses = [course.strip() for course in education.courses if course.strip()]
+    if courses:
+        details.append(TextBlock("courses", tuple(run(course) for course in courses)))
+    return EntryBlock("entry", run(education.institution), run(" ".join(degree)),
+                      date_range(education.start_date, education.end_date), education.is_studying_here,
+                      tuple(details))
+
+
+def cached_entry(build, item, memo):
+    """Build an entry block once per item object when memo is given"""
+    if memo is None:
+        return build(item)
+    cached = memo.get(id(item))
+    if cached is None:
+        cached = memo[id(item)] = (item, build(item))
+    return cached[1]
+
+
+def compile_resume(resume, memo=None):
+    """Compile a resume_model.Resume, in its current order, into a Layout
+
+    Resumes decoded with a shared resume_model memo can also share an IR memo,
+    so items they have in common are compiled once.
+    """
+    basics = resume.basics
+
+    contacts = tuple((kind, run(value)) for kind, value in
+                     (("email", basics.email), ("phone", basics.phone), ("city", basics.city)) if value)
+
+    sections = []
+    if basics.summary.strip():
+        sections.append(Section("summary", "Professional Summary", (
+            TextBlock("summary", (rich_run(basics.summary_markup, basics.summary_text),)),)))
+    if basics.objective.strip():
+        sections.append(Section("objective", "Career Objective", (
+            TextBlock("summary", (rich_run(basics.objective_markup, basics.objective_text),)),)))
+    if resume.work:
+        sections.append(Section("work", "Professional Experience",
+                                tuple(cached_entry(work_entry, work, memo) for work in resume.work)))
+    if resume.education:
+        sections.append(Section("education", "Education",
+                                tuple(cached_entry(education_entry, education, memo)
+                                      for education in resume.education)))
+    if resume.skills:
+        sections.append(Section("skills", "Technical Skills", (
+            TextBlock("skills", tuple(run(skill.name) for skill in resume.skills if skill.name)),)))
+
+    return Layout(run(basics.name), run(basics.label), contacts, tuple(sections))
+
@@ -0,0 +1,367 @@
+"""Append-only change journal with periodic snapshots, per resume file.
+
+Instead of rewriting the whole resume on every edit, each mutation appends
+one small JSON line to ``resumes/.journal/<filename>/ops.jsonl``:
+
+    {"seq": 12, "ts": "2025-09-10T05:30:02", "op": "add_skill", "args": ["Rust"], "revision": 31}
+
+``seq`` 0 is the state the journal started from and is always stored as a
+snapshot (after pruning, the first record kept is).  Every so often the app compacts: it rewrites the resume file and
+stores a snapshot of that state under ``snapshots/<seq>.json``.
+``journal.json`` records which ``seq`` the resume file reflects (and the
+file's (mtime_ns, size)), so loading can replay only the tail of the log.
+If the file changed behind the journal's back, it is imported as a new
+version instead.
+
+Compaction also prunes: records more than ``history_limit`` behind the
+version in the resume file are dropped, with their snapshots.  The oldest
+record kept must have a snapshot (it becomes a ``snapshot`` record) and no
+kept ``restore`` may point before it, so a little more history may survive.
+Seqs are not renumbered; the log simply starts later.
+
+Undo, redo and point-in-time restore are ``restore`` records whose state is
+that of an earlier ``seq``.  They are journaled like any other edit, so
+history is never rewritten and an undo can itself be undone.
+
+``revision`` is the resume's ``meta.revision`` after the record (see
+``resume_model.revision``).  Records are appended under a file lock, and
+``append`` can refuse to add one unless the journal is still at the revision
+the caller last saw, so two processes cannot both build on the same version.
+
+State after a record:
+
+* ``snapshot`` / ``import``: the stored snapshot
+* ``restore``: the state after record ``args[0]``
+* any other op: the previous record's state with the op replayed on it
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+import resume_model
+import resume_storage
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory locks, and no forked workers either
+    fcntl = None
+
+JOURNAL_DIRECTORY = ".journal"
+OPS_FILE = "ops.jsonl"
+STATE_FILE = "journal.json"
+SNAPSHOT_DIRECTORY = "snapshots"
+RESTORE_OP = "restore"
+SNAPSHOT_OPS = ("snapshot", "import")
+# Records kept behind the version in the resume file when compacting
+HISTORY_LIMIT = 1000
+
+
+class JournalError(ValueError):
+    """Raised for an unknown version or a journal that cannot be replayed"""
+
+
+class ResumeJournal:
+    def __init__(self, resumes_directory, filename, history_limit=HISTORY_LIMIT):
+        self.directory = resumes_directory
+        self.filename = filename
+        # None keeps every record
+        self.history_limit = history_limit
+        self.lock = threading.Lock()
+        self.path = os.path.join(resumes_directory, JOURNAL_DIRECTORY, filename)
+        self.ops_path = os.path.join(self.path, OPS_FILE)
+        self.state_path = os.path.join(self.path, STATE_FILE)
+        self.snapshot_path = os.path.join(self.path, SNAPSHOT_DIRECTORY)
+        self.records = None
+        # Bytes and inode of ops.jsonl that records reflects; another writer changes them
+        self.size = 0
+        self.inode = None
+        self.state = None
+        # Positions undone in this process, most recent last
+        self.redo_stack = []
+
+    def exists(self):
+        return os.path.exists(self.ops_path)
+
+    # Reading
+
+    def load(self):
+        """Read the log once; a torn final line from a crash is ignored"""
+        if self.records is None:
+            self.records = []
+            self.size = 0
+            self.inode = None
+            if self.exists():
+                with open(self.ops_path, "rb") as file:
+                    self.inode = os.fstat(file.fileno()).st_ino
+                    for line in file:
+                        if not line.endswith(b"\n"):
+                            # Cut off mid-write: even if it parses, the next append would run into it
+                            break
+                        try:
+                            self.records.append(json.loads(line))
+                        except ValueError:
+                            break
+                        self.size += len(line)
+        return self.records
+
+    def refresh(self):
+        """Drop cached records if another process appended to or pruned the log, and the state (it may have compacted)"""
+        try:
+            stat = os.stat(self.ops_path)
+            identity = (stat.st_size, stat.st_ino)
+        except OSError:
+            identity = (0, None)
+        if self.records is not None and identity != (self.size, self.inode):
+            self.records = None
+        self.state = None
+
+    @property
+    def first_seq(self):
+        records = self.load()
+        return records[0]["seq"] if records else 0
+
+    @property
+    def last_seq(self):
+        records = self.load()
+        return records[-1]["seq"] if records else -1
+
+    @property
+    def revision(self):
+        """The resume's revision after the last record (0 for journals older than revisions)"""
+        records = self.load()
+        return records[-1].get("revision", 0) if records else 0
+
+    def record(self, seq):
+        records = self.load()
+        index = seq - self.first_seq
+        if not 0 <= index < len(records) or records[index]["seq"] != seq:
+            raise JournalError(f"Unknown version {seq} for {self.filename}")
+        return records[index]
+
+    def read_state(self):
+        if self.state is None:
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as file:
+                    self.state = json.load(file)
+            except (OSError, ValueError):
+                return None
+        return self.state
+
+    def read_snapshot(self, seq):
+        """The stored state after record seq, or None if it is missing or unreadable"""
+        try:
+            with open(os.path.join(self.snapshot_path, f"{seq:08d}.json"), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def snapshot_seqs(self):
+        try:
+            names = os.listdir(self.snapshot_path)
+        except OSError:
+            return []
+        return sorted(int(name[:-len(".json")]) for name in names
+                      if name.endswith(".json") and name[:-len(".json")].isdigit())
+
+    def state_at(self, seq, replay):
+        """Rebuild the resume data after record seq; replay(data, op, args) applies one op"""
+        pending = []
+        while True:
+            record = self.record(seq)
+            snapshot = self.read_snapshot(seq)
+            if snapshot is not None:
+                data = snapshot
+                break
+            if record["op"] == RESTORE_OP:
+                data = self.state_at(record["args"][0], replay)
+                break
+            if record["op"] in SNAPSHOT_OPS:
+                raise JournalError(f"Snapshot {seq} of {self.filename} is missing or unreadable")
+            pending.append(record)
+            seq -= 1
+        for record in reversed(pending):
+            data = replay(data, record["op"], record["args"])
+        return data
+
+    def position(self, seq):
+        """The version a record's state corresponds to, following restores"""
+        record = self.record(seq)
+        while record["op"] == RESTORE_OP:
+            record = self.record(record["args"][0])
+        return record["seq"]
+
+    def undo_target(self):
+        """The version an undo returns to, or None at the start of history"""
+        if self.last_seq < 0:
+            return None
+        position = self.position(self.last_seq)
+        return position - 1 if position > self.first_seq else None
+
+    def seq_at(self, timestamp):
+        """The last version recorded at or before an ISO timestamp"""
+        match = None
+        for record in self.load():
+            if record["ts"] <= timestamp:
+                match = record["seq"]
+            else:
+                break
+        if match is None:
+            raise JournalError(f"{self.filename} has no history before {timestamp}")
+        return match
+
+    def history(self):
+        """Records for display, oldest first, with the version each one leaves the resume at"""
+        return [{"seq": record["seq"], "ts": record["ts"], "op": record["op"], "position": self.position(record["seq"])}
+                for record in self.load()]
+
+    # Writing
+
+    def open_log(self):
+        """ops.jsonl opened for appending and locked against other processes"""
+        while True:
+            file = open(self.ops_path, "ab")
+            if fcntl is None:
+                return file
+            # Worker processes append to the same journal
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                if os.fstat(file.fileno()).st_ino == os.stat(self.ops_path).st_ino:
+                    return file
+            except FileNotFoundError:
+                pass
+            # Another process pruned the log between open and lock
+            file.close()
+
+    def append(self, op, args, revision=None, expected_revision=None):
+        """Add a record at the next revision (or the one given)
+        
+        With expected_revision, raises resume_model.RevisionConflict unless the journal is still at it.
+        """
+        with self.lock, self.open_log() as file:
+            self.refresh()
+            records = self.load()
+            torn = file.seek(0, os.SEEK_END) - self.size
+            if torn > 0:
+                # Drop the torn tail left by a crash, so this record starts on a line of its own
+                print(f"Journal {self.filename}: discarding {torn} bytes of an incomplete record")
+                file.truncate(self.size)
+            if expected_revision is not None and expected_revision != self.revision:
+                raise resume_model.RevisionConflict(self.revision)
+            record = {"seq": records[-1]["seq"] + 1 if records else 0, "ts": datetime.now().isoformat(timespec="seconds"), "op": op,
+                      "args": list(args), "revision": self.revision + 1 if revision is None else revision}
+            line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+            file.write(line)
+            file.flush()
+            records.append(record)
+            self.size += len(line)
+        if op != RESTORE_OP:
+            self.redo_stack.clear()
+        return record
+
+    def write_snapshot(self, seq, data):
+        os.makedirs(self.snapshot_path, exist_ok=True)
+        resume_storage.atomic_write(os.path.join(self.snapshot_path, f"{seq:08d}.json"),
+                                    json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    def start(self, data, file_signature):
+        """Create the journal with data as version 0, matching the resume file on disk"""
+        os.makedirs(self.path, exist_ok=True)
+        self.records = []
+        self.size = 0
+        self.state = None
+        self.redo_stack = []
+        open(self.ops_path, "w", encoding="utf-8").close()
+        self.inode = os.stat(self.ops_path).st_ino
+        self.write_snapshot(0, data)
+        self.append("snapshot", [], revision=resume_model.revision(data))
+        self.mark_file(0, file_signature)
+
+    def import_state(self, data, file_signature):
+        """Record a resume file that was changed outside the journal as a new version
+        
+        data's revision is raised past the journal's if the other tool did not bump it.
+        """
+        seq = self.last_seq + 1
+        revision = max(resume_model.revision(data), self.revision + 1)
+        resume_model.set_revision(data, revision)
+        self.write_snapshot(seq, data)
+        self.append("import", [], revision=revision)
+        self.mark_file(seq, file_signature)
+        return seq
+
+    def mark_file(self, seq, file_signature):
+        """Record that the resume file now holds version seq"""
+        self.state = {"file_seq": seq, "file_signature": list(file_signature) if file_signature else None,
+                      "compacted_at": time.time()}
+        resume_storage.atomic_write(self.state_path, json.dumps(self.state).encode("utf-8"))
+
+    def compact(self, data, file_signature):
+        """Snapshot the latest version after the resume file was rewritten with it, then prune"""
+        self.write_snapshot(self.last_seq, data)
+        self.mark_file(self.last_seq, file_signature)
+        if self.history_limit is not None and self.last_seq - self.history_limit > self.first_seq:
+            self.prune()
+
+    def prune_base(self, records, cutoff):
+        """The oldest seq to keep when dropping records before cutoff, or None to keep them all"""
+        first = records[0]["seq"]
+        snapshots = self.snapshot_seqs()
+        base = next((seq for seq in snapshots if seq >= cutoff), None)
+        while base is not None and base > first:
+            # A restore kept in the log needs the record it returns to
+            target = min((record["args"][0] for record in records[base - first:] if record["op"] == RESTORE_OP),
+                         default=base)
+            if target >= base:
+                return base if self.read_snapshot(base) is not None else None
+            base = max((seq for seq in snapshots if seq <= target), default=None)
+        return None
+
+    def prune(self):
+        """Drop records and snapshots more than history_limit records behind the resume file's version"""
+        with self.lock, self.open_log():
+            self.refresh()
+            records = self.load()
+            if not records:
+                return 0
+            base = self.prune_base(records, (self.read_state() or {}).get("file_seq", 0) - self.history_limit)
+            if base is None:
+                return 0
+            kept = records[base - records[0]["seq"]:]
+            # Its state is the snapshot now that the records before it are gone
+            kept[0] = dict(kept[0], op="snapshot", args=[])
+            payload = b"".join((json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+                               for record in kept)
+            resume_storage.atomic_write(self.ops_path, payload)
+            for seq in self.snapshot_seqs():
+                if seq < base:
+                    try:
+                        os.remove(os.path.join(self.snapshot_path, f"{seq:08d}.json"))
+                    except OSError:
+                        pass
+            self.records = kept
+            self.size = len(payload)
+            self.inode = os.stat(self.ops_path).st_ino
+            self.redo_stack = [seq for seq in self.redo_stack if seq >= base]
+            return len(records) - len(kept)
+
+    def pending(self):
+        """(ops not yet in the resume file, seconds since the last compaction)"""
+        state = self.read_state() or {}
+        return self.last_seq - state.get("file_seq", 0), time.time() - state.get("compacted_at", 0)
+
+    def idle(self):
+        """Seconds since the last record was appended"""
+        try:
+            return time.time() - os.path.getmtime(self.ops_path)
+        except OSError:
+            return 0.0
+
+    def delete(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.records = None
+        self.state = None
+        self.redo_stack = []
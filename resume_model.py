@@ -0,0 +1,420 @@
+"""Typed resume model.
+
+``resume_data`` stays a plain dict because that is the JSON schema the API,
+the front end and the files on disk use.  Renderers and sort helpers work on
+this decoded view instead: every item is a ``__slots__`` object with plain
+attribute reads instead of ``.get`` chains.
+
+The view does not make the app smaller or its loads faster.  ``ResumeWebApp``
+keeps it next to the dict (decoded once per edit), so the open resume is held
+twice, and loading decodes and re-encodes the file.  What it buys is one
+place that checks the schema (a bad file fails to load, with the path of the
+bad value, instead of failing mid-render), and sanitized markup and parsed
+dates worked out once per edit and shared by every export, sort and query.
+
+``Resume.from_dict`` validates while decoding and raises
+``ResumeValidationError`` with the path of the offending value.
+``Resume.to_dict`` emits the canonical schema written by ``ResumeWebApp``.
+Keys the model does not know about (``image``, ``awards``, ``volunteer`` and
+so on) are kept in ``extra`` and written back unchanged.
+
+Summaries are run through ``sanitize.sanitize_html`` while decoding, so each
+item carries its reportlab-safe markup and plain text alongside the stored
+HTML and renderers never clean a field themselves.  A work summary written as
+a bullet list is the source of its ``highlights``: decoding re-splits it, so
+stale highlights in older files are replaced and ``bulleted`` tells renderers
+to show the highlights instead of the summary paragraph.
+
+Every persisted edit bumps ``meta.revision``, a counter stored in the resume
+itself (``revision`` / ``set_revision``).  Writers that name the revision
+they started from get ``RevisionConflict`` instead of overwriting a newer one.
+
+Dates are parsed once into compact ``(year, month, day)`` tuples.  Parsing
+and the "Month YYYY" labels are memoized per distinct string, so sorting,
+rendering and date-range queries all share the same work.
+"""
+from datetime import date, datetime
+from functools import lru_cache
+
+from sanitize import escape, sanitize_html, split_bullets
+
+CURRENT_SORT_DATE = (9999, 12, 31)
+MISSING_SORT_DATE = (1900, 1, 1)
+
+
+class ResumeValidationError(ValueError):
+    """Raised when resume JSON does not match the expected schema"""
+
+    def __init__(self, path, message):
+        super().__init__(f"{path}: {message}")
+        self.path = path
+
+
+class RevisionConflict(ValueError):
+    """Raised when a write was based on an older revision of the resume than the current one"""
+
+    def __init__(self, current):
+        super().__init__(f"the resume is at revision {current}")
+        self.current = current
+
+
+def expect_dict(value, path):
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise ResumeValidationError(path, f"expected an object, got {type(value).__name__}")
+    return value
+
+
+def expect_list(value, path):
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ResumeValidationError(path, f"expected a list, got {type(value).__name__}")
+    return value
+
+
+def text(value, path):
+    """Decode a string field; None becomes "" and numbers are stringified"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise ResumeValidationError(path, f"expected a string, got {type(value).__name__}")
+
+
+def optional_text(value, path):
+    """Decode a string field that may legitimately be null, such as endDate"""
+    if value is None:
+        return None
+    return text(value, path)
+
+
+TRUE_STRINGS = frozenset(("true", "1", "yes", "on"))
+FALSE_STRINGS = frozenset(("false", "0", "no", "off", ""))
+
+
+def flag(value, path):
+    """Decode a boolean field; 0/1 and strings such as "false" or "yes" are accepted"""
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return bool(value)
+    if isinstance(value, str):
+        # bool("false") is True, so strings are read by their meaning
+        normalized = value.strip().lower()
+        if normalized in TRUE_STRINGS:
+            return True
+        if normalized in FALSE_STRINGS:
+            return False
+        raise ResumeValidationError(path, f"expected a boolean, got {value!r}")
+    raise ResumeValidationError(path, f"expected a boolean, got {type(value).__name__}")
+
+
+def extra_keys(data, known):
+    return {key: value for key, value in data.items() if key not in known}
+
+
+def revision(data):
+    """The resume's edit counter from meta.revision; 0 for files that never had one"""
+    meta = data.get("meta")
+    value = meta.get("revision") if isinstance(meta, dict) else None
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+def set_revision(data, value):
+    meta = data.get("meta")
+    if not isinstance(meta, dict):
+        meta = data["meta"] = {}
+    meta["revision"] = value
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value):
+    """Parse an ISO date string such as 2023-05-01T04:00:00.000Z into (year, month, day)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    return (parsed.year, parsed.month, parsed.day)
+
+
+@lru_cache(maxsize=1024)
+def month_year(year, month):
+    return date(year, month, 1).strftime("%B %Y")
+
+
+@lru_cache(maxsize=4096)
+def format_date(value):
+    """Format an ISO date string as "Month YYYY", falling back to its first ten characters"""
+    if not value:
+        return ""
+    parsed = parse_date(value)
+    if parsed is None:
+        return value[:10] if len(value) >= 10 else value
+    return month_year(parsed[0], parsed[1])
+
+
+def sort_date(is_current, start):
+    """Sort key shared by work and education: current first, then newest start date
+
+    start is either a parsed (year, month, day) tuple or a raw ISO string.
+    """
+    if is_current:
+        return CURRENT_SORT_DATE
+    if isinstance(start, str):
+        start = parse_date(start)
+    return start or MISSING_SORT_DATE
+
+
+def overlaps(start, end, is_current, range_start, range_end):
+    """True when an item running from start to end (or ongoing) overlaps the range
+
+    All dates are (year, month, day) tuples; a None range bound is open.
+    """
+    if start is None:
+        return False
+    if range_end is not None and start > range_end:
+        return False
+    if range_start is not None and not is_current and end is not None and end < range_start:
+        return False
+    return True
+
+
+class Basics:
+    __slots__ = ("name", "label", "email", "phone", "summary", "objective",
+                 "summary_markup", "summary_text", "objective_markup", "objective_text",
+                 "city", "location_extra", "profiles", "extra")
+
+    KEYS = frozenset(("name", "label", "email", "phone", "summary", "objective", "location", "profiles"))
+
+    @classmethod
+    def from_dict(cls, data, path="basics"):
+        data = expect_dict(data, path)
+        basics = cls.__new__(cls)
+        basics.name = text(data.get("name"), f"{path}.name")
+        basics.label = text(data.get("label"), f"{path}.label")
+        basics.email = text(data.get("email"), f"{path}.email")
+        basics.phone = text(data.get("phone"), f"{path}.phone")
+        basics.summary = text(data.get("summary"), f"{path}.summary")
+        basics.objective = text(data.get("objective"), f"{path}.objective")
+        basics.summary_markup, basics.summary_text = sanitize_html(basics.summary)
+        basics.objective_markup, basics.objective_text = sanitize_html(basics.objective)
+        location = expect_dict(data.get("location"), f"{path}.location")
+        basics.city = text(location.get("city"), f"{path}.location.city")
+        basics.location_extra = extra_keys(location, ("city",))
+        basics.profiles = expect_list(data.get("profiles"), f"{path}.profiles")
+        basics.extra = extra_keys(data, cls.KEYS)
+        return basics
+
+    def to_dict(self):
+        location = {"city": self.city}
+        location.update(self.location_extra)
+        data = {
+            "name": self.name,
+            "label": self.label,
+            "email": self.email,
+            "phone": self.phone,
+            "summary": self.summary,
+            "objective": self.objective,
+            "location": location,
+            "profiles": self.profiles,
+        }
+        data.update(self.extra)
+        return data
+
+
+class WorkItem:
+    __slots__ = ("id", "name", "position", "start_date", "end_date", "start", "end",
+                 "is_working_here", "summary", "summary_markup", "summary_text", "bulleted",
+                 "highlights", "highlight_markup", "url", "years", "extra")
+
+    KEYS = frozenset(("id", "name", "position", "startDate", "endDate", "isWorkingHere",
+                      "summary", "highlights", "url", "years"))
+
+    @classmethod
+    def from_dict(cls, data, path="work[]"):
+        data = expect_dict(data, path)
+        item = cls.__new__(cls)
+        item.id = text(data.get("id"), f"{path}.id")
+        item.name = text(data.get("name"), f"{path}.name")
+        item.position = text(data.get("position"), f"{path}.position")
+        item.start_date = text(data.get("startDate"), f"{path}.startDate")
+        item.end_date = optional_text(data.get("endDate"), f"{path}.endDate")
+        item.start = parse_date(item.start_date)
+        item.end = parse_date(item.end_date)
+        item.is_working_here = flag(data.get("isWorkingHere"), f"{path}.isWorkingHere")
+        item.summary = text(data.get("summary"), f"{path}.summary")
+        item.summary_markup, item.summary_text = sanitize_html(item.summary)
+        item.highlights = [text(highlight, f"{path}.highlights[{i}]")
+                           for i, highlight in enumerate(expect_list(data.get("highlights"), f"{path}.highlights"))]
+        bullets = split_bullets(item.summary)
+        item.bulleted = bool(bullets)
+        if bullets:
+            item.highlights = list(bullets)
+        item.highlight_markup = tuple(escape(highlight) for highlight in item.highlights)
+        item.url = text(data.get("url"), f"{path}.url")
+        item.years = text(data.get("years"), f"{path}.years")
+        item.extra = extra_keys(data, cls.KEYS)
+        return item
+
+    def to_dict(self):
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "position": self.position,
+            "startDate": self.start_date,
+            "endDate": self.end_date,
+            "isWorkingHere": self.is_working_here,
+            "summary": self.summary,
+            "highlights": list(self.highlights),
+            "url": self.url,
+            "years": self.years,
+        }
+        data.update(self.extra)
+        return data
+
+    def sort_key(self):
+        return sort_date(self.is_working_here, self.start)
+
+    def overlaps(self, range_start, range_end):
+        return overlaps(self.start, self.end, self.is_working_here, range_start, range_end)
+
+
+class EducationItem:
+    __slots__ = ("id", "institution", "area", "study_type", "start_date", "end_date", "start", "end",
+                 "is_studying_here", "gpa", "courses", "summary", "summary_markup", "summary_text",
+                 "url", "extra")
+
+    KEYS = frozenset(("id", "institution", "area", "studyType", "startDate", "endDate",
+                      "isStudyingHere", "gpa", "courses", "summary", "url"))
+
+    @classmethod
+    def from_dict(cls, data, path="education[]"):
+        data = expect_dict(data, path)
+        item = cls.__new__(cls)
+        item.id = text(data.get("id"), f"{path}.id")
+        item.institution = text(data.get("institution"), f"{path}.institution")
+        item.area = text(data.get("area"), f"{path}.area")
+        item.study_type = text(data.get("studyType"), f"{path}.studyType")
+        item.start_date = text(data.get("startDate"), f"{path}.startDate")
+        item.end_date = optional_text(data.get("endDate"), f"{path}.endDate")
+        item.start = parse_date(item.start_date)
+        item.end = parse_date(item.end_date)
+        item.is_studying_here = flag(data.get("isStudyingHere"), f"{path}.isStudyingHere")
+        item.gpa = text(data.get("gpa"), f"{path}.gpa")
+        item.courses = [text(course, f"{path}.courses[{i}]")
+                        for i, course in enumerate(expect_list(data.get("courses"), f"{path}.courses"))]
+        item.summary = text(data.get("summary"), f"{path}.summary")
+        item.summary_markup, item.summary_text = sanitize_html(item.summary)
+        item.url = text(data.get("url"), f"{path}.url")
+        item.extra = extra_keys(data, cls.KEYS)
+        return item
+
+    def to_dict(self):
+        data = {
+            "id": self.id,
+            "institution": self.institution,
+            "area": self.area,
+            "studyType": self.study_type,
+            "startDate": self.start_date,
+            "endDate": self.end_date,
+            "isStudyingHere": self.is_studying_here,
+            "gpa": self.gpa,
+            "courses": list(self.courses),
+            "summary": self.summary,
+            "url": self.url,
+        }
+        data.update(self.extra)
+        return data
+
+    def sort_key(self):
+        return sort_date(self.is_studying_here, self.start)
+
+    def overlaps(self, range_start, range_end):
+        return overlaps(self.start, self.end, self.is_studying_here, range_start, range_end)
+
+
+class Skill:
+    __slots__ = ("name", "level", "extra")
+
+    KEYS = frozenset(("name", "level"))
+
+    @classmethod
+    def from_dict(cls, data, path="skills.technologies[]"):
+        data = expect_dict(data, path)
+        skill = cls.__new__(cls)
+        skill.name = text(data.get("name"), f"{path}.name")
+        level = data.get("level", 0)
+        if isinstance(level, bool) or not isinstance(level, (int, float, str)):
+            raise ResumeValidationError(f"{path}.level", f"expected a number, got {type(level).__name__}")
+        skill.level = level
+        skill.extra = extra_keys(data, cls.KEYS)
+        return skill
+
+    def to_dict(self):
+        data = {"name": self.name, "level": self.level}
+        data.update(self.extra)
+        return data
+
+
+def decode_item(item_class, data, path, memo):
+    """Decode one item dict, reusing the object already decoded from the same dict when memo is given"""
+    if memo is None:
+        return item_class.from_dict(data, path)
+    cached = memo.get(id(data))
+    if cached is None:
+        # The dict is kept alongside so its id() cannot be reused while memo lives
+        cached = memo[id(data)] = (data, item_class.from_dict(data, path))
+    return cached[1]
+
+
+class Resume:
+    __slots__ = ("basics", "work", "skills", "skill_groups", "education", "extra")
+
+    KEYS = frozenset(("basics", "work", "skills", "education"))
+
+    @classmethod
+    def from_dict(cls, data, memo=None):
+        """Decode a resume; pass the same memo dict to share items between resumes built from one base"""
+        data = expect_dict(data, "resume")
+        resume = cls.__new__(cls)
+        resume.basics = decode_item(Basics, data.get("basics"), "basics", memo)
+        resume.work = [decode_item(WorkItem, item, f"work[{i}]", memo)
+                       for i, item in enumerate(expect_list(data.get("work"), "work"))]
+        skills = expect_dict(data.get("skills"), "skills")
+        resume.skills = [Skill.from_dict(skill, f"skills.technologies[{i}]")
+                         for i, skill in enumerate(expect_list(skills.get("technologies"), "skills.technologies"))]
+        resume.skill_groups = extra_keys(skills, ("technologies",))
+        resume.education = [decode_item(EducationItem, item, f"education[{i}]", memo)
+                            for i, item in enumerate(expect_list(data.get("education"), "education"))]
+        resume.extra = extra_keys(data, cls.KEYS)
+        return resume
+
+    def to_dict(self):
+        skills = {"technologies": [skill.to_dict() for skill in self.skills]}
+        skills.update(self.skill_groups)
+        data = {
+            "basics": self.basics.to_dict(),
+            "work": [item.to_dict() for item in self.work],
+            "skills": skills,
+            "education": [item.to_dict() for item in self.education],
+        }
+        data.update(self.extra)
+        return data
+
+    def sort_sections(self):
+        """Order work and education like ResumeWebApp does: current first, then newest"""
+        self.work.sort(key=WorkItem.sort_key, reverse=True)
+        self.education.sort(key=EducationItem.sort_key, reverse=True)
+
+    def between(self, range_start=None, range_end=None):
+        """Return the work and education items overlapping the given (year, month, day) range"""
+        return ([item for item in self.work if item.overlaps(range_start, range_end)],
+                [item for item in self.education if item.overlaps(range_start, range_end)])
@@ -0,0 +1,357 @@
+"""On-disk layouts for resume files.
+
+``files`` (the default) writes each resume as one pretty-printed JSON document,
+to a temporary file that is then renamed over the old one.
+
+``cas`` (content-addressed) stores each top-level section and each work or
+education item once, as a compact JSON object named by the SHA-256 of its
+bytes under ``resumes/.objects/``.  The resume file itself becomes a small
+manifest listing those hashes:
+
+    {"$manifest": 1, "name": "Skylor Piersall",
+     "sections": {"basics": "9f2c...", "work": ["51ab...", "e03d..."], "skills": "77c1...", ...}}
+
+Timestamped copies of the same resume share every unchanged item, and a save
+only writes the objects that do not exist yet plus the manifest (an object it
+reuses gets its modification time refreshed).  Objects and manifests are
+written to a temporary file and renamed into place, so readers never see
+half-written data.
+
+Garbage collection deletes objects no manifest references.  It holds
+``.objects.lock`` exclusively while saves hold it shared, across worker
+processes, so it never runs between a save's objects and its manifest.
+Objects written or reused in the last ``GC_GRACE_SECONDS`` are left alone as
+well, for writers the lock does not cover (on Windows it is per process).
+
+``read_resume`` accepts both layouts, so loading does not depend on the
+configured mode.  Converting between them and cleaning up:
+
+    python resume_storage.py migrate resumes --to cas
+    python resume_storage.py migrate resumes --to files
+    python resume_storage.py stats resumes
+    python resume_storage.py gc resumes
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+
+import locks
+import resume_variants
+
+MANIFEST_KEY = "$manifest"
+MANIFEST_VERSION = 1
+OBJECTS_DIRECTORY = ".objects"
+# Saves hold it shared and garbage collection exclusively, across worker processes
+OBJECTS_LOCK = ".objects.lock"
+# Objects written or reused this recently are never collected: a save may not have written its manifest yet
+GC_GRACE_SECONDS = 600
+
+
+def encode(value):
+    """Compact JSON bytes; key order is kept so decoding gives back the same document"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def object_id(payload):
+    return hashlib.sha256(payload).hexdigest()
+
+
+def object_path(directory, identifier):
+    return os.path.join(directory, OBJECTS_DIRECTORY, identifier[:2], f"{identifier[2:]}.json")
+
+
+def objects_lock(directory, shared=False):
+    return locks.process_lock(os.path.join(directory, OBJECTS_LOCK), shared)
+
+
+def atomic_write(path, payload):
+    """Write bytes to a hidden temporary file next to path, then rename it into place"""
+    temporary = os.path.join(os.path.dirname(path),
+                             f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temporary, "wb") as file:
+            file.write(payload)
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, or None when it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def is_manifest(document):
+    return isinstance(document, dict) and MANIFEST_KEY in document
+
+
+def resume_name(document, default="Untitled Resume"):
+    """The person's name from any layout, without resolving objects or variant bases"""
+    if is_manifest(document) or resume_variants.is_variant(document):
+        return document.get("name", default)
+    return document.get("basics", {}).get("name", default)
+
+
+@lru_cache(maxsize=4096)
+def read_object(directory, identifier):
+    """Objects never change once written, so their text is cached by ID"""
+    with open(object_path(directory, identifier), "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def resolve(directory, manifest):
+    """Rebuild the resume document a manifest describes"""
+    data = {}
+    for key, reference in manifest["sections"].items():
+        if isinstance(reference, list):
+            data[key] = [json.loads(read_object(directory, identifier)) for identifier in reference]
+        else:
+            data[key] = json.loads(read_object(directory, reference))
+    return data
+
+
+def read_document(path):
+    """The raw JSON in a resume file: a resume or a manifest"""
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def read_resume(path):
+    """Load a resume file in any layout (plain, manifest or variant) as the plain resume dict"""
+    return resolve_document(path, read_document(path))
+
+
+def resolve_document(path, document):
+    """The plain resume dict for a document already read from path"""
+    if resume_variants.is_variant(document):
+        return resume_variants.resolve(os.path.dirname(path), os.path.basename(path))
+    if is_manifest(document):
+        return resolve(os.path.dirname(path), document)
+    return document
+
+
+class FileStorage:
+    """One pretty-printed JSON document per resume"""
+
+    name = "files"
+
+    def write(self, directory, filename, data):
+        """Write a resume; returns the bytes written"""
+        payload = json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+        atomic_write(os.path.join(directory, filename), payload)
+        return len(payload)
+
+
+class ContentAddressedStorage:
+    """Sections and items stored once by content hash; resume files are manifests"""
+
+    name = "cas"
+
+    def put(self, directory, value):
+        """Store one value; returns (object ID, bytes written)"""
+        payload = encode(value)
+        identifier = object_id(payload)
+        path = object_path(directory, identifier)
+        if os.path.exists(path):
+            try:
+                # Young again, so a collection running now leaves it alone
+                os.utime(path)
+                return identifier, 0
+            except FileNotFoundError:
+                # Collected in between; write it again
+                pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, payload)
+        return identifier, len(payload)
+
+    def write(self, directory, filename, data):
+        """Write new objects and the manifest; returns the bytes written"""
+        written = 0
+        sections = {}
+        # No collection runs between writing the objects and the manifest that references them
+        with objects_lock(directory, shared=True):
+            for key, value in data.items():
+                if isinstance(value, list):
+                    sections[key] = []
+                    for item in value:
+                        identifier, size = self.put(directory, item)
+                        sections[key].append(identifier)
+                        written += size
+                else:
+                    sections[key], size = self.put(directory, value)
+                    written += size
+
+            manifest = {MANIFEST_KEY: MANIFEST_VERSION}
+            basics = data.get("basics")
+            if isinstance(basics, dict) and "name" in basics:
+                manifest["name"] = basics["name"]
+            manifest["sections"] = sections
+            payload = json.dumps(manifest, indent=1, ensure_ascii=False).encode("utf-8")
+            atomic_write(os.path.join(directory, filename), payload)
+        return written + len(payload)
+
+
+STORAGES = {"files": FileStorage, "cas": ContentAddressedStorage}
+
+
+def get_storage(name):
+    if name not in STORAGES:
+        raise ValueError(f"Unknown storage '{name}', expected one of: {', '.join(STORAGES)}")
+    return STORAGES[name]()
+
+
+def resume_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".json") and not name.startswith("."))
+
+
+def migrate(directory, target):
+    """Rewrite every resume in directory in the target layout; returns (converted, bytes before, bytes after)"""
+    storage = get_storage(target)
+    converted = 0
+    before = disk_usage(directory)
+    for filename in resume_files(directory):
+        path = os.path.join(directory, filename)
+        try:
+            document = read_document(path)
+        except (OSError, ValueError) as e:
+            print(f"Skipping {filename}: {e}")
+            continue
+        if is_manifest(document) == (target == "cas") or resume_variants.is_variant(document):
+            # Variants only hold overrides and stay as they are
+            continue
+        data = resolve(directory, document) if is_manifest(document) else document
+        storage.write(directory, filename, data)
+        converted += 1
+    return converted, before, disk_usage(directory)
+
+
+def referenced_objects(directory):
+    referenced = set()
+    for filename in resume_files(directory):
+        try:
+            document = read_document(os.path.join(directory, filename))
+        except (OSError, ValueError):
+            continue
+        if not is_manifest(document):
+            continue
+        for reference in document["sections"].values():
+            referenced.update(reference if isinstance(reference, list) else [reference])
+    return referenced
+
+
+def stored_objects(directory):
+    """Yield (object ID, path) for every object in the store"""
+    root = os.path.join(directory, OBJECTS_DIRECTORY)
+    if not os.path.isdir(root):
+        return
+    for shard in sorted(os.listdir(root)):
+        for name in sorted(os.listdir(os.path.join(root, shard))):
+            if name.endswith(".json") and not name.startswith("."):
+                yield shard + name[:-len(".json")], os.path.join(root, shard, name)
+
+
+def collect_garbage(directory, grace=None):
+    """Delete objects no manifest references and not written or reused in the last grace seconds
+
+    Returns (objects removed, bytes freed).  grace defaults to GC_GRACE_SECONDS.
+    """
+    cutoff = time.time() - (GC_GRACE_SECONDS if grace is None else grace)
+    removed = freed = 0
+    with objects_lock(directory):
+        referenced = referenced_objects(directory)
+        for identifier, path in stored_objects(directory):
+            if identifier in referenced:
+                continue
+            try:
+                stat = os.stat(path)
+                if stat.st_mtime > cutoff:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            freed += stat.st_size
+            removed += 1
+            try:
+                # Drop the shard directory once its last object is gone
+                os.rmdir(os.path.dirname(path))
+            except OSError:
+                pass
+    return removed, freed
+
+
+def disk_usage(directory):
+    """Bytes used by resume files and stored objects"""
+    total = sum(os.path.getsize(os.path.join(directory, filename)) for filename in resume_files(directory))
+    return total + sum(os.path.getsize(path) for _, path in stored_objects(directory))
+
+
+def stats(directory):
+    manifests = plain = logical = 0
+    for filename in resume_files(directory):
+        path = os.path.join(directory, filename)
+        try:
+            document = read_document(path)
+        except (OSError, ValueError):
+            continue
+        if is_manifest(document):
+            manifests += 1
+            logical += len(json.dumps(resolve(directory, document), indent=4, ensure_ascii=False).encode("utf-8"))
+        else:
+            plain += 1
+            logical += os.path.getsize(path)
+    return {
+        "plain_files": plain,
+        "manifests": manifests,
+        "objects": sum(1 for _ in stored_objects(directory)),
+        "bytes_on_disk": disk_usage(directory),
+        "bytes_as_plain_files": logical,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert and inspect resume storage layouts")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = commands.add_parser("migrate", help="Rewrite every resume in a layout")
+    migrate_parser.add_argument("directory")
+    migrate_parser.add_argument("--to", choices=sorted(STORAGES), default="cas", help="Target layout (default: cas)")
+    migrate_parser.add_argument("--keep-objects", action="store_true", help="Do not delete unreferenced objects afterwards")
+    migrate_parser.add_argument("--grace", type=float, default=GC_GRACE_SECONDS,
+                                help=f"Keep objects written in the last this many seconds (default: {GC_GRACE_SECONDS})")
+    stats_parser = commands.add_parser("stats", help="Show disk usage")
+    stats_parser.add_argument("directory")
+    gc_parser = commands.add_parser("gc", help="Delete objects no manifest references")
+    gc_parser.add_argument("directory")
+    gc_parser.add_argument("--grace", type=float, default=GC_GRACE_SECONDS,
+                           help=f"Keep objects written in the last this many seconds (default: {GC_GRACE_SECONDS})")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        converted, before, after = migrate(args.directory, args.to)
+        if not args.keep_objects:
+            collect_garbage(args.directory, args.grace)
+            after = disk_usage(args.directory)
+        print(f"Converted {converted} resumes to '{args.to}': {before} -> {after} bytes")
+    elif args.command == "stats":
+        for key, value in stats(args.directory).items():
+            print(f"{key}: {value}")
+    else:
+        removed, freed = collect_garbage(args.directory, args.grace)
+        print(f"Removed {removed} unreferenced objects, freed {freed} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
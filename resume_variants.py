@@ -0,0 +1,390 @@
+"""Resume variants: a base resume plus a small set of overrides.
+
+A variant file lives in ``resumes/`` next to its base and stores only what
+differs from it:
+
+    {
+        "$variant": 1,
+        "base": "Skylor_Piersall_2025_09_10T05_30_02.json",
+        "name": "Skylor Piersall",
+        "overrides": {
+            "basics": {"label": "Fiber Technician"},
+            "skills": {"include": ["FTTH", "Fiber Splicing", "CCTV"]},
+            "work": {"exclude": ["3f9c..."], "items": {"a1b2...": {"position": "Lead Splicer"}},
+                     "add": [], "order": ["a1b2...", "77de..."]},
+            "education": {"exclude": ["0c4e..."]}
+        }
+    }
+
+Override keys:
+
+* ``basics``: fields that replace the base's basics fields
+* ``skills``: ``{"include": [names]}`` keeps only those base skills, in that
+  order; ``{"replace": {...}}`` replaces the whole skills object
+* ``work`` / ``education``: ``exclude`` drops base items by key, ``items``
+  changes fields of base items by key, ``add`` appends items of its own and
+  ``order`` pins the item order by key (instead of the usual newest-first
+  sort).  An item's key is its ``id``, or ``#<position in the base>`` for
+  older files whose items have no ID.
+* any other top-level key replaces the base's value
+
+Unchanged items are shared with the base rather than copied.  Resolved
+variants are cached and re-validated against the (mtime, size) of the variant
+file and every base it inherits from, so editing a base invalidates all of
+its variants.  ``render_family`` renders a base and all of its variants in
+one pass.  Items they share are decoded and laid out once.
+
+    python resume_variants.py export resumes/master.json --format pdf --format md --output exports
+"""
+import argparse
+import copy
+import importlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+
+import metrics
+import resume_ir
+import resume_model
+import resume_storage
+
+VARIANT_KEY = "$variant"
+VARIANT_VERSION = 1
+ITEM_SECTIONS = ("work", "education")
+
+_resolved = {}
+_resolved_lock = threading.Lock()
+
+
+class VariantError(ValueError):
+    """Raised for a missing base or an inheritance cycle"""
+
+
+def is_variant(document):
+    return isinstance(document, dict) and VARIANT_KEY in document
+
+
+def pinned_sections(document):
+    """Sections whose item order a variant fixes, so callers must not re-sort them"""
+    if not is_variant(document):
+        return frozenset()
+    overrides = document.get("overrides", {})
+    return frozenset(key for key in ITEM_SECTIONS if overrides.get(key, {}).get("order"))
+
+
+def sort_sections(resume, pinned=frozenset()):
+    """resume_model.Resume.sort_sections, leaving pinned sections in their order"""
+    if "work" not in pinned:
+        resume.work.sort(key=resume_model.WorkItem.sort_key, reverse=True)
+    if "education" not in pinned:
+        resume.education.sort(key=resume_model.EducationItem.sort_key, reverse=True)
+
+
+# Resolution
+
+def item_key(item, index):
+    """How overrides refer to a base item: its ID, or its position when it has none"""
+    return item.get("id") or f"#{index}"
+
+
+def apply_items(base_items, override):
+    excluded = set(override.get("exclude", ()))
+    changes = override.get("items", {})
+    keyed = []
+    for index, item in enumerate(base_items):
+        key = item_key(item, index)
+        if key in excluded:
+            continue
+        change = changes.get(key)
+        # Copy on write: only changed items get a new dict
+        keyed.append((key, {**item, **change} if change else item))
+    keyed.extend((item.get("id"), item) for item in override.get("add", ()))
+    order = override.get("order")
+    if order:
+        rank = {key: position for position, key in enumerate(order)}
+        keyed.sort(key=lambda pair: rank.get(pair[0], len(rank)))
+    return [item for _, item in keyed]
+
+
+def apply_overrides(base, overrides):
+    """The resume a variant describes, sharing unchanged parts with base"""
+    data = dict(base)
+    for key, override in overrides.items():
+        if key == "basics":
+            data["basics"] = {**base.get("basics", {}), **override}
+        elif key == "skills":
+            if "replace" in override:
+                data["skills"] = override["replace"]
+            else:
+                skills = base.get("skills", {})
+                by_name = {skill.get("name"): skill for skill in skills.get("technologies", [])}
+                data["skills"] = {**skills, "technologies": [by_name[name] for name in override.get("include", ())
+                                                             if name in by_name]}
+        elif key in ITEM_SECTIONS:
+            data[key] = apply_items(base.get(key, []), override)
+        else:
+            data[key] = override
+    return data
+
+
+def load(directory, filename, chain=()):
+    """Resolve a resume file of any layout; returns (data, ((filename, signature), ...)) without copying"""
+    if filename in chain:
+        raise VariantError(f"Variant inheritance cycle: {' -> '.join(chain + (filename,))}")
+    path = os.path.join(directory, filename)
+    try:
+        signature = resume_storage.file_signature(path)
+        document = resume_storage.read_document(path)
+    except FileNotFoundError:
+        raise VariantError(f"Resume '{filename}' not found") from None
+    if not is_variant(document):
+        data = resume_storage.resolve(directory, document) if resume_storage.is_manifest(document) else document
+        return data, ((filename, signature),)
+
+    key = (directory, filename)
+    with _resolved_lock:
+        cached = _resolved.get(key)
+    if cached is not None and all(resume_storage.file_signature(os.path.join(directory, name)) == sig
+                                  for name, sig in cached[1]):
+        metrics.CACHE.hit("variant")
+        return cached
+    metrics.CACHE.miss("variant")
+    base, base_signatures = load(directory, document["base"], chain + (filename,))
+    resolved = (apply_overrides(base, document.get("overrides", {})), ((filename, signature),) + base_signatures)
+    with _resolved_lock:
+        _resolved[key] = resolved
+    return resolved
+
+
+def bases(directory, filename):
+    """File names of the resumes filename inherits from, nearest first (none for a plain resume)"""
+    chain = [filename]
+    while True:
+        try:
+            document = resume_storage.read_document(os.path.join(directory, chain[-1]))
+        except (OSError, ValueError):
+            break
+        if not is_variant(document) or document["base"] in chain:
+            break
+        chain.append(document["base"])
+    return chain[1:]
+
+
+def resolve(directory, filename):
+    """A private copy of the resolved resume, safe for the caller to edit"""
+    return copy.deepcopy(load(directory, filename)[0])
+
+
+# Writing
+
+def diff_items(base_items, items, pinned):
+    base_by_key = {item_key(item, index): item for index, item in enumerate(base_items)}
+    unmatched = dict(base_by_key)
+    keys, changes, added = [], {}, []
+    for item in items:
+        key = item.get("id")
+        if not key:
+            # Items without an ID can only be the base's own, unchanged
+            key = next((candidate for candidate, base_item in unmatched.items()
+                        if candidate.startswith("#") and base_item == item), None)
+        if key is None or key not in unmatched:
+            added.append(item)
+            keys.append(item.get("id"))
+            continue
+        base_item = unmatched.pop(key)
+        keys.append(key)
+        change = {field: value for field, value in item.items() if base_item.get(field) != value}
+        if change:
+            changes[key] = change
+
+    override = {}
+    if unmatched:
+        override["exclude"] = list(unmatched)
+    if changes:
+        override["items"] = changes
+    if added:
+        override["add"] = added
+    if pinned:
+        override["order"] = keys
+    return override
+
+
+def diff(base, data, pinned=frozenset()):
+    """The overrides that turn base into data"""
+    overrides = {}
+    basics = {key: value for key, value in data.get("basics", {}).items()
+              if base.get("basics", {}).get(key) != value}
+    if basics:
+        overrides["basics"] = basics
+
+    skills, base_skills = data.get("skills", {}), base.get("skills", {})
+    if skills != base_skills:
+        by_name = {skill.get("name"): skill for skill in base_skills.get("technologies", [])}
+        technologies = skills.get("technologies", [])
+        subset = ({key: value for key, value in skills.items() if key != "technologies"} ==
+                  {key: value for key, value in base_skills.items() if key != "technologies"} and
+                  all(by_name.get(skill.get("name")) == skill for skill in technologies))
+        overrides["skills"] = ({"include": [skill.get("name") for skill in technologies]} if subset
+                               else {"replace": skills})
+
+    for key in ITEM_SECTIONS:
+        override = diff_items(base.get(key, []), data.get(key, []), key in pinned)
+        if override:
+            overrides[key] = override
+
+    for key, value in data.items():
+        if key not in ("basics", "skills") + ITEM_SECTIONS and base.get(key) != value:
+            overrides[key] = value
+    return overrides
+
+
+def normalized(data):
+    """Data as the app holds it, so diffs do not record schema defaults"""
+    return resume_model.Resume.from_dict(data).to_dict()
+
+
+def variant_document(base_filename, overrides, name=None):
+    document = {VARIANT_KEY: VARIANT_VERSION, "base": base_filename}
+    if name is not None:
+        document["name"] = name
+    document["overrides"] = overrides
+    return document
+
+
+def write_variant(directory, filename, base_filename, data, pinned=frozenset()):
+    """Save data as a variant of base_filename; returns the bytes written"""
+    base = normalized(load(directory, base_filename)[0])
+    document = variant_document(base_filename, diff(base, data, pinned), data.get("basics", {}).get("name"))
+    payload = json.dumps(document, indent=4, ensure_ascii=False).encode("utf-8")
+    resume_storage.atomic_write(os.path.join(directory, filename), payload)
+    return len(payload)
+
+
+def create_variant(directory, base_filename, overrides, filename=None):
+    """Create a variant file from explicit overrides; returns its file name"""
+    base, _ = load(directory, base_filename)
+    resolved = apply_overrides(base, overrides)
+    # Fails with resume_model.ResumeValidationError before anything is written
+    resume_model.Resume.from_dict(resolved)
+    if filename is None:
+        stem = os.path.splitext(base_filename)[0]
+        filename = f"{stem}_variant_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S-%f')}.json"
+    document = variant_document(base_filename, overrides, resolved.get("basics", {}).get("name"))
+    resume_storage.atomic_write(os.path.join(directory, filename),
+                                json.dumps(document, indent=4, ensure_ascii=False).encode("utf-8"))
+    return filename
+
+
+# Batch rendering
+
+def family_documents(directory, base_filename):
+    """{filename: variant document} for every variant inheriting, directly or not, from base_filename"""
+    documents = {}
+    for filename in resume_storage.resume_files(directory):
+        try:
+            document = resume_storage.read_document(os.path.join(directory, filename))
+        except (OSError, ValueError):
+            continue
+        if is_variant(document):
+            documents[filename] = document
+    members = {}
+    for filename, document in documents.items():
+        seen, parent = {filename}, document["base"]
+        while parent in documents and parent not in seen and parent != base_filename:
+            seen.add(parent)
+            parent = documents[parent]["base"]
+        if parent == base_filename:
+            members[filename] = document
+    return members
+
+
+def family(directory, base_filename):
+    return list(family_documents(directory, base_filename))
+
+
+def render_pdf(layout):
+    # reportlab is only imported when PDFs are actually requested
+    return importlib.import_module("pdf_export").render_pdf(layout, metrics.NULL_TRACE).getvalue()
+
+
+def render_text(export_format):
+    text_export = importlib.import_module("text_export")
+    return lambda layout: text_export.render(layout, export_format).encode("utf-8")
+
+
+RENDERERS = {"pdf": render_pdf, "txt": render_text("txt"), "md": render_text("md")}
+
+
+def render_family(directory, base_filename, formats, include_base=True):
+    """Render a base and all its variants; yields (filename, format, bytes)
+
+    The variants are resolved against one in-memory copy of the base.  Items
+    they share with it are decoded and compiled into layout blocks once for
+    the whole batch.
+    """
+    unknown = [export_format for export_format in formats if export_format not in RENDERERS]
+    if unknown:
+        raise ValueError(f"Unsupported batch format(s): {', '.join(unknown)}")
+    documents = family_documents(directory, base_filename)
+    resolved = {base_filename: load(directory, base_filename)[0]}
+
+    def resolve_member(filename):
+        # Resolved against this batch's copy of the base, so unchanged items are the same dicts
+        if filename not in resolved:
+            document = documents[filename]
+            resolved[filename] = apply_overrides(resolve_member(document["base"]), document.get("overrides", {}))
+        return resolved[filename]
+
+    model_memo, layout_memo = {}, {}
+    for filename in ([base_filename] if include_base else []) + list(documents):
+        resume = resume_model.Resume.from_dict(resolve_member(filename), model_memo)
+        sort_sections(resume, pinned_sections(documents.get(filename)))
+        layout = resume_ir.compile_resume(resume, layout_memo)
+        for export_format in formats:
+            yield filename, export_format, RENDERERS[export_format](layout)
+
+
+def export_family(directory, base_filename, formats, output_directory, include_base=True):
+    """Write render_family output into output_directory; returns the written paths"""
+    os.makedirs(output_directory, exist_ok=True)
+    written = []
+    for filename, export_format, payload in render_family(directory, base_filename, formats, include_base):
+        path = os.path.join(output_directory, f"{os.path.splitext(filename)[0]}.{export_format}")
+        with open(path, "wb") as file:
+            file.write(payload)
+        written.append(path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a base resume and all of its variants")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="Render a base and its variants in one pass")
+    export_parser.add_argument("base", help="Path of the base resume file")
+    export_parser.add_argument("--format", dest="formats", action="append", choices=sorted(RENDERERS),
+                               help="Output format, repeatable (default: pdf)")
+    export_parser.add_argument("--output", default="exports", help="Output directory")
+    export_parser.add_argument("--variants-only", action="store_true", help="Skip the base itself")
+    list_parser = commands.add_parser("list", help="List the variants of a base resume")
+    list_parser.add_argument("base", help="Path of the base resume file")
+    args = parser.parse_args(argv)
+
+    directory, base_filename = os.path.split(os.path.abspath(args.base))
+    try:
+        if args.command == "list":
+            for filename in family(directory, base_filename):
+                print(filename)
+            return 0
+        written = export_family(directory, base_filename, args.formats or ["pdf"], args.output,
+                                include_base=not args.variants_only)
+    except (VariantError, resume_model.ResumeValidationError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {len(written)} files to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
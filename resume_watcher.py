@@ -0,0 +1,247 @@
+"""Watch the resumes directory for files created, changed or removed by other tools.
+
+The Tkinter ``resume_builder.py``, sync scripts and people with a text editor
+all write into ``resumes/`` behind the web app's back.  ``ResumeWatcher``
+turns those changes into ``FileEvent`` objects and hands them to subscribers
+so caches can drop exactly what went stale.
+
+On Linux the watcher uses inotify through ctypes (no extra dependency).
+Elsewhere, or when inotify is unavailable, it falls back to polling the
+directory and comparing (mtime, size) snapshots.
+
+Event kinds:
+
+* ``created``: a new file appeared (including an atomic rename into place)
+* ``modified``: an existing file was rewritten and closed
+* ``deleted``: a file was removed or renamed away
+* ``rescan``: events were lost (inotify queue overflow); ``filename`` is None
+  and subscribers should treat every file as changed
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import threading
+from collections import namedtuple
+
+import metrics
+
+FileEvent = namedtuple("FileEvent", ["kind", "filename"])
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_resume_file(filename):
+    """Only resume JSON files matter; temp and hidden files are ignored"""
+    return bool(filename) and filename.endswith(".json") and not filename.startswith(".")
+
+
+class InotifyBackend:
+    """Linux inotify through libc, read with select so stop() is prompt"""
+
+    name = "inotify"
+
+    def __init__(self, directory):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        watch = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if watch < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+        # Files created but not yet closed; their first close is a creation
+        self.pending_creates = set()
+
+    def poll(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return []
+            raise
+        return list(self.parse(data))
+
+    def parse(self, data):
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            filename = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                yield FileEvent("rescan", None)
+            elif mask & (IN_DELETE_SELF | IN_IGNORED):
+                yield FileEvent("rescan", None)
+            elif not is_resume_file(filename):
+                continue
+            elif mask & IN_CREATE:
+                self.pending_creates.add(filename)
+            elif mask & IN_CLOSE_WRITE:
+                if filename in self.pending_creates:
+                    self.pending_creates.discard(filename)
+                    yield FileEvent("created", filename)
+                else:
+                    yield FileEvent("modified", filename)
+            elif mask & IN_MOVED_TO:
+                yield FileEvent("created", filename)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self.pending_creates.discard(filename)
+                yield FileEvent("deleted", filename)
+
+    def wake(self):
+        # select() returns within one interval anyway
+        pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingBackend:
+    """Portable fallback: diff (mtime, size) snapshots of the directory"""
+
+    name = "polling"
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.woken = threading.Event()
+        self.snapshot = self.take_snapshot()
+
+    def take_snapshot(self):
+        snapshot = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not is_resume_file(entry.name):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+        return snapshot
+
+    def poll(self, timeout):
+        if self.woken.wait(timeout):
+            return []
+        current = self.take_snapshot()
+        previous, self.snapshot = self.snapshot, current
+        events = [FileEvent("deleted", name) for name in previous.keys() - current.keys()]
+        for name, signature in current.items():
+            if name not in previous:
+                events.append(FileEvent("created", name))
+            elif previous[name] != signature:
+                events.append(FileEvent("modified", name))
+        return events
+
+    def wake(self):
+        self.woken.set()
+
+    def close(self):
+        pass
+
+
+class ResumeWatcher:
+    """Background thread delivering FileEvents for one directory to subscribers"""
+
+    def __init__(self, directory, interval=1.0, backend="auto"):
+        self.directory = directory
+        self.interval = interval
+        self.backend_choice = backend
+        self.backend = None
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    @property
+    def backend_name(self):
+        return self.backend.name if self.backend else None
+
+    def subscribe(self, callback):
+        """Call callback(event) from the watcher thread for every event"""
+        with self.lock:
+            self.subscribers.append(callback)
+        return callback
+
+    def create_backend(self):
+        if self.backend_choice in ("auto", "inotify"):
+            try:
+                return InotifyBackend(self.directory)
+            except (OSError, AttributeError) as e:
+                if self.backend_choice == "inotify":
+                    raise
+                print(f"inotify unavailable ({e}), polling {self.directory} every {self.interval}s")
+        return PollingBackend(self.directory)
+
+    def start(self):
+        if self.running:
+            return self
+        os.makedirs(self.directory, exist_ok=True)
+        self.backend = self.create_backend()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name="resume-watcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                events = self.backend.poll(self.interval)
+            except OSError as e:
+                print(f"Resume watcher error: {e}")
+                self.stopped.wait(self.interval)
+                continue
+            for event in events:
+                self.publish(event)
+
+    def publish(self, event):
+        metrics.WATCH_EVENTS.inc(kind=event.kind)
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Resume watcher subscriber error for {event}: {e}")
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.backend.wake()
+            self.thread.join()
+            self.thread = None
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
@@ -0,0 +1,284 @@
+"""Retention policy for old resume versions.
+
+"Save As" with a timestamp is how people keep history, so ``resumes/``
+collects versions like ``Skylor_Piersall_2025-09-06_13-41-25.json`` and
+``Skylor_Piersall_2025_09_10T05_30_02.json`` without bound.  The compactor
+groups files by person and, for each group, keeps:
+
+* the newest ``keep_last`` versions
+* the newest version of each of the last ``keep_daily`` days, ``keep_weekly``
+  ISO weeks and ``keep_monthly`` months that have one
+
+Everything else is moved into a ZIP archive under ``resumes/.archive/``, or
+deleted with ``mode="delete"``.  A version's time is the timestamp in its file
+name, or its modification time when the name has none.  These are never
+touched:
+
+* the newest version of every person
+* the resume open in the editor
+* files whose journal holds edits not yet written into them
+* variants, and any file a variant inherits from
+
+``Compactor.step`` handles a few people at a time, so the app can run it
+from a background thread without holding anything up; ``run`` does a whole
+pass at once:
+
+    python retention.py resumes --keep-last 3 --dry-run
+    python retention.py resumes --keep-last 3 --keep-monthly 6 --delete
+
+Every worker process runs its own compactor, so retiring holds
+``resumes/.archive/.lock`` across processes: two workers never append to the
+same archive at once, and a version one of them retired is gone for the other.
+"""
+import argparse
+import contextlib
+import os
+import re
+import sys
+import threading
+import time
+import zipfile
+from collections import namedtuple
+from datetime import datetime
+
+import locks
+import metrics
+import resume_catalog
+import resume_journal
+import resume_storage
+
+ARCHIVE_DIRECTORY = ".archive"
+ARCHIVE_LOCK = ".lock"
+VERSION_TIMESTAMP = re.compile(r"[_-](\d{4})[-_](\d{2})[-_](\d{2})[T_](\d{2})[-_](\d{2})[-_](\d{2})$")
+
+RetentionPolicy = namedtuple("RetentionPolicy", ["keep_last", "keep_daily", "keep_weekly", "keep_monthly"])
+DEFAULT_POLICY = RetentionPolicy(keep_last=5, keep_daily=7, keep_weekly=4, keep_monthly=12)
+
+Version = namedtuple("Version", ["filename", "when"])
+
+
+def version_time(filename, modified):
+    """When a version was saved: the timestamp in its name, else its modification time"""
+    match = VERSION_TIMESTAMP.search(os.path.splitext(filename)[0])
+    if match:
+        try:
+            return datetime(*(int(part) for part in match.groups()))
+        except ValueError:
+            pass
+    return modified
+
+
+def person_key(name, filename):
+    """Group versions by person name, or by file name without its timestamp for unnamed resumes"""
+    name = " ".join((name or "").split()).casefold()
+    if name and name != "untitled resume":
+        return name
+    return VERSION_TIMESTAMP.sub("", os.path.splitext(filename)[0]).casefold()
+
+
+def select_kept(versions, policy):
+    """Return the set of file names the policy keeps out of one person's versions"""
+    ordered = sorted(versions, key=lambda version: version.when, reverse=True)
+    kept = {version.filename for version in ordered[:max(policy.keep_last, 1)]}
+    for count, bucket in ((policy.keep_daily, lambda when: when.date()),
+                          (policy.keep_weekly, lambda when: when.isocalendar()[:2]),
+                          (policy.keep_monthly, lambda when: (when.year, when.month))):
+        seen = set()
+        for version in ordered:
+            key = bucket(version.when)
+            if key in seen:
+                continue
+            if len(seen) == count:
+                break
+            seen.add(key)
+            kept.add(version.filename)
+    return kept
+
+
+class Compactor:
+    """Applies a RetentionPolicy to a resumes directory, a few people per step"""
+
+    def __init__(self, directory, policy=DEFAULT_POLICY, mode="archive", catalog=None, protected=None):
+        if mode not in ("archive", "delete"):
+            raise ValueError(f"Unknown retention mode '{mode}'")
+        self.directory = directory
+        self.policy = policy
+        self.mode = mode
+        self.catalog = catalog or resume_catalog.ResumeCatalog(directory)
+        # Callable returning file names that must be kept (e.g. the open resume)
+        self.protected = protected or (lambda: ())
+        self.pending = []
+        self.totals = {"files": 0, "bytes": 0, "passes": 0}
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def plan(self):
+        """Group the directory into per-person version lists; returns (groups, protected names)"""
+        groups = {}
+        protected = set(self.protected())
+        for entry in self.catalog.entries():
+            if entry.get('variant_of'):
+                protected.add(entry['filename'])
+                protected.add(entry['variant_of'])
+                continue
+            modified = datetime.strptime(entry['modified'], '%Y-%m-%d %H:%M:%S')
+            version = Version(entry['filename'], version_time(entry['filename'], modified))
+            groups.setdefault(person_key(entry['name'], entry['filename']), []).append(version)
+        return groups, protected
+
+    def victims(self, versions, protected):
+        if len(versions) < 2:
+            return []
+        kept = select_kept(versions, self.policy)
+        return sorted(version.filename for version in versions
+                      if version.filename not in kept and version.filename not in protected)
+
+    def archive_path(self):
+        return os.path.join(self.directory, ARCHIVE_DIRECTORY, f"resumes-{datetime.now():%Y-%m}.zip")
+
+    def archive_lock(self, dry_run=False):
+        """Held while retiring, against the compactors of other worker processes"""
+        if dry_run:
+            return contextlib.nullcontext()
+        path = os.path.join(self.directory, ARCHIVE_DIRECTORY, ARCHIVE_LOCK)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return locks.process_lock(path)
+
+    def retire(self, person, filenames, dry_run=False):
+        """Archive or delete one person's old versions; returns (bytes reclaimed, file names retired)"""
+        reclaimed = 0
+        retired = []
+        manifests = False
+        archive = None
+        with self.archive_lock(dry_run):
+            try:
+                for filename in filenames:
+                    path = os.path.join(self.directory, filename)
+                    journal = resume_journal.ResumeJournal(self.directory, filename)
+                    # Held from the read to the remove, so a save in between is not archived stale or lost
+                    with locks.file_lock(path).write():
+                        if journal.exists() and journal.pending()[0] > 0:
+                            print(f"Retention skipped {filename}: it has journaled edits not yet saved to the file")
+                            continue
+                        try:
+                            size = os.path.getsize(path)
+                            document = resume_storage.read_document(path)
+                        except (OSError, ValueError) as e:
+                            print(f"Retention skipped {filename}: {e}")
+                            continue
+                        if not dry_run:
+                            if self.mode == "archive":
+                                if archive is None:
+                                    os.makedirs(os.path.dirname(self.archive_path()), exist_ok=True)
+                                    archive = zipfile.ZipFile(self.archive_path(), "a", zipfile.ZIP_DEFLATED)
+                                # Archived as the plain resume, so it opens without the object store
+                                with open(path, "rb") as file:
+                                    payload = file.read()
+                                if resume_storage.is_manifest(document):
+                                    payload = resume_storage.encode(resume_storage.resolve(self.directory, document))
+                                info = zipfile.ZipInfo(f"{person}/{filename}", time.localtime(os.path.getmtime(path))[:6])
+                                info.compress_type = zipfile.ZIP_DEFLATED
+                                archive.writestr(info, payload)
+                            # Its objects may now be unreferenced, whichever the mode
+                            manifests = manifests or resume_storage.is_manifest(document)
+                            os.remove(path)
+                            journal.delete()
+                            metrics.RETENTION_FILES.inc(action=self.mode)
+                    reclaimed += size
+                    retired.append(filename)
+            finally:
+                if archive is not None:
+                    archive.close()
+        if manifests:
+            _, freed = resume_storage.collect_garbage(self.directory)
+            reclaimed += freed
+        return reclaimed, retired
+
+    def step(self, people=10, dry_run=False):
+        """Process up to `people` groups; a new pass starts when the previous one is done
+
+        Returns {"files": [...], "bytes": n, "done": bool}.
+        """
+        started = time.perf_counter()
+        if not self.pending:
+            groups, protected = self.plan()
+            self.pending = [(person, self.victims(versions, protected)) for person, versions in sorted(groups.items())]
+            self.pending = [(person, victims) for person, victims in self.pending if victims]
+            self.totals["passes"] += 1
+        batch, self.pending = self.pending[:people], self.pending[people:]
+        report = {"files": [], "bytes": 0}
+        protected = set(self.protected())
+        for person, victims in batch:
+            # The editor may have opened one of them since the pass was planned
+            victims = [filename for filename in victims if filename not in protected]
+            reclaimed, retired = self.retire(person, victims, dry_run)
+            report["bytes"] += reclaimed
+            report["files"].extend(retired)
+        report["done"] = not self.pending
+        if not dry_run:
+            self.totals["files"] += len(report["files"])
+            self.totals["bytes"] += report["bytes"]
+            metrics.RETENTION_RECLAIMED_BYTES.inc(report["bytes"])
+        metrics.RETENTION_PASS_DURATION.observe(time.perf_counter() - started)
+        return report
+
+    def run(self, dry_run=False):
+        """One full pass over the directory"""
+        self.pending = []
+        report = {"files": [], "bytes": 0}
+        while True:
+            step = self.step(people=50, dry_run=dry_run)
+            report["files"].extend(step["files"])
+            report["bytes"] += step["bytes"]
+            if step["done"]:
+                return report
+
+    def start(self, interval=60.0, people=10):
+        """Run a step every interval seconds on a daemon thread"""
+        if self.thread is not None and self.thread.is_alive():
+            return self
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.loop, args=(interval, people), name="resume-retention", daemon=True)
+        self.thread.start()
+        return self
+
+    def loop(self, interval, people):
+        while not self.stopped.wait(interval):
+            try:
+                report = self.step(people)
+            except Exception as e:
+                print(f"Retention error: {e}")
+                continue
+            if report["files"]:
+                print(f"Retention {self.mode}d {len(report['files'])} old versions, reclaimed {report['bytes']} bytes")
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive or delete old resume versions")
+    parser.add_argument("directory", nargs="?", default="resumes")
+    parser.add_argument("--keep-last", type=int, default=DEFAULT_POLICY.keep_last)
+    parser.add_argument("--keep-daily", type=int, default=DEFAULT_POLICY.keep_daily)
+    parser.add_argument("--keep-weekly", type=int, default=DEFAULT_POLICY.keep_weekly)
+    parser.add_argument("--keep-monthly", type=int, default=DEFAULT_POLICY.keep_monthly)
+    parser.add_argument("--delete", action="store_true", help="Delete instead of archiving")
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would be removed")
+    args = parser.parse_args(argv)
+
+    policy = RetentionPolicy(args.keep_last, args.keep_daily, args.keep_weekly, args.keep_monthly)
+    compactor = Compactor(args.directory, policy, "delete" if args.delete else "archive")
+    report = compactor.run(dry_run=args.dry_run)
+    for filename in report["files"]:
+        print(filename)
+    action = "Would remove" if args.dry_run else ("Deleted" if args.delete else "Archived")
+    print(f"{action} {len(report['files'])} old versions, {report['bytes']} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
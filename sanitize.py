@@ -0,0 +1,136 @@
+"""Single-pass sanitizer turning stored summary HTML into safe markup and plain text.
+
+Summaries are stored as ``<p>...</p>`` wrapped user text and may contain
+whatever markup was pasted into the editor.  ``sanitize_html`` walks the
+string once with a precompiled tokenizer and produces:
+
+* ``markup``: text safe for reportlab ``Paragraph`` and for HTML output.
+  Only ``<b>``, ``<i>`` and ``<u>`` survive (``strong``/``em`` are mapped
+  onto them), tags are always balanced and ``&``, ``<`` and ``>`` in text are
+  escaped.
+* ``text``: the same content with no markup and entities decoded.
+
+Block breaks (``<br>``, ``</p>``, ``</div>``, ``</li>``) become newlines,
+``&nbsp;`` becomes a space, ``<script>``/``<style>`` bodies are dropped and
+bullets are normalised to ``"• "``.  Results are memoized per input string,
+so the mutators can sanitize at write time and renderers only look results up.
+
+``split_bullets`` turns a bulleted summary into the plain-text ``highlights``
+list stored on work items, and ``bullet_summary`` goes the other way when the
+highlights are edited directly.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+from html import unescape
+
+Sanitized = namedtuple("Sanitized", ["markup", "text"])
+
+EMPTY = Sanitized("", "")
+
+TOKEN = re.compile(r"""
+    (?P<comment><!--.*?-->)
+  | (?P<tag></?\s*(?P<name>[a-zA-Z][a-zA-Z0-9]*)\b[^>]*>)
+  | (?P<entity>&(?:\#[0-9]+|\#[xX][0-9a-fA-F]+|[a-zA-Z][a-zA-Z0-9]*);)
+  | (?P<bullet>•[ \t ]*)
+  | (?P<text>[^<&•]+|[<&])
+""", re.VERBOSE | re.DOTALL)
+
+SPACES = re.compile(r"[ \t ]+")
+BLANK_LINES = re.compile(r"[ \t]*\n[ \t\n]*")
+
+INLINE_TAGS = {"b": "b", "strong": "b", "i": "i", "em": "i", "u": "u"}
+BREAK_TAGS = {"br", "p", "div", "li", "ul", "ol", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+DROP_CONTENT_TAGS = {"script", "style"}
+
+
+def escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def tidy(text):
+    """Collapse runs of spaces and blank lines and trim the ends"""
+    text = SPACES.sub(" ", text)
+    return BLANK_LINES.sub("\n", text).strip()
+
+
+@lru_cache(maxsize=8192)
+def sanitize_html(raw):
+    """Return Sanitized(markup, text) for a stored HTML fragment"""
+    if not raw:
+        return EMPTY
+
+    markup = []
+    text = []
+    open_tags = []
+    skipping = None
+
+    for match in TOKEN.finditer(raw):
+        kind = match.lastgroup
+        if kind == "name":
+            kind = "tag"
+        value = match.group(kind) if kind != "tag" else match.group("tag")
+
+        if kind == "tag":
+            name = match.group("name").lower()
+            closing = value[1:].lstrip().startswith("/")
+            if skipping:
+                if closing and name == skipping:
+                    skipping = None
+                continue
+            if name in DROP_CONTENT_TAGS and not closing:
+                skipping = name
+            elif name in INLINE_TAGS:
+                tag = INLINE_TAGS[name]
+                if not closing:
+                    open_tags.append(tag)
+                    markup.append(f"<{tag}>")
+                elif tag in open_tags:
+                    # Close anything opened inside it so the markup stays balanced
+                    while open_tags:
+                        inner = open_tags.pop()
+                        markup.append(f"</{inner}>")
+                        if inner == tag:
+                            break
+            elif name in BREAK_TAGS:
+                markup.append("\n")
+                text.append("\n")
+            continue
+
+        if skipping or kind == "comment":
+            continue
+
+        if kind == "entity":
+            value = unescape(value)
+        elif kind == "bullet":
+            value = "• "
+        markup.append(escape(value))
+        text.append(value)
+
+    while open_tags:
+        markup.append(f"</{open_tags.pop()}>")
+
+    return Sanitized(tidy("".join(markup)), tidy("".join(text)))
+
+
+@lru_cache(maxsize=8192)
+def split_bullets(raw):
+    """Return the bullet texts of a summary, or () when it has no bullets
+
+    Text before the first bullet counts as a bullet, matching how bulleted
+    summaries have always been rendered.
+    """
+    plain = sanitize_html(raw).text
+    if "•" not in plain:
+        return ()
+    return tuple(bullet.strip() for bullet in plain.split("•") if bullet.strip())
+
+
+def bullet_summary(highlights):
+    """Build the stored summary HTML for a list of highlight texts"""
+    lines = []
+    for highlight in highlights:
+        highlight = escape(highlight.replace("•", " ").strip())
+        if highlight:
+            lines.append(f"• {highlight}")
+    return "<p>" + "\n".join(lines) + "</p>" if lines else ""
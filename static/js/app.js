@@ -3,10 +3,12 @@
 // Global variables
 let resumeData = {};
 let currentFilename = null;
+let eventSource = null;
 
 // Initialize the application
 document.addEventListener('DOMContentLoaded', function () {
     loadData();
+    connectEvents();
     initializeEventListeners();
     updateCurrentFilename();
     populateFormFields(); // Add this to populate fields on page load
@@ -361,6 +363,77 @@ async function loadData() {
     }
 }
 
+// Follow edits made in other tabs and worker processes over Server-Sent Events
+function connectEvents() {
+    // Not when the server has live updates turned off
+    if (!window.EventSource || eventSource || document.body.dataset.liveEvents !== 'on') return;
+
+    // Without ?resume= the stream follows whichever resume the editor has open
+    eventSource = new EventSource('/api/events');
+    eventSource.addEventListener('change', function (e) {
+        const event = JSON.parse(e.data);
+        applyChange(event.change, event.version);
+    });
+    eventSource.addEventListener('reload', function (e) {
+        const event = JSON.parse(e.data);
+        if (event.resume !== undefined) {
+            currentFilename = event.resume;
+            updateCurrentFilename();
+        }
+        loadData();
+    });
+    // Events were missed (the log rotated or this tab fell behind)
+    eventSource.addEventListener('reset', loadData);
+    eventSource.onerror = function () {
+        // Closed for good: every stream the server allows is taken, or it is gone. Try again later
+        if (eventSource.readyState === EventSource.CLOSED) {
+            eventSource = null;
+            setTimeout(connectEvents, 60000);
+        }
+    };
+}
+
+// Patch the local copy with one changed section or item instead of refetching everything
+function applyChange(change, version) {
+    if (!change) return;
+
+    if (version !== undefined && version !== null && version > resumeRevision()) {
+        resumeData.meta = { ...(resumeData.meta || {}), revision: version };
+    }
+
+    if (change.section === 'basics' || change.section === 'skills') {
+        resumeData[change.section] = change.value;
+    } else {
+        const items = (resumeData[change.section] || []).filter(item => item.id !== change.id);
+        if (change.item) {
+            items.splice(change.index, 0, change.item);
+        }
+        resumeData[change.section] = items;
+        if (items.length !== change.count) {
+            // Out of step with the server (e.g. items without IDs); fetch the whole resume once
+            loadData();
+            return;
+        }
+    }
+    populateFormFields();
+}
+
+// Revision of the resume this tab last saw (meta.revision, bumped by every edit)
+function resumeRevision() {
+    return (resumeData.meta && resumeData.meta.revision) || 0;
+}
+
+// Headers for an edit: If-Match makes the server refuse it if someone else changed the resume first
+function editHeaders(headers = {}) {
+    return { ...headers, 'If-Match': `"${resumeRevision()}"` };
+}
+
+// The edit was based on an outdated copy; show the current resume so it can be redone
+async function handleConflict(result) {
+    showToast(result.message || 'The resume was changed elsewhere', 'error');
+    await loadData();
+}
+
 // Resume Management Functions
 
 // Create new resume
@@ -501,14 +574,19 @@ async function saveCurrentResume() {
 
         const response = await fetch('/api/resume/save', {
             method: 'POST',
-            headers: {
+            headers: editHeaders({
                 'Content-Type': 'application/json',
-            },
+            }),
             body: JSON.stringify({}),
         });
 
         const result = await response.json();
 
+        if (response.status === 409) {
+            await handleConflict(result);
+            return;
+        }
+
         if (result.success) {
             showToast(result.message);
             currentFilename = result.filename;
@@ -617,6 +695,42 @@ async function deleteResume(filename) {
     }
 }
 
+// Undo or redo the last edit from the server-side journal
+async function stepHistory(direction) {
+    try {
+        const response = await fetch(`/api/resume/${direction}`, {
+            method: 'POST',
+            headers: editHeaders(),
+        });
+
+        const result = await response.json();
+
+        if (response.status === 409) {
+            await handleConflict(result);
+            return;
+        }
+
+        if (result.success) {
+            showToast(result.message);
+            resumeData = result.resume_data;
+            populateFormFields();
+        } else {
+            showToast(result.message, 'info');
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        showToast('Network error occurred', 'error');
+    }
+}
+
+function undoEdit() {
+    stepHistory('undo');
+}
+
+function redoEdit() {
+    stepHistory('redo');
+}
+
 // Save basic information
 async function saveBasics(e) {
     e.preventDefault();
@@ -634,17 +748,22 @@ async function saveBasics(e) {
     try {
         const response = await fetch('/api/basics', {
             method: 'POST',
-            headers: {
+            headers: editHeaders({
                 'Content-Type': 'application/json',
-            },
+            }),
             body: JSON.stringify(data),
         });
 
         const result = await response.json();
 
+        if (response.status === 409) {
+            await handleConflict(result);
+            return;
+        }
+
         if (result.success) {
             showToast('Personal information saved successfully!');
-            await loadData(); // Refresh data
+            applyChange(result.change, result.version);
         } else {
             showToast('Error saving information', 'error');
         }
@@ -670,14 +789,19 @@ async function saveWork() {
     try {
         const response = await fetch('/api/work', {
             method: 'POST',
-            headers: {
+            headers: editHeaders({
                 'Content-Type': 'application/json',
-            },
+            }),
             body: JSON.stringify(data),
         });
 
         const result = await response.json();
 
+        if (response.status === 409) {
+            await handleConflict(result);
+            return;
+        }
+
         if (result.success) {
             showToast('Work experience saved successfully!');
 
@@ -688,9 +812,8 @@ async function saveWork() {
             // Reset form
             form.reset();
 
-            // Refresh data and update display
-            await loadData();
-            updateWorkExperienceDisplay();
+            // Update the display from the changed item
+            applyChange(result.change, result.version);
         } else {
             showToast('Error saving work experience', 'error');
         }
@@ -738,16 +861,21 @@ async function deleteWork(workId) {
     try {
         const response = await fetch(`/api/work/${workId}`, {
             method: 'DELETE',
+            headers: editHeaders(),
         });
 
         const result = await response.json();
 
+        if (response.status === 409) {
+            await handleConflict(result);
+            return;
+        }
+
         if (result.success) {
             showToast('Work experience deleted successfully!');
 
-            // Refresh data and update display
-            await loadData();
-            updateWorkExperienceDisplay();
+            // Update the display from the changed item
+            applyChange(result.change, result.version);
         } else {
             showToast('Error deleting work experience', 'error');
         }
@@ -771,14 +899,19 @@ async function saveEducation() {
     try {
         const response = await fetch('/api/education', {
             method: 'POST',
-            headers: {
+            headers: editHeaders({
                 'Content-Type': 'application/json',
-            },
+            }),
             body: JSON.stringify(data),
         });
 
         const result = await response.json();
 
+        if (response.status === 409) {
+            await handleConflict(result);
+            return;
+        }
+
         if (result.success) {
             showToast('Education entry saved successfully!');
 
@@ -789,9 +922,8 @@ async function saveEducation() {
             // Reset form
             form.reset();
 
-            // Refresh data and update display
-            await loadData();
-            updateEducationDisplay();
+            // Update the display from the changed item
+            applyChange(result.change, result.version);
         } else {
             showToast('Error saving education entry', 'error');
         }
@@ -846,16 +978,21 @@ async function deleteEducation(eduId) {
     try {
         const response = await fetch(`/api/education/${eduId}`, {
             method: 'DELETE',
+            headers: editHeaders(),
         });
 
         const result = await response.json();
 
+        if (response.status === 409) {
+            await handleConflict(result);
+            return;
+        }
+
         if (result.success) {
             showToast('Education entry deleted successfully!');
 
-            // Refresh data and update display
-            await loadData();
-            updateEducationDisplay();
+            // Update the display from the changed item
+            applyChange(result.change, result.version);
         } else {
             showToast('Error deleting education entry', 'error');
         }
@@ -875,20 +1012,24 @@ async function addSkill() {
     try {
         const response = await fetch('/api/skills', {
             method: 'POST',
-            headers: {
+            headers: editHeaders({
                 'Content-Type': 'application/json',
-            },
+            }),
             body: JSON.stringify({ name: skillName.trim() }),
         });
 
         const result = await response.json();
 
+        if (response.status === 409) {
+            await handleConflict(result);
+            return;
+        }
+
         if (result.success) {
             showToast('Skill added successfully!');
 
-            // Refresh data and update display
-            await loadData();
-            updateSkillsDisplay();
+            // Update the display from the changed skills
+            applyChange(result.change, result.version);
         } else {
             showToast(result.message || 'Error adding skill', 'error');
         }
@@ -907,16 +1048,21 @@ async function deleteSkill(skillIndex) {
     try {
         const response = await fetch(`/api/skills/${skillIndex}`, {
             method: 'DELETE',
+            headers: editHeaders(),
         });
 
         const result = await response.json();
 
+        if (response.status === 409) {
+            await handleConflict(result);
+            return;
+        }
+
         if (result.success) {
             showToast('Skill deleted successfully!');
 
-            // Refresh data and update display
-            await loadData();
-            updateSkillsDisplay();
+            // Update the display from the changed skills
+            applyChange(result.change, result.version);
         } else {
             showToast('Error deleting skill', 'error');
         }
@@ -0,0 +1,43 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# No watcher, event broker, retention or idle journal threads while the app module is under test
+os.environ.setdefault("SEEME_WATCH", "0")
+os.environ.setdefault("SEEME_EVENTS", "0")
+os.environ.setdefault("SEEME_RETENTION", "0")
+os.environ.setdefault("SEEME_JOURNAL_IDLE_SECONDS", "0")
+
+SAMPLE = "Skylor_Piersall_2025-09-06_13-41-25.json"
+
+
+@pytest.fixture
+def resumes(tmp_path):
+    """A resumes directory holding a copy of the sample resume"""
+    directory = tmp_path / "resumes"
+    directory.mkdir()
+    shutil.copy(os.path.join(ROOT, "resumes", SAMPLE), directory / SAMPLE)
+    return str(directory)
+
+
+@pytest.fixture
+def editor(resumes, tmp_path, monkeypatch):
+    """A fresh app.resume_app with the sample resume open, for the routes to use"""
+    monkeypatch.chdir(tmp_path)
+    import app
+    instance = app.ResumeWebApp()
+    instance.resumes_directory = resumes
+    assert instance.load_resume(SAMPLE)
+    monkeypatch.setattr(app, "resume_app", instance)
+    return instance
+
+
+@pytest.fixture
+def client(editor):
+    import app
+    return app.app.test_client()
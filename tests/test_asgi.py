@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def broker(editor, monkeypatch):
+    import app
+    monkeypatch.setitem(app.app.config, "LIVE_EVENTS", True)
+    monkeypatch.setattr(app, "event_broker", None)
+    yield app.start_event_broker()
+    app.event_broker.stop()
+
+
+def streams(broker):
+    import resume_events
+    return [callback for callback in broker.subscribers if isinstance(callback, resume_events.Subscription)]
+
+
+def test_event_stream_runs_on_the_loop_until_the_client_leaves(editor, broker):
+    import asgi
+    bridge = asgi.AsgiBridge(asgi.app, io_workers=1)
+    scope = {"type": "http", "method": "GET", "path": "/api/events", "query_string": b"", "headers": []}
+    sent = []
+    left = asyncio.Event()
+
+    async def receive():
+        await left.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    async def session():
+        served = asyncio.ensure_future(bridge(scope, receive, send))
+        while len(streams(broker)) != 1:
+            await asyncio.sleep(0.01)
+        await asyncio.get_running_loop().run_in_executor(None, editor.apply, "add_skill", "Rust")
+        while not any(b"event: change" in message.get("body", b"") for message in sent):
+            await asyncio.sleep(0.01)
+        left.set()
+        await asyncio.wait_for(served, 5)
+
+    asyncio.run(asyncio.wait_for(session(), 10))
+    bridge.shutdown()
+    assert sent[0]["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in sent[0]["headers"]
+    assert streams(broker) == []
@@ -0,0 +1,56 @@
+import copy
+import os
+
+from conftest import SAMPLE
+
+
+def skill_names(data):
+    return [skill["name"] for skill in data["skills"]["technologies"]]
+
+
+def batch(client, *operations):
+    return client.post("/api/resume/current/batch", json={"operations": list(operations)})
+
+
+def test_failing_operation_rolls_back_the_whole_batch(client, editor):
+    before = copy.deepcopy(editor.resume_data)
+    revision = editor.revision
+    response = batch(client, {"op": "add_skill", "name": "Rust"},
+                     {"op": "delete_work_experience", "id": "no-such-job"})
+    assert response.status_code == 400
+    assert response.get_json()["index"] == 1
+    assert editor.resume_data == before
+    assert editor.revision == revision
+    assert [record["op"] for record in editor.get_journal().load()] == ["snapshot"]
+
+
+def test_update_of_a_missing_item_fails(client, editor):
+    response = batch(client, {"op": "add_education", "data": {"id": "no-such-school", "institution": "Nowhere"}})
+    assert response.status_code == 400
+    assert "not found" in response.get_json()["message"]
+    assert all(education.get("institution") != "Nowhere" for education in editor.resume_data.get("education", []))
+
+
+def test_batch_adds_updates_and_deletes_and_replays_the_same(client, editor):
+    editor.apply("add_education", {"institution": "Old School", "startDate": "2010-09-01"})
+    job = editor.resume_data["work"][0]
+    school = editor.resume_data["education"][0]
+    response = batch(client,
+                     {"op": "add_work_experience", "data": {"company": "NewCo", "position": "Splicer", "startDate": "2026-01-01"}},
+                     {"op": "add_work_experience", "data": {"id": job["id"], "company": "Renamed", "position": job["position"]}},
+                     {"op": "delete_education", "id": school["id"]},
+                     {"op": "add_skill", "name": "Rust"})
+    assert response.status_code == 200, response.get_json()
+    companies = [work["name"] for work in editor.resume_data["work"]]
+    assert "NewCo" in companies and "Renamed" in companies
+    assert editor.find_education(school["id"]) is None
+    assert skill_names(editor.resume_data)[-1] == "Rust"
+
+    # Replaying the journaled batch (with the IDs it created) gives the same resume
+    import app
+    path = os.path.join(editor.resumes_directory, SAMPLE)
+    assert "NewCo" not in open(path, encoding="utf-8").read()
+    other = app.ResumeWebApp()
+    other.resumes_directory = editor.resumes_directory
+    assert other.load_resume(SAMPLE)
+    assert other.resume_data == editor.resume_data
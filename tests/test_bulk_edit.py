@@ -0,0 +1,40 @@
+from conftest import SAMPLE
+
+
+def skill_names(data):
+    return [skill["name"] for skill in data["skills"]["technologies"]]
+
+
+def test_open_resume_with_journaled_edits_is_edited(client, editor, monkeypatch):
+    import app
+    monkeypatch.setitem(app.app.config, "BULK_EDIT_WORKERS", 1)
+    editor.apply("add_skill", "JS")
+    assert editor.get_journal().pending()[0] == 1
+
+    response = client.post("/api/bulk-edit", json={"transform": {"op": "rename_skill", "from": "JS", "to": "JavaScript"},
+                                                  "where": {"files": SAMPLE}})
+    assert response.status_code == 200
+    assert [result["status"] for result in response.get_json()["results"]] == ["changed"]
+    assert skill_names(editor.resume_data) == ["JavaScript"]
+    assert editor.get_journal().pending()[0] == 0
+
+
+def test_edit_during_the_run_is_kept(client, editor, monkeypatch):
+    import app
+    import bulk_edit
+    monkeypatch.setitem(app.app.config, "BULK_EDIT_WORKERS", 1)
+    editor.apply("add_skill", "JS")
+    map_files = bulk_edit.map_files
+
+    def edit_meanwhile(tasks, workers):
+        results = map_files(tasks, workers)
+        # The editor is not locked out while the files are processed
+        assert editor.lock.writer is None
+        editor.apply("add_skill", "Go")
+        return results
+
+    monkeypatch.setattr(bulk_edit, "map_files", edit_meanwhile)
+    response = client.post("/api/bulk-edit", json={"transform": {"op": "rename_skill", "from": "JS", "to": "JavaScript"},
+                                                  "where": {"files": SAMPLE}})
+    assert [result["status"] for result in response.get_json()["results"]] == ["skipped"]
+    assert skill_names(editor.resume_data) == ["JS", "Go"]
@@ -0,0 +1,36 @@
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def live(client, monkeypatch):
+    """The client with live updates on and a budget of one event stream"""
+    import app
+    monkeypatch.setitem(app.app.config, "LIVE_EVENTS", True)
+    monkeypatch.setattr(app, "event_broker", None)
+    monkeypatch.setattr(app, "stream_slots", threading.Semaphore(1))
+    yield client
+    if app.event_broker is not None:
+        app.event_broker.stop()
+
+
+def test_streams_past_the_budget_are_refused_until_one_closes(live):
+    first = live.get("/api/events", buffered=False)
+    assert first.status_code == 200
+    assert first.mimetype == "text/event-stream"
+    assert live.get("/api/events").status_code == 503
+
+    first.close()
+    second = live.get("/api/events", buffered=False)
+    assert second.status_code == 200
+    second.close()
+
+
+def test_page_tells_the_client_whether_to_connect(client, monkeypatch):
+    import app
+    assert b'data-live-events="off"' in client.get("/").data
+    monkeypatch.setitem(app.app.config, "LIVE_EVENTS", True)
+    monkeypatch.setattr(app, "event_broker", None)
+    assert b'data-live-events="on"' in client.get("/").data
+    app.event_broker.stop()
@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from conftest import ROOT, SAMPLE
+
+CONCURRENT_FIRST_EXPORTS = textwrap.dedent("""
+    import shutil, sys, threading
+    shutil.copytree(sys.argv[1], "resumes")
+    import app
+    assert "pdf_export" not in sys.modules
+    app.resume_app.load_resume(sys.argv[2])
+    client = app.app.test_client()
+    start = threading.Barrier(8)
+    statuses = []
+
+    def export():
+        start.wait()
+        statuses.append(client.get("/api/export/pdf").status_code)
+
+    threads = [threading.Thread(target=export) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(statuses)
+    sys.exit(0 if statuses == [200] * 8 else 1)
+""")
+
+
+def test_concurrent_first_pdf_exports(tmp_path):
+    # A fresh interpreter, so the exports race to import pdf_export
+    env = dict(os.environ, PYTHONPATH=ROOT, SEEME_WATCH="0", SEEME_EVENTS="0", SEEME_JOURNAL="0")
+    source = os.path.join(ROOT, "resumes")
+    result = subprocess.run([sys.executable, "-c", CONCURRENT_FIRST_EXPORTS, source, SAMPLE],
+                            cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+def test_exports_render_the_open_resume(client):
+    for path in ("/api/export/pdf", "/api/export/html", "/api/export/txt", "/api/export/md"):
+        response = client.get(path)
+        assert response.status_code == 200, path
+        assert response.data
+
+
+def test_empty_summary_keeps_its_paragraph():
+    import resume_ir
+    import resume_model
+    import resume_storage
+    import text_export
+    data = resume_storage.read_resume(os.path.join(ROOT, "resumes", SAMPLE))
+    assert data["work"][2]["summary"] == "<p></p>"
+    layout = resume_ir.compile_resume(resume_model.Resume.from_dict(data))
+    work = next(section for section in layout.sections if section.key == "work")
+    # The PDF and HTML exports have always emitted an empty paragraph for it
+    assert work.blocks[2].details == (resume_ir.TextBlock("summary", (resume_ir.EMPTY_RUN,)),)
+    # The text exports leave it out
+    assert text_export.render(layout, "txt").endswith(work.blocks[2].dates + "\n")
+
+
+def test_html_leaves_missing_names_empty(editor):
+    editor.resume_data["basics"]["name"] = ""
+    editor.resume_data["work"][0].update(position="", name="")
+    editor.mark_changed()
+    html = editor.create_html()
+    assert "<title> - Resume</title>" in html
+    assert '<div class="job-title"></div>' in html or '<div class="job-title"><span class="current-badge">' in html
+    assert '<div class="company"></div>' in html
+    assert "Position" not in html and "Company" not in html
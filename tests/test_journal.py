@@ -0,0 +1,149 @@
+import json
+import os
+import shutil
+import time
+
+import resume_journal
+import resume_model
+import resume_storage
+from conftest import SAMPLE
+
+
+def skill_names(data):
+    return [skill["name"] for skill in data["skills"]["technologies"]]
+
+
+def started_journal(resumes):
+    journal = resume_journal.ResumeJournal(resumes, SAMPLE)
+    data = resume_storage.read_resume(os.path.join(resumes, SAMPLE))
+    journal.start(data, resume_storage.file_signature(os.path.join(resumes, SAMPLE)))
+    journal.append("add_skill", ["Rust"])
+    journal.append("add_skill", ["Go"])
+    return journal
+
+
+def test_torn_trailing_line_is_dropped_before_the_next_append(resumes):
+    journal = started_journal(resumes)
+    with open(journal.ops_path, "ab") as file:
+        file.write(b'{"seq": 3, "ts": "2025-09-10T05:30:02", "op": "add_sk')
+
+    reopened = resume_journal.ResumeJournal(resumes, SAMPLE)
+    assert [record["seq"] for record in reopened.load()] == [0, 1, 2]
+    record = reopened.append("add_skill", ["Zig"])
+    assert record["seq"] == 3
+
+    fresh = resume_journal.ResumeJournal(resumes, SAMPLE)
+    assert [record["seq"] for record in fresh.load()] == [0, 1, 2, 3]
+    assert fresh.load()[-1]["args"] == ["Zig"]
+
+
+def test_complete_record_without_newline_counts_as_torn(resumes):
+    journal = started_journal(resumes)
+    with open(journal.ops_path, "ab") as file:
+        file.write(json.dumps({"seq": 3, "op": "add_skill", "args": ["C"], "revision": 9}).encode())
+
+    reopened = resume_journal.ResumeJournal(resumes, SAMPLE)
+    assert reopened.last_seq == 2
+    reopened.append("add_skill", ["Zig"])
+    lines = open(journal.ops_path, "rb").read().splitlines()
+    assert [json.loads(line)["seq"] for line in lines] == [0, 1, 2, 3]
+
+
+def test_edits_replay_until_compacted(editor):
+    editor.apply("add_skill", "Rust")
+    editor.apply("add_skill", "Go")
+    path = os.path.join(editor.resumes_directory, SAMPLE)
+    journal = editor.get_journal()
+    assert journal.pending()[0] == 2
+    assert "Rust" not in skill_names(resume_storage.read_resume(path))
+
+    assert editor.compact_journal()
+    assert journal.pending()[0] == 0
+    on_disk = resume_storage.read_resume(path)
+    assert skill_names(on_disk)[-2:] == ["Rust", "Go"]
+    assert resume_model.revision(on_disk) == editor.revision
+
+
+def test_loading_writes_replayed_edits_into_the_file(editor):
+    editor.apply("add_skill", "Rust")
+    import app
+    other = app.ResumeWebApp()
+    other.resumes_directory = editor.resumes_directory
+    assert other.load_resume(SAMPLE)
+    assert other.resume_data == editor.resume_data
+    journal = editor.get_journal()
+    journal.refresh()
+    assert journal.pending()[0] == 0
+    assert skill_names(resume_storage.read_resume(os.path.join(editor.resumes_directory, SAMPLE)))[-1] == "Rust"
+
+
+def test_switching_away_compacts(editor):
+    shutil.copy(os.path.join(editor.resumes_directory, SAMPLE), os.path.join(editor.resumes_directory, "other.json"))
+    editor.apply("add_skill", "Rust")
+    journal = editor.get_journal()
+    assert editor.load_resume("other.json")
+    assert journal.pending()[0] == 0
+    assert skill_names(resume_storage.read_resume(os.path.join(editor.resumes_directory, SAMPLE)))[-1] == "Rust"
+    assert editor.cache.dirty() == []
+
+
+def test_idle_journal_is_compacted(editor, monkeypatch):
+    import app
+    monkeypatch.setitem(app.app.config, "JOURNAL_IDLE_SECONDS", 5)
+    editor.apply("add_skill", "Rust")
+    journal = editor.get_journal()
+    assert not editor.compact_journal(force=False)
+    idle_since = time.time() - 10
+    os.utime(journal.ops_path, (idle_since, idle_since))
+    assert editor.compact_journal(force=False)
+    assert journal.pending()[0] == 0
+
+
+def test_undo_and_redo_are_journaled(editor):
+    before = skill_names(editor.resume_data)
+    editor.apply("add_skill", "Rust")
+    assert editor.undo() is not None
+    assert skill_names(editor.resume_data) == before
+    assert editor.redo() is not None
+    assert skill_names(editor.resume_data) == before + ["Rust"]
+    assert [record["op"] for record in editor.get_journal().load()] == ["snapshot", "add_skill", "restore", "restore"]
+
+
+def test_unreadable_snapshot_falls_back_to_replaying(editor):
+    editor.apply("add_skill", "Rust")
+    assert editor.compact_journal()
+    editor.apply("add_skill", "Go")
+    journal = editor.get_journal()
+    with open(os.path.join(journal.snapshot_path, "00000001.json"), "w") as file:
+        file.write('{"basics": {"na')
+    assert skill_names(journal.state_at(journal.last_seq, editor.replay)) == skill_names(editor.resume_data)
+
+
+def test_compaction_prunes_history_behind_it(editor):
+    journal = editor.get_journal()
+    journal.history_limit = 2
+    for name in ["Rust", "Go", "Zig", "C", "Lua"]:
+        editor.apply("add_skill", name)
+        assert editor.compact_journal()
+    records = journal.load()
+    assert records[0]["op"] == "snapshot" and records[0]["seq"] == journal.last_seq - 2
+    assert journal.snapshot_seqs()[0] == records[0]["seq"]
+
+    reopened = resume_journal.ResumeJournal(editor.resumes_directory, SAMPLE)
+    assert reopened.load() == records
+    assert skill_names(reopened.state_at(reopened.last_seq, editor.replay)) == skill_names(editor.resume_data)
+    assert editor.apply("add_skill", "Nim") and journal.last_seq == 6
+    assert editor.undo() == 5 and skill_names(editor.resume_data)[-1] == "Lua"
+
+
+def test_pruning_keeps_what_a_restore_points_at(editor):
+    journal = editor.get_journal()
+    journal.history_limit = 1
+    editor.apply("add_skill", "Rust")
+    assert editor.compact_journal()
+    editor.apply("add_skill", "Go")
+    editor.apply("add_skill", "Zig")
+    editor.restore_version(1)
+    assert editor.compact_journal()
+    assert journal.first_seq == 1
+    assert [record["op"] for record in journal.load()] == ["snapshot", "add_skill", "add_skill", "restore"]
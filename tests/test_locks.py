@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+
+import pytest
+
+import locks
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_readers_share_the_lock():
+    lock = locks.RWLock()
+    both = threading.Barrier(2, timeout=5)
+
+    def read():
+        with lock.read():
+            both.wait()
+
+    threads = [threading.Thread(target=read) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_waiting_writer_goes_ahead_of_new_readers():
+    lock = locks.RWLock()
+    order = []
+    lock.acquire_read()
+    writer = threading.Thread(target=lambda: (lock.acquire_write(), order.append("writer"), lock.release_write()))
+    writer.start()
+    wait_until(lambda: lock.waiting_writers == 1)
+
+    reader = threading.Thread(target=lambda: (lock.acquire_read(), order.append("reader"), lock.release_read()))
+    reader.start()
+    time.sleep(0.05)
+    assert order == []
+    lock.release_read()
+    writer.join(5)
+    reader.join(5)
+    assert order == ["writer", "reader"]
+
+
+def test_write_nests_write_and_read_in_the_same_thread():
+    lock = locks.RWLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                assert lock.writer == threading.get_ident()
+        assert lock.writer_depth == 1
+    assert lock.writer is None and lock.readers == 0
+
+
+def test_read_outliving_its_write_still_keeps_writers_out():
+    lock = locks.RWLock()
+    acquired = threading.Event()
+    lock.acquire_write()
+    lock.acquire_read()
+    lock.release_write()
+
+    writer = threading.Thread(target=lambda: (lock.acquire_write(), acquired.set(), lock.release_write()))
+    writer.start()
+    assert not acquired.wait(0.05)
+    lock.release_read()
+    assert acquired.wait(5)
+    writer.join(5)
+
+
+def test_read_cannot_be_upgraded():
+    lock = locks.RWLock()
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+
+
+def test_file_lock_is_shared_by_every_path_to_a_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert locks.file_lock("resume.json") is locks.file_lock(os.path.join(str(tmp_path), "resume.json"))
+
+
+@pytest.mark.skipif(locks.fcntl is None, reason="no advisory locks on this platform")
+def test_process_lock_excludes_other_processes(tmp_path):
+    path = str(tmp_path / "store.lock")
+    # Another process: a separate open file description on the same file
+    probe = os.open(path, os.O_RDWR | os.O_CREAT)
+    try:
+        with locks.process_lock(path, shared=True):
+            locks.fcntl.flock(probe, locks.fcntl.LOCK_SH | locks.fcntl.LOCK_NB)
+            locks.fcntl.flock(probe, locks.fcntl.LOCK_UN)
+            with pytest.raises(BlockingIOError):
+                locks.fcntl.flock(probe, locks.fcntl.LOCK_EX | locks.fcntl.LOCK_NB)
+        with locks.process_lock(path):
+            # Nested in the same thread: no second flock to deadlock on
+            with locks.process_lock(path, shared=True):
+                pass
+            with pytest.raises(BlockingIOError):
+                locks.fcntl.flock(probe, locks.fcntl.LOCK_SH | locks.fcntl.LOCK_NB)
+        locks.fcntl.flock(probe, locks.fcntl.LOCK_EX | locks.fcntl.LOCK_NB)
+    finally:
+        os.close(probe)
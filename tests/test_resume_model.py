@@ -0,0 +1,25 @@
+import pytest
+
+import resume_model
+
+
+@pytest.mark.parametrize("value", ["false", "False", "0", "no", "off", "", 0, False, None])
+def test_flag_false_values(value):
+    assert resume_model.flag(value, "isWorkingHere") is False
+
+
+@pytest.mark.parametrize("value", ["true", "TRUE", "1", "yes", "on", 1, True])
+def test_flag_true_values(value):
+    assert resume_model.flag(value, "isWorkingHere") is True
+
+
+def test_flag_rejects_other_strings():
+    with pytest.raises(resume_model.ResumeValidationError):
+        resume_model.flag("sometimes", "isWorkingHere")
+
+
+def test_string_false_decodes_as_not_current():
+    resume = resume_model.Resume.from_dict({"work": [{"id": "a", "name": "Acme", "isWorkingHere": "false",
+                                                      "startDate": "2020-01-01T04:00:00.000Z"}]})
+    assert resume.work[0].is_working_here is False
+    assert resume.to_dict()["work"][0]["isWorkingHere"] is False
@@ -0,0 +1,45 @@
+import copy
+import os
+
+import resume_journal
+import resume_storage
+import retention
+from conftest import SAMPLE
+
+KEEP_NEWEST = retention.RetentionPolicy(keep_last=1, keep_daily=0, keep_weekly=0, keep_monthly=0)
+
+
+def versions(resumes, storage, count):
+    """count dated versions of the sample resume, oldest first, each with its own label"""
+    data = resume_storage.read_resume(os.path.join(resumes, SAMPLE))
+    os.remove(os.path.join(resumes, SAMPLE))
+    names = []
+    for day in range(1, count + 1):
+        version = copy.deepcopy(data)
+        version["basics"]["label"] = f"Version {day}"
+        name = f"Skylor_Piersall_2025-08-{day:02d}_10-00-00.json"
+        resume_storage.get_storage(storage).write(resumes, name, version)
+        names.append(name)
+    return names
+
+
+def test_delete_mode_collects_objects_only_old_versions_used(resumes, monkeypatch):
+    monkeypatch.setattr(resume_storage, "GC_GRACE_SECONDS", 0)
+    names = versions(resumes, "cas", 3)
+    report = retention.Compactor(resumes, KEEP_NEWEST, "delete").run()
+    assert sorted(report["files"]) == names[:2]
+    stored = {identifier for identifier, _ in resume_storage.stored_objects(resumes)}
+    assert stored == resume_storage.referenced_objects(resumes)
+    assert resume_storage.read_resume(os.path.join(resumes, names[2]))["basics"]["label"] == "Version 3"
+
+
+def test_versions_with_unsaved_journal_edits_are_kept(resumes):
+    names = versions(resumes, "files", 2)
+    path = os.path.join(resumes, names[0])
+    journal = resume_journal.ResumeJournal(resumes, names[0])
+    journal.start(resume_storage.read_resume(path), resume_storage.file_signature(path))
+    journal.append("add_skill", ["Rust"])
+
+    report = retention.Compactor(resumes, KEEP_NEWEST, "archive").run()
+    assert report["files"] == []
+    assert os.path.exists(path)
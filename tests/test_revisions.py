@@ -0,0 +1,43 @@
+import pytest
+
+import resume_model
+from conftest import SAMPLE
+
+
+def skill_names(data):
+    return [skill["name"] for skill in data["skills"]["technologies"]]
+
+
+def test_stale_if_match_gets_409_and_the_current_revision(client, editor):
+    revision = client.get("/api/data").get_etag()[0]
+    response = client.post("/api/skills", json={"name": "Rust"}, headers={"If-Match": f'"{revision}"'})
+    assert response.status_code == 200
+    current = response.get_etag()[0]
+    assert int(current) == int(revision) + 1
+
+    stale = client.post("/api/skills", json={"name": "Go"}, headers={"If-Match": f'"{revision}"'})
+    assert stale.status_code == 409
+    assert stale.get_json()["version"] == int(current)
+    assert stale.get_etag()[0] == current
+    assert skill_names(editor.resume_data) == ["Rust"]
+
+
+def test_edit_without_if_match_is_not_checked(client, editor):
+    client.post("/api/skills", json={"name": "Rust"})
+    assert client.post("/api/skills", json={"name": "Go"}).status_code == 200
+    assert skill_names(editor.resume_data) == ["Rust", "Go"]
+
+
+def test_edit_based_on_another_editors_revision_is_refused(editor):
+    import app
+    other = app.ResumeWebApp()
+    other.resumes_directory = editor.resumes_directory
+    assert other.load_resume(SAMPLE)
+    revision = editor.revision
+
+    editor.apply("add_skill", "Rust", expected=revision)
+    with pytest.raises(resume_model.RevisionConflict):
+        other.apply("add_skill", "Go", expected=revision)
+    # The refused editor picked up the version it lost to
+    assert skill_names(other.resume_data) == ["Rust"]
+    assert other.revision == editor.revision
@@ -0,0 +1,16 @@
+import resume_model
+import sanitize
+
+HIGHLIGHTS = ["R&D budget cut 20%", "Wrote &amp; and &lt; literally", "Kept latency < 5 ms > target", "<b>not bold</b>"]
+
+
+def test_highlights_survive_the_stored_summary():
+    summary = sanitize.bullet_summary(HIGHLIGHTS)
+    assert sanitize.split_bullets(summary) == tuple(HIGHLIGHTS)
+
+
+def test_decoded_work_item_keeps_highlights():
+    summary = sanitize.bullet_summary(HIGHLIGHTS)
+    resume = resume_model.Resume.from_dict({"work": [{"id": "a", "summary": summary}]})
+    assert resume.work[0].highlights == HIGHLIGHTS
+    assert resume.to_dict()["work"][0]["summary"] == summary
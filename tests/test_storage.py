@@ -0,0 +1,97 @@
+import copy
+import os
+import threading
+
+import resume_storage
+from conftest import SAMPLE
+
+
+def sample(resumes):
+    return resume_storage.read_resume(os.path.join(resumes, SAMPLE))
+
+
+def test_cas_round_trip_and_shared_objects(resumes):
+    data = sample(resumes)
+    cas = resume_storage.get_storage("cas")
+    first = cas.write(resumes, "first.json", data)
+    assert resume_storage.is_manifest(resume_storage.read_document(os.path.join(resumes, "first.json")))
+    assert resume_storage.read_resume(os.path.join(resumes, "first.json")) == data
+
+    changed = copy.deepcopy(data)
+    changed["work"][0]["position"] = "Lead Splicer"
+    second = cas.write(resumes, "second.json", changed)
+    # Only the changed job is a new object; everything else is shared with the first version
+    assert second < first
+    assert resume_storage.read_resume(os.path.join(resumes, "second.json")) == changed
+    first_sections = resume_storage.read_document(os.path.join(resumes, "first.json"))["sections"]
+    second_sections = resume_storage.read_document(os.path.join(resumes, "second.json"))["sections"]
+    assert first_sections["basics"] == second_sections["basics"]
+    assert first_sections["work"][1:] == second_sections["work"][1:]
+    assert first_sections["work"][0] != second_sections["work"][0]
+
+
+def test_garbage_collection_keeps_every_reachable_object(resumes, monkeypatch):
+    monkeypatch.setattr(resume_storage, "GC_GRACE_SECONDS", 0)
+    data = sample(resumes)
+    cas = resume_storage.get_storage("cas")
+    cas.write(resumes, "first.json", data)
+    changed = copy.deepcopy(data)
+    changed["work"][0]["position"] = "Lead Splicer"
+    cas.write(resumes, "second.json", changed)
+    only_first = resume_storage.read_document(os.path.join(resumes, "first.json"))["sections"]["work"][0]
+
+    assert resume_storage.collect_garbage(resumes)[0] == 0
+    os.remove(os.path.join(resumes, "first.json"))
+    removed, freed = resume_storage.collect_garbage(resumes)
+    assert removed == 1 and freed > 0
+    stored = {identifier for identifier, _ in resume_storage.stored_objects(resumes)}
+    assert only_first not in stored
+    assert stored == resume_storage.referenced_objects(resumes)
+
+
+def test_garbage_collection_leaves_young_objects(resumes):
+    cas = resume_storage.get_storage("cas")
+    cas.write(resumes, "first.json", sample(resumes))
+    # A save that has written its objects but not yet its manifest
+    os.remove(os.path.join(resumes, "first.json"))
+    assert resume_storage.collect_garbage(resumes) == (0, 0)
+    assert resume_storage.collect_garbage(resumes, grace=0)[0] > 0
+
+
+def test_reusing_an_object_refreshes_it(resumes):
+    data = sample(resumes)
+    cas = resume_storage.get_storage("cas")
+    cas.write(resumes, "first.json", data)
+    old = os.path.getmtime(os.path.join(resumes, "first.json")) - 3600
+    for _, path in resume_storage.stored_objects(resumes):
+        os.utime(path, (old, old))
+    os.remove(os.path.join(resumes, "first.json"))
+
+    # Writing the same content again reuses every object and makes it young
+    cas.write(resumes, "second.json", data)
+    assert all(os.path.getmtime(path) > old for _, path in resume_storage.stored_objects(resumes))
+    assert resume_storage.collect_garbage(resumes) == (0, 0)
+
+
+def test_garbage_collection_waits_for_saves_in_flight(resumes, monkeypatch):
+    monkeypatch.setattr(resume_storage, "GC_GRACE_SECONDS", 0)
+    cas = resume_storage.get_storage("cas")
+    cas.write(resumes, "first.json", sample(resumes))
+    os.remove(os.path.join(resumes, "first.json"))
+    collected = []
+    with resume_storage.objects_lock(resumes, shared=True):
+        # A save holds the lock from its first object to its manifest
+        collector = threading.Thread(target=lambda: collected.append(resume_storage.collect_garbage(resumes)))
+        collector.start()
+        collector.join(0.2)
+        assert collector.is_alive() and not collected
+    collector.join(5)
+    assert collected[0][0] > 0
+
+
+def test_migrate_to_cas_and_back(resumes):
+    data = sample(resumes)
+    assert resume_storage.migrate(resumes, "cas")[0] == 1
+    assert resume_storage.is_manifest(resume_storage.read_document(os.path.join(resumes, SAMPLE)))
+    assert resume_storage.migrate(resumes, "files")[0] == 1
+    assert resume_storage.read_document(os.path.join(resumes, SAMPLE)) == data
@@ -0,0 +1,30 @@
+import io
+import zipfile
+
+import resume_variants
+from conftest import SAMPLE
+
+
+def test_variant_export_sees_unsaved_base_edits(editor, client):
+    variant = resume_variants.create_variant(editor.resumes_directory, SAMPLE, {"basics": {"label": "Splicer"}})
+    editor.apply("update_basics", {"name": "Renamed Person"})
+    assert editor.get_journal().pending()[0] == 1
+
+    response = client.post("/api/variants/export", json={"base": SAMPLE, "formats": ["md"]})
+    assert response.status_code == 200
+    bundle = zipfile.ZipFile(io.BytesIO(response.data))
+    markdown = bundle.read(variant.replace(".json", ".md")).decode("utf-8")
+    assert "Renamed Person" in markdown
+    assert "Splicer" in markdown
+
+
+def test_loading_a_variant_sees_another_editors_base_edits(editor):
+    variant = resume_variants.create_variant(editor.resumes_directory, SAMPLE, {"basics": {"label": "Splicer"}})
+    editor.apply("update_basics", {"name": "Renamed Person"})
+
+    import app
+    other = app.ResumeWebApp()
+    other.resumes_directory = editor.resumes_directory
+    assert other.load_resume(variant)
+    assert other.resume_data["basics"]["name"] == "Renamed Person"
+    assert other.resume_data["basics"]["label"] == "Splicer"
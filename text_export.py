@@ -0,0 +1,169 @@
+"""Plain-text and Markdown exporters for ATS ingestion, email bodies and bulk runs.
+
+Both emitters walk a compiled ``resume_ir.Layout`` in the same section order
+as ``create_pdf`` and yield small string chunks, so a caller can stream them
+straight into a response or file without building the document in memory.
+No reportlab or HTML is involved, which makes them cheap enough to run over
+a whole corpus:
+
+    python text_export.py --format md --output exports resumes/*.json
+"""
+import argparse
+import os
+import re
+import sys
+
+import resume_ir
+import resume_model
+import resume_storage
+
+FORMATS = {"txt": "text/plain", "md": "text/markdown"}
+
+MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]<>#|])")
+MARKDOWN_LINE_START = re.compile(r"^(\s*)([-+]|\d+\.)(?=\s)", re.MULTILINE)
+
+
+def markdown_escape(value):
+    value = MARKDOWN_SPECIAL.sub(r"\\\1", value)
+    return MARKDOWN_LINE_START.sub(r"\1\\\2", value)
+
+
+def iter_text(layout):
+    """Yield the resume as plain text"""
+    if layout.name.text:
+        yield layout.name.text.upper() + "\n"
+    if layout.label.text:
+        yield layout.label.text + "\n"
+    if layout.contacts:
+        yield " | ".join(contact.text for _, contact in layout.contacts) + "\n"
+
+    for section in layout.sections:
+        if blank_section(section):
+            continue
+        yield f"\n{section.title.upper()}\n"
+        if section.key in ("work", "education"):
+            for index, entry in enumerate(section.blocks):
+                if index:
+                    yield "\n"
+                for value in (entry.title.text, entry.subtitle.text, entry.dates):
+                    if value:
+                        yield value + "\n"
+                for block in entry.details:
+                    yield text_block(block)
+        else:
+            for block in section.blocks:
+                yield text_block(block)
+
+
+def blank(block):
+    """True for a summary that sanitized to nothing, which these formats leave out"""
+    return block.kind == "summary" and not block.runs[0].markup
+
+
+def blank_section(section):
+    return section.key in ("summary", "objective") and all(blank(block) for block in section.blocks)
+
+
+def text_block(block):
+    if blank(block):
+        return ""
+    if block.kind == "highlights":
+        return "".join(f"• {highlight.text}\n" for highlight in block.runs)
+    if block.kind == "gpa":
+        return f"GPA: {block.runs[0].text}\n"
+    if block.kind == "courses":
+        return f"Coursework: {', '.join(course.text for course in block.runs)}\n"
+    if block.kind == "skills":
+        return " • ".join(skill.text for skill in block.runs) + "\n" if block.runs else ""
+    return block.runs[0].text + "\n"
+
+
+def iter_markdown(layout):
+    """Yield the resume as Markdown"""
+    if layout.name.text:
+        yield f"# {markdown_escape(layout.name.text)}\n"
+    if layout.label.text:
+        yield f"\n**{markdown_escape(layout.label.text)}**\n"
+    if layout.contacts:
+        yield "\n" + " · ".join(markdown_escape(contact.text) for _, contact in layout.contacts) + "\n"
+
+    for section in layout.sections:
+        if blank_section(section):
+            continue
+        yield f"\n## {section.title}\n"
+        if section.key in ("work", "education"):
+            for entry in section.blocks:
+                heading = " — ".join(markdown_escape(value) for value in (entry.title.text, entry.subtitle.text) if value)
+                yield f"\n### {heading}\n" if heading else "\n"
+                if entry.dates:
+                    yield f"\n*{entry.dates}*\n"
+                for block in entry.details:
+                    yield markdown_block(block)
+        else:
+            for block in section.blocks:
+                yield markdown_block(block)
+
+
+def markdown_block(block):
+    if blank(block):
+        return ""
+    if block.kind == "highlights":
+        return "\n" + "".join(f"- {markdown_escape(highlight.text)}\n" for highlight in block.runs)
+    if block.kind == "gpa":
+        return f"\n**GPA:** {markdown_escape(block.runs[0].text)}\n"
+    if block.kind == "courses":
+        return f"\n**Coursework:** {', '.join(markdown_escape(course.text) for course in block.runs)}\n"
+    if block.kind == "skills":
+        return "\n" + " • ".join(markdown_escape(skill.text) for skill in block.runs) + "\n" if block.runs else ""
+    return f"\n{markdown_escape(block.runs[0].text)}\n"
+
+
+EMITTERS = {"txt": iter_text, "md": iter_markdown}
+
+
+def render(layout, export_format):
+    """Return the whole document for export_format ("txt" or "md") as a string"""
+    return "".join(EMITTERS[export_format](layout))
+
+
+def write(layout, export_format, stream):
+    """Stream the document into a text file object; returns the characters written"""
+    written = 0
+    for chunk in EMITTERS[export_format](layout):
+        written += stream.write(chunk)
+    return written
+
+
+def export_file(path, output_directory, export_format):
+    """Convert one resume JSON file; returns the output path"""
+    resume = resume_model.Resume.from_dict(resume_storage.read_resume(path))
+    resume.sort_sections()
+    layout = resume_ir.compile_resume(resume)
+    base_name = os.path.splitext(os.path.basename(path))[0]
+    output_path = os.path.join(output_directory, f"{base_name}.{export_format}")
+    with open(output_path, "w", encoding="utf-8") as file:
+        write(layout, export_format, file)
+    return output_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export resume JSON files as plain text or Markdown")
+    parser.add_argument("files", nargs="+", help="Resume JSON files")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="txt", help="Output format")
+    parser.add_argument("--output", default="exports", help="Output directory")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output, exist_ok=True)
+    failures = 0
+    for path in args.files:
+        try:
+            export_file(path, args.output, args.format)
+        except (OSError, ValueError) as e:
+            failures += 1
+            print(f"Error exporting {path}: {str(e)}", file=sys.stderr)
+    print(f"Exported {len(args.files) - failures} of {len(args.files)} files to {args.output}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Production WSGI entry point.
+
+    pip install gunicorn
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+Any WSGI server can serve ``application``.  With ``preload_app`` (the
+default in gunicorn.conf.py) this module is imported once in the master
+process.  ``preload`` then imports ``pdf_export``, and with it reportlab,
+which the app otherwise loads lazily on the first export.  It also builds
+the PDF style registry and renders a throwaway page so font metrics and
+encodings are loaded.  The forked workers share all of that memory
+copy-on-write instead of each paying for it on their first export.
+"""
+import gc
+import io
+
+from app import app as application
+from app import load_pdf_export
+
+
+def preload():
+    """Warm the PDF stack in this process"""
+    pdf_export = load_pdf_export()
+    styles = pdf_export.pdf_styles()
+    doc = pdf_export.SimpleDocTemplate(io.BytesIO(), pagesize=pdf_export.letter)
+    doc.build([pdf_export.Paragraph("<b>warm</b> <i>up</i>", style) for style in styles.values()])
+
+
+preload()
+# Move everything imported so far out of the collector's generations, so
+# collections in the workers do not touch (and un-share) the preloaded pages
+gc.freeze()